@@ -0,0 +1,67 @@
+"""Compares the list-backed ComplexManager with the NumPy-backed ArrayComplexManager.
+
+Run from the lab4 directory::
+
+    python -m benchmarks.arraymanager --numbers 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Any
+from typing import Callable
+
+from classes import ArrayComplexManager
+from classes import ComplexManager
+
+
+def timed(run: Callable[[], Any]) -> float:
+    """Times a call
+
+    Args:
+        run (Callable[[], Any]): call to be timed
+
+    Returns:
+        float: duration in seconds
+    """
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Runs the benchmark and prints a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--numbers", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    data = [
+        [round(rng.uniform(-15, 15), 1), round(rng.uniform(-15, 15), 1)]
+        for _ in range(args.numbers)
+    ]
+    n = args.numbers
+    cases: tuple[tuple[str, Callable[[Any], Any]], ...] = (
+        ("load_json", lambda x: x.load_json(data)),
+        ("sum_seq", lambda x: x.sum_seq(0, n)),
+        ("prod_seq", lambda x: x.prod_seq(0, n)),
+        ("get_by_abs < 10", lambda x: x.get_by_abs("<", 10)),
+        ("get_sorted_by_imag", lambda x: x.get_sorted_by_imag(reverse=True)),
+        ("replace_number", lambda x: x.replace_number(tuple(data[0]), (0, 0))),
+        ("add_number x 1000", lambda x: [x.add_number((1, 1)) for _ in range(1000)]),
+        ("filter_by_abs > 10", lambda x: x.filter_by_abs(">", 10)),
+    )
+    managers = ComplexManager(), ArrayComplexManager()
+    print(f"{n} numbers")
+    print(f"{'operation':<22}{'list (s)':>10}{'numpy (s)':>11}{'speedup':>9}")
+    for name, run in cases:
+        list_time, array_time = (timed(lambda: run(x)) for x in managers)
+        print(
+            f"{name:<22}{list_time:>10.3f}{array_time:>11.3f}{list_time / array_time:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Times the ComplexNumber operators against the builtin complex type.
+
+Run from the lab4 directory::
+
+    python -m benchmarks.complexnumber --number 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import timeit
+
+from classes import ComplexNumber
+
+
+def main() -> None:
+    """Runs the benchmark and prints a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    env = {
+        "a": ComplexNumber(5, 3),
+        "b": ComplexNumber(3, 6),
+        "c": complex(5, 3),
+        "d": complex(3, 6),
+        "from_type": ComplexNumber.from_type,
+    }
+    cases = (
+        ("a + b", "c + d"),
+        ("a + 10", "c + 10"),
+        ("a + (3, 6)", "c + complex(3, 6)"),
+        ("a * b", "c * d"),
+        ("a * (3, 6)", "c * complex(3, 6)"),
+        ("a == b", "c == d"),
+        ("a == (5, 3)", "c == complex(5, 3)"),
+        ("a == 5", "c == 5"),
+        ("from_type(a)", "complex(c)"),
+        ("from_type(5)", "complex(5)"),
+        ("from_type((5, 3))", "complex(*(5, 3))"),
+    )
+    print(f"{'expression':<20}{'ns/op':>10}{'complex ns/op':>15}{'ratio':>8}")
+    for stmt, reference in cases:
+        times = []
+        for x in (stmt, reference):
+            best = min(
+                timeit.repeat(x, globals=env, number=args.number, repeat=args.repeat)
+            )
+            times.append(best / args.number * 1e9)
+        print(
+            f"{stmt:<20}{times[0]:>10.1f}{times[1]:>15.1f}{times[0] / times[1]:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Compares the slotted, frozen ComplexNumber with the previous mutable dataclass.
+
+Measures memory per number, construction, a first abs filter and a sort
+(abs-based __lt__). Run from the lab4 directory::
+
+    python -m benchmarks.layout --numbers 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any
+from typing import Callable
+
+from classes import ComplexNumber
+
+
+@dataclass
+class LegacyComplexNumber:
+    """The previous layout: a dataclass with a __dict__ and an uncached abs"""
+
+    real: float
+    imag: float
+
+    def __abs__(self) -> float:
+        return math.sqrt(self.real**2 + self.imag**2)
+
+    def __lt__(self, __o: LegacyComplexNumber) -> bool:
+        return abs(self) < abs(__o)
+
+
+def timed(run: Callable[[], Any]) -> float:
+    """Times a call
+
+    Args:
+        run (Callable[[], Any]): call to be timed
+
+    Returns:
+        float: duration in seconds
+    """
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Runs the benchmark and prints a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--numbers", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    pairs = [(rng.uniform(-20, 20), rng.uniform(-20, 20)) for _ in range(args.numbers)]
+
+    print(f"{args.numbers} numbers")
+    print(
+        f"{'layout':<22}{'bytes':>7}{'build (s)':>11}{'filter (s)':>12}{'sort (s)':>10}"
+    )
+    for cls in (LegacyComplexNumber, ComplexNumber):
+        tracemalloc.start()
+        start = time.perf_counter()
+        numbers = [cls(x, y) for x, y in pairs]
+        build = time.perf_counter() - start
+        size = tracemalloc.get_traced_memory()[0] / args.numbers
+        tracemalloc.stop()
+        check = timed(lambda: [x for x in numbers if abs(x) < 10])
+        sort = timed(lambda: sorted(numbers))
+        print(
+            f"{cls.__name__:<22}{size:>7.0f}{build:>11.3f}{check:>12.3f}{sort:>10.3f}"
+        )
+        del numbers
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Times loading a file with json.load + load_json and with the streaming loader.
+
+Run from the lab4 directory::
+
+    python -m benchmarks.loader --numbers 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from array import array
+from typing import Any
+from typing import Callable
+
+from classes import ArrayComplexManager
+from classes import arraymanager
+from classes import ComplexManager
+from helpers import data
+
+
+def timed(run: Callable[[], Any]) -> float:
+    """Times a call
+
+    Args:
+        run (Callable[[], Any]): call to be timed
+
+    Returns:
+        float: duration in seconds
+    """
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Runs the benchmark and prints a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--numbers", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=data.CHUNK_SIZE)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    pairs = [
+        [rng.randint(-500, 500), rng.randint(-500, 500)] for _ in range(args.numbers)
+    ]
+    with tempfile.TemporaryDirectory() as folder:
+        paths = {
+            x: os.path.join(folder, f"numbers.{x}") for x in ("json", "csv", "bin")
+        }
+        with open(paths["json"], "w") as f:
+            json.dump(pairs, f)
+        with open(paths["csv"], "w") as f:
+            f.writelines(f"{x},{y}\n" for x, y in pairs)
+        with open(paths["bin"], "wb") as binary:
+            array("d", [x for pair in pairs for x in pair]).tofile(binary)
+        del pairs
+
+        def load_json(manager: Any) -> None:
+            with open(paths["json"]) as f:
+                manager.load_json(json.load(f))
+
+        def stream(ext: str, use_mmap: bool = False) -> Callable[[Any], Any]:
+            return lambda manager: data.load_file(
+                manager,
+                paths[ext],
+                chunk_size=args.chunk_size,
+                use_mmap=use_mmap,
+            )
+
+        cases = (
+            ("json.load + load_json", load_json, "json"),
+            ("load_file json", stream("json"), "json"),
+            ("load_file csv", stream("csv"), "csv"),
+            ("load_file binary", stream("bin"), "bin"),
+            ("load_file binary, mmap", stream("bin", True), "bin"),
+        )
+        managers: list[tuple[str, Callable[[], Any]]] = [("list", ComplexManager)]
+        if arraymanager.np is not None:
+            managers.append(("numpy", ArrayComplexManager))
+        print(f"{args.numbers} numbers, chunks of {args.chunk_size}")
+        print(
+            f"{'operation':<24}{'manager':>8}{'time (s)':>10}{'numbers/s':>14}{'MB/s':>8}"
+        )
+        for name, run, ext in cases:
+            size = os.path.getsize(paths[ext])
+            for kind, factory in managers:
+                seconds = timed(lambda: run(factory()))
+                print(
+                    f"{name:<24}{kind:>8}{seconds:>10.3f}"
+                    f"{args.numbers / seconds:>14,.0f}{size / 1e6 / seconds:>8.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
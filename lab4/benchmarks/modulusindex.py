@@ -0,0 +1,79 @@
+"""Times get_by_abs and kth_by_abs with and without a ModulusIndex.
+
+Run from the lab4 directory::
+
+    python -m benchmarks.modulusindex --numbers 1000000 --queries 100
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Any
+from typing import Callable
+
+from classes import ComplexManager
+
+
+def timed(run: Callable[[], Any]) -> float:
+    """Times a call
+
+    Args:
+        run (Callable[[], Any]): call to be timed
+
+    Returns:
+        float: duration in seconds
+    """
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Runs the benchmark and prints a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--numbers", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    data = [
+        [rng.randint(-500, 500), rng.randint(-500, 500)] for _ in range(args.numbers)
+    ]
+    # Selective thresholds: about 1% of the numbers match each query
+    thresholds = [rng.uniform(0, 60) for _ in range(args.queries)]
+    ranks = [rng.randrange(args.numbers) for _ in range(args.queries)]
+
+    def below(manager: ComplexManager) -> None:
+        for value in thresholds:
+            manager.get_by_abs("<", value)
+
+    def kths(manager: ComplexManager) -> None:
+        for k in ranks:
+            manager.kth_by_abs(k)
+
+    def appends(manager: ComplexManager) -> None:
+        for value in thresholds:
+            manager.add_number((value, 0))
+            manager.get_by_abs("<", value)
+
+    cases = (
+        ("load_json", lambda x: x.load_json(data)),
+        (f"{args.queries} get_by_abs < (first builds)", below),
+        (f"{args.queries} get_by_abs <", below),
+        (f"{args.queries} kth_by_abs", kths),
+        (f"{args.queries} add_number + get_by_abs", appends),
+    )
+    managers = ComplexManager(), ComplexManager(modulus_index=True)
+    print(f"{args.numbers} numbers")
+    print(f"{'operation':<40}{'scan (s)':>10}{'index (s)':>11}{'speedup':>9}")
+    for name, run in cases:
+        scan_time, index_time = (timed(lambda: run(x)) for x in managers)
+        print(
+            f"{name:<40}{scan_time:>10.3f}{index_time:>11.3f}{scan_time / index_time:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
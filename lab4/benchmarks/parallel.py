@@ -0,0 +1,103 @@
+"""Times checks, sums and products of ComplexManager with a ChunkPool of each size.
+
+Run from the lab4 directory::
+
+    python -m benchmarks.parallel --numbers 2000000 --workers 1,2,4
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import random
+import time
+from typing import Any
+from typing import Callable
+
+from classes import ChunkPool
+from classes import ComplexManager
+from classes import ComplexNumber
+from helpers import numbers
+
+
+def trial_division(x: ComplexNumber) -> bool:
+    """Slow check: True if the real part is not prime, by trial division
+
+    Args:
+        x (ComplexNumber): number to be checked
+
+    Returns:
+        bool: True if x.real is not prime
+    """
+    if not float(x.real).is_integer():
+        return True
+    n = int(x.real)
+    return n < 2 or any(n % i == 0 for i in range(2, math.isqrt(n) + 1))
+
+
+def timed(run: Callable[[], Any]) -> float:
+    """Times a call
+
+    Args:
+        run (Callable[[], Any]): call to be timed
+
+    Returns:
+        float: duration in seconds
+    """
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Runs the benchmark and prints a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--numbers", type=int, default=2_000_000)
+    parser.add_argument(
+        "--workers",
+        default=",".join(
+            str(x) for x in (1, 2, 4, 8, 16) if x == 1 or x <= (os.cpu_count() or 1)
+        ),
+        help="comma-separated pool sizes. Defaults to powers of 2 up to the number of CPUs",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    # Imaginary parts of 0 and units keep the product from growing
+    data = [[rng.randint(0, 10**6), 0] for _ in range(args.numbers)]
+    units = [
+        rng.choice(([1, 0], [0, 1], [-1, 0], [0, -1])) for _ in range(args.numbers)
+    ]
+    n = args.numbers
+    numbers.PRIMES.reserve(10**6)
+    cases: tuple[tuple[str, Callable[[ComplexManager], Any], list], ...] = (
+        (
+            "get_by_check, trial division",
+            lambda x: x.get_by_check(trial_division),
+            data,
+        ),
+        (
+            "get_by_check, sieve",
+            lambda x: x.get_by_check(numbers.check_real_not_prime),
+            data,
+        ),
+        ("sum_seq", lambda x: x.sum_seq(0, n), data),
+        ("prod_seq", lambda x: x.prod_seq(0, n), units),
+    )
+    workers = [int(x) for x in args.workers.split(",")]
+    print(f"{n} numbers, {os.cpu_count()} CPUs")
+    print(f"{'operation':<30}" + "".join(f"{f'{x} workers (s)':>16}" for x in workers))
+    for name, run, values in cases:
+        times = []
+        for count in workers:
+            manager = ComplexManager(undo_budget=0, pool=ChunkPool(count, min_size=0))
+            manager.load_json(values)
+            times.append(timed(lambda: run(manager)))
+        print(
+            f"{name:<30}" + "".join(f"{x:>9.3f} ({times[0] / x:.1f}x)" for x in times),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Times the prime real part filter with trial division and with the sieve-backed oracle.
+
+Run from the lab4 directory::
+
+    python -m benchmarks.primes --numbers 1000000 --max-real 10000000
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import time
+from typing import Any
+from typing import Callable
+
+from classes import ComplexManager
+from classes.complexnumber import Number
+from helpers.numbers import PrimeOracle
+
+
+def legacy_check_prime(x: Number) -> bool:
+    """check_prime before PrimeOracle, by trial division
+
+    It returns False for 2 and 3, which the oracle fixes.
+
+    Args:
+        x (Number): number to be checked
+
+    Returns:
+        bool: True if x is prime
+    """
+    if x < 2 or x % 2 == 0 or x % 3 == 0:
+        return False
+    for i in range(5, int(math.sqrt(x)) + 1, 2):
+        if x % i == 0:
+            return False
+    return True
+
+
+def timed(run: Callable[[], Any]) -> float:
+    """Times a call
+
+    Args:
+        run (Callable[[], Any]): call to be timed
+
+    Returns:
+        float: duration in seconds
+    """
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Runs the benchmark and prints a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--numbers", type=int, default=1_000_000)
+    parser.add_argument("--max-real", type=int, default=10_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    data = [[rng.randint(0, args.max_real), 0] for _ in range(args.numbers)]
+
+    def legacy(manager: ComplexManager) -> None:
+        manager.filter_by_check(lambda x: not legacy_check_prime(x.real))
+
+    def lazy(manager: ComplexManager) -> None:
+        oracle = PrimeOracle()
+        manager.filter_by_check(lambda x: not oracle(x.real))
+
+    def reserved(manager: ComplexManager) -> None:
+        oracle = PrimeOracle()
+        oracle.reserve(max(x.real for x in manager.nlist))
+        manager.filter_by_check(lambda x: not oracle(x.real))
+
+    def miller_rabin(manager: ComplexManager) -> None:
+        oracle = PrimeOracle(sieve_limit=0)
+        manager.filter_by_check(lambda x: not oracle(x.real))
+
+    cases = (
+        ("trial division", legacy),
+        ("oracle, lazy sieve", lazy),
+        ("oracle, reserved sieve", reserved),
+        ("oracle, Miller-Rabin only", miller_rabin),
+    )
+    print(f"{args.numbers} numbers, real parts up to {args.max_real}")
+    print(f"{'filter':<28}{'time (s)':>10}{'kept':>10}")
+    for name, run in cases:
+        manager = ComplexManager(undo_budget=0)
+        manager.load_json(data)
+        seconds = timed(lambda: run(manager))
+        print(f"{name:<28}{seconds:>10.3f}{manager.count:>10}")
+
+
+if __name__ == "__main__":
+    main()
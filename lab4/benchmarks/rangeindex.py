@@ -0,0 +1,77 @@
+"""Times sum_seq and prod_seq queries with and without a RangeIndex.
+
+Run from the lab4 directory::
+
+    python -m benchmarks.rangeindex --numbers 100000 --queries 1000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Any
+from typing import Callable
+
+from classes import ComplexManager
+
+
+def timed(run: Callable[[], Any]) -> float:
+    """Times a call
+
+    Args:
+        run (Callable[[], Any]): call to be timed
+
+    Returns:
+        float: duration in seconds
+    """
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Runs the benchmark and prints a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--numbers", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=1_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    n = args.numbers
+    data = [[rng.randint(-9, 9), rng.randint(-9, 9)] for _ in range(n)]
+    sums = [sorted(rng.sample(range(n), 2)) for _ in range(args.queries)]
+    # Products of many numbers grow huge, so product ranges stay short
+    starts = [rng.randrange(n - 64) for _ in range(args.queries)]
+    prods = [(x, x + rng.randint(1, 64)) for x in starts]
+
+    def queries(manager: ComplexManager) -> None:
+        for start, end in sums:
+            manager.sum_seq(start, end)
+        for start, end in prods:
+            manager.prod_seq(start, end)
+
+    def appends(manager: ComplexManager) -> None:
+        for _ in range(args.queries):
+            manager.add_number((1, 1))
+            manager.sum_seq(0, manager.count)
+
+    cases = (
+        ("load_json", lambda x: x.load_json(data)),
+        (f"{args.queries} random queries", queries),
+        (f"{args.queries} append + sum", appends),
+        ("replace_number", lambda x: x.replace_number(tuple(data[0]), (0, 0))),
+        (f"{args.queries} random queries", queries),
+    )
+    managers = ComplexManager(), ComplexManager(range_index=True)
+    print(f"{n} numbers")
+    print(f"{'operation':<28}{'list (s)':>10}{'index (s)':>11}{'speedup':>9}")
+    for name, run in cases:
+        plain_time, index_time = (timed(lambda: run(x)) for x in managers)
+        print(
+            f"{name:<28}{plain_time:>10.3f}{index_time:>11.3f}{plain_time / index_time:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
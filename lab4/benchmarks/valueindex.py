@@ -0,0 +1,74 @@
+"""Times find_number and replace_number with and without a ValueIndex.
+
+Run from the lab4 directory::
+
+    python -m benchmarks.valueindex --numbers 1000000 --queries 100
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Any
+from typing import Callable
+
+from classes import ComplexManager
+
+
+def timed(run: Callable[[], Any]) -> float:
+    """Times a call
+
+    Args:
+        run (Callable[[], Any]): call to be timed
+
+    Returns:
+        float: duration in seconds
+    """
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Runs the benchmark and prints a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--numbers", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    data = [
+        [rng.randint(-500, 500), rng.randint(-500, 500)] for _ in range(args.numbers)
+    ]
+    values: list[tuple[int, int]] = []
+    for _ in range(args.queries):
+        real, imag = rng.choice(data)
+        values.append((real, imag))
+
+    def finds(manager: ComplexManager) -> None:
+        for x in values:
+            manager.find_number(x)
+
+    def replaces(manager: ComplexManager) -> None:
+        for x in values:
+            manager.replace_number(x, (x[1], x[0]))
+
+    cases = (
+        ("load_json", lambda x: x.load_json(data)),
+        (f"{args.queries} find_number (first builds)", finds),
+        (f"{args.queries} replace_number", replaces),
+        (f"{args.queries} find_number", finds),
+    )
+    managers = ComplexManager(), ComplexManager(value_index=True)
+    print(f"{args.numbers} numbers")
+    print(f"{'operation':<36}{'scan (s)':>10}{'index (s)':>11}{'speedup':>9}")
+    for name, run in cases:
+        scan_time, index_time = (timed(lambda: run(x)) for x in managers)
+        print(
+            f"{name:<36}{scan_time:>10.3f}{index_time:>11.3f}{scan_time / index_time:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,12 @@
 from __future__ import annotations
 
+from .arraymanager import *
 from .complexmanager import *
 from .complexnumber import *
+from .history import *
+from .indexes import *
 from .menu import *
+from .modulusindex import *
+from .parallel import *
+from .rangeindex import *
+from .valueindex import *
@@ -0,0 +1,443 @@
+from __future__ import annotations
+
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Sequence
+
+from .complexmanager import ABS_OPS
+from .complexnumber import ComplexNumber
+from .complexnumber import ComplexType
+from .complexnumber import Number
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+__all__ = ["ArrayComplexManager"]
+
+# An edit is one of
+#   ("insert", start, values)
+#   ("delete", start, end)
+#   ("put", positions, values)
+#   ("set", values)
+# where values and positions are arrays
+Edit = tuple[Any, ...]
+
+
+def _to_numbers(values: Any) -> list[Number]:
+    """Internal: Converts a float64 array back to Numbers
+
+    Integral values become ints again, so numbers read back the way they were added.
+
+    Args:
+        values (Any): float64 array
+
+    Returns:
+        list[Number]: values, integral ones as ints
+    """
+    integral = np.isfinite(values) & (values == np.trunc(values))
+    if integral.all() and (np.abs(values) < 2**63).all():
+        return values.astype(np.int64).tolist()
+    res = values.tolist()
+    for i in np.flatnonzero(integral).tolist():
+        res[i] = int(res[i])
+    return res
+
+
+def _to_complex(values: Any) -> list[ComplexNumber]:
+    """Internal: Converts a complex128 array to ComplexNumbers
+
+    Args:
+        values (Any): complex128 array
+
+    Returns:
+        list[ComplexNumber]: the same numbers
+    """
+    return list(map(ComplexNumber, _to_numbers(values.real), _to_numbers(values.imag)))
+
+
+class ArrayComplexManager:
+    """ComplexManager with the numbers stored in a complex128 NumPy array
+
+    Filters, sums, products, abs comparisons and sorting run as vectorized
+    operations. The public API is the one of ComplexManager; checks given to
+    get_by_check and filter_by_check still run once per number.
+
+    Values are stored as float64, so integers above 2**53 lose precision.
+
+    Undo keeps the inverse of the latest change, like History does for
+    ComplexManager: the removed or replaced numbers, or the previous array
+    for whole-array changes. Changes do not copy the rest of the array.
+    """
+
+    def __init__(self) -> None:
+        if np is None:
+            raise ImportError("ArrayComplexManager requires numpy")
+        self.__buffer = np.zeros(16, dtype=np.complex128)
+        self.__size = 0
+        # Inverse edits of the latest change and of the latest undo
+        self._prev: Edit | None = None
+        self._next: Edit | None = None
+
+    @property
+    def array(self) -> Any:
+        """View of the stored numbers as a complex128 array"""
+        return self.__buffer[: self.__size]
+
+    @property
+    def nlist(self) -> list[ComplexNumber]:
+        """List of ComplexNumber types (a new list, built from the array)"""
+        return _to_complex(self.array)
+
+    @property
+    def count(self) -> int:
+        """Number of stored elements"""
+        return self.__size
+
+    def __set_array(self, values: Any) -> None:
+        """Internal: Replaces the stored numbers
+
+        Args:
+            values (Any): array-like of complex values
+        """
+        values = np.asarray(values, dtype=np.complex128)
+        self.__buffer = np.empty(max(16, 2 * len(values)), dtype=np.complex128)
+        self.__buffer[: len(values)] = values
+        self.__size = len(values)
+
+    def __reserve(self, count: int) -> None:
+        """Internal: Grows the buffer to fit more numbers
+
+        Args:
+            count (int): numbers to be added
+        """
+        size = self.__size
+        if size + count > len(self.__buffer):
+            buffer = np.empty(max(2 * size, size + count), dtype=np.complex128)
+            buffer[:size] = self.__buffer[:size]
+            self.__buffer = buffer
+
+    def __insert(self, start: int, values: Any) -> None:
+        """Internal: Inserts numbers, shifting the tail of the buffer
+
+        Args:
+            start (int): position of the first new number
+            values (Any): complex128 array of the new numbers
+        """
+        size, count = self.__size, len(values)
+        self.__reserve(count)
+        self.__buffer[start + count : size + count] = self.__buffer[start:size]
+        self.__buffer[start : start + count] = values
+        self.__size += count
+
+    def __delete(self, start: int, end: int) -> Any:
+        """Internal: Removes a sequence of numbers, shifting the tail of the buffer
+
+        Args:
+            start (int): start position of the sequence
+            end (int): end position of the sequence, start <= end <= count
+
+        Returns:
+            Any: complex128 array of the removed numbers
+        """
+        size = self.__size
+        removed = self.__buffer[start:end].copy()
+        self.__buffer[start : size - (end - start)] = self.__buffer[end:size]
+        self.__size -= end - start
+        return removed
+
+    def __apply(self, edit: Edit) -> Edit:
+        """Internal: Applies an edit to the array
+
+        Args:
+            edit (Edit): edit to be applied
+
+        Returns:
+            Edit: the inverse edit
+        """
+        kind = edit[0]
+        if kind == "insert":
+            start, values = edit[1], edit[2]
+            self.__insert(start, values)
+            return ("delete", start, start + len(values))
+        if kind == "delete":
+            return ("insert", edit[1], self.__delete(edit[1], edit[2]))
+        if kind == "put":
+            positions, values = edit[1], edit[2]
+            array = self.array
+            old = array[positions]
+            array[positions] = values
+            return ("put", positions, old)
+        # The previous buffer is dropped, so a view of it keeps its numbers
+        old = self.array
+        self.__set_array(edit[1])
+        return ("set", old)
+
+    def __record(self, edit: Edit) -> None:
+        """Internal: Keeps the inverse of the latest change for undo
+
+        Args:
+            edit (Edit): inverse edit of the change
+        """
+        self._prev = edit
+        self._next = None
+
+    def undo(self) -> bool:
+        """Undoes the latest change to the list (undo history of 1)
+
+        Returns:
+            bool: False if there was nothing to undo
+        """
+        if self._prev is None:
+            return False
+        self._next = self.__apply(self._prev)
+        self._prev = None
+        return True
+
+    def redo(self) -> bool:
+        """Redoes the latest undone change to the list
+
+        Returns:
+            bool: False if there was nothing to redo
+        """
+        if self._next is None:
+            return False
+        self._prev = self.__apply(self._next)
+        self._next = None
+        return True
+
+    def load_json(self, obj: list) -> None:
+        """Loads data from a JSON object
+
+        Args:
+            obj (list): list of data
+        """
+        pairs = np.asarray(obj, dtype=np.float64).reshape(-1, 2)
+        self.__record(self.__apply(("set", pairs[:, 0] + 1j * pairs[:, 1])))
+
+    def load_chunks(
+        self,
+        chunks: Iterable[tuple[Sequence[Number], Sequence[Number]]],
+    ) -> int:
+        """Loads data from chunks of real and imaginary parts
+
+        Each chunk is copied into the array as it arrives.
+        If reading a chunk fails, the numbers before it stay loaded and undo
+        restores the previous list.
+
+        Args:
+            chunks (Iterable[tuple[Sequence[Number], Sequence[Number]]]): real and imaginary parts of consecutive numbers
+
+        Returns:
+            int: number of elements loaded
+        """
+        old = self.array
+        self.__buffer = np.empty(16, dtype=np.complex128)
+        self.__size = 0
+        try:
+            for reals, imags in chunks:
+                count = len(reals)
+                self.__reserve(count)
+                view = self.__buffer[self.__size : self.__size + count]
+                view.real = np.asarray(reals, dtype=np.float64)
+                view.imag = np.asarray(imags, dtype=np.float64)
+                self.__size += count
+        finally:
+            self.__record(("set", old))
+        return self.__size
+
+    def add_number(self, __o: ComplexType, pos: int = -1) -> None:
+        """Adds a number to the array
+
+        Appends are amortized O(1); inserts shift the tail of the array.
+
+        Args:
+            x (ComplexType): value to be added
+            pos (int, optional): position to insert in. Defaults to appending to the list.
+        """
+        x: ComplexNumber = ComplexNumber.from_type(__o)
+        if pos < 0 or pos > self.__size:
+            pos = self.__size
+        values = np.array([complex(x.real, x.imag)])
+        self.__record(self.__apply(("insert", pos, values)))
+
+    def remove_pos_number(self, pos: int) -> None:
+        """Removes a number from the array
+
+        Shifts the tail of the array in place.
+
+        Args:
+            pos (int): position of the element to be removed
+        """
+        pos = range(self.__size)[pos]
+        self.__record(self.__apply(("delete", pos, pos + 1)))
+
+    def remove_seq_number(self, start: int, end: int) -> None:
+        """Removes a sequence of numbers from the array
+
+        Shifts the tail of the array in place.
+
+        Args:
+            start (int): start position of the sequence
+            end (int): end position of the sequence
+        """
+        start, end, _ = slice(start, end).indices(self.__size)
+        self.__record(self.__apply(("delete", start, max(start, end))))
+
+    def replace_number(self, __o1: ComplexType, __o2: ComplexType) -> None:
+        """Replaces a number in the array
+
+        Args:
+            x (ComplexType): number to be replaced
+            y (ComplexType): number to replace with
+        """
+        x: ComplexNumber = ComplexNumber.from_type(__o1)
+        y: ComplexNumber = ComplexNumber.from_type(__o2)
+        positions = np.flatnonzero(self.array == complex(x.real, x.imag))
+        if len(positions):
+            values = np.full(len(positions), complex(y.real, y.imag))
+            self.__record(self.__apply(("put", positions, values)))
+
+    def find_number(self, __o: ComplexType) -> list[int]:
+        """Get the positions of a number in the array
+
+        Args:
+            x (ComplexType): number to be found
+
+        Returns:
+            list[int]: positions of the elements equal to x, in ascending order
+        """
+        x: ComplexNumber = ComplexNumber.from_type(__o)
+        return np.flatnonzero(self.array == complex(x.real, x.imag)).tolist()
+
+    def __check_mask(self, check: Callable) -> Any:
+        """Internal: Runs a check on every number
+
+        Args:
+            check (Callable): check function. Should take ComplexNumber as argument. Expected return is bool.
+
+        Returns:
+            Any: boolean array, True where check(x) is True
+        """
+        return np.fromiter(map(check, self.nlist), dtype=bool, count=self.__size)
+
+    def __abs_mask(self, op: str, value: float) -> Any:
+        """Internal: Compares abs of every number to a value
+
+        Args:
+            op (str): comparison, one of ABS_OPS
+            value (float): value to compare abs(x) to
+
+        Returns:
+            Any: boolean array, True where abs(x) op value is True
+        """
+        array = self.array
+        return ABS_OPS[op](np.abs(array), value)
+
+    def __select(self, mask: Any) -> list[ComplexNumber]:
+        """Internal: Converts the numbers selected by a mask
+
+        Args:
+            mask (Any): boolean array
+
+        Returns:
+            list[ComplexNumber]: selected numbers
+        """
+        return _to_complex(self.array[mask])
+
+    def get_by_check(self, check: Callable) -> list[ComplexNumber]:
+        """Get a list of elements that pass a given check
+
+        Args:
+            check (Callable): check function. Should take ComplexNumber as argument. Expected return is bool.
+
+        Returns:
+            list[ComplexNumber]: list of numbers where check(x) is True
+        """
+        return self.__select(self.__check_mask(check))
+
+    def filter_by_check(self, check: Callable) -> None:
+        """Removes elements which do not pass a given check from the array
+
+        Args:
+            check (Callable): check function. Should take ComplexNumber as argument. Expected return is bool.
+        """
+        self.__record(self.__apply(("set", self.array[self.__check_mask(check)])))
+
+    def get_by_abs(self, op: str, value: float) -> list[ComplexNumber]:
+        """Get a list of elements whose abs compares to a value
+
+        Args:
+            op (str): comparison, one of ABS_OPS
+            value (float): value to compare abs(x) to
+
+        Returns:
+            list[ComplexNumber]: list of numbers where abs(x) op value is True
+        """
+        return self.__select(self.__abs_mask(op, value))
+
+    def filter_by_abs(self, op: str, value: float) -> None:
+        """Removes elements whose abs does not compare to a value from the array
+
+        Args:
+            op (str): comparison, one of ABS_OPS
+            value (float): value to compare abs(x) to
+        """
+        self.__record(self.__apply(("set", self.array[self.__abs_mask(op, value)])))
+
+    def kth_by_abs(self, k: int) -> ComplexNumber:
+        """Get the k-th smallest element by abs
+
+        Elements with equal abs keep their order in the array.
+
+        Args:
+            k (int): rank, from 0; negative ranks count from the largest
+
+        Returns:
+            ComplexNumber: the element
+        """
+        array = self.array
+        order = np.argsort(np.abs(array), kind="stable")
+        return _to_complex(array[order[k] : order[k] + 1])[0]
+
+    def get_sorted_by_imag(self, reverse: bool = False) -> list[ComplexNumber]:
+        """Get the list sorted by the imaginary part
+
+        The sort is stable, so numbers with equal imaginary parts keep their order.
+
+        Args:
+            reverse (bool, optional): sort descending. Defaults to False.
+
+        Returns:
+            list[ComplexNumber]: sorted copy of the list
+        """
+        array = self.array
+        keys = -array.imag if reverse else array.imag
+        order = np.argsort(keys, kind="stable")
+        return _to_complex(array[order])
+
+    def sum_seq(self, start: int, end: int) -> ComplexNumber:
+        """Get the sum of a sequence
+
+        Args:
+            start (int): start position of the sequence
+            end (int): end position of the sequence
+
+        Returns:
+            ComplexNumber: sum of the elements in the array[start:end]
+        """
+        return _to_complex(self.array[start:end].sum(keepdims=True))[0]
+
+    def prod_seq(self, start: int, end: int) -> ComplexNumber:
+        """Get the product of a sequence
+
+        Args:
+            start (int): start position of the sequence
+            end (int): end position of the sequence
+
+        Returns:
+            ComplexNumber: product of the elements in the array[start:end]
+        """
+        return _to_complex(self.array[start:end].prod(keepdims=True))[0]
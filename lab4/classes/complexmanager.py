@@ -1,18 +1,67 @@
 from __future__ import annotations
 
+import operator
 from typing import Any
 from typing import Callable
+from typing import Iterable
+from typing import Sequence
 
 from .complexnumber import ComplexNumber
 from .complexnumber import ComplexType
-
-__all__ = ["ComplexManager"]
+from .complexnumber import Number
+from .history import History
+from .indexes import ListIndex
+from .modulusindex import ModulusIndex
+from .parallel import ChunkPool
+from .rangeindex import RangeIndex
+from .valueindex import ValueIndex
+
+__all__ = ["ABS_OPS", "ComplexManager"]
+
+ABS_OPS: dict[str, Callable[[Any, Any], bool]] = {
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">=": operator.ge,
+    ">": operator.gt,
+}
 
 
 class ComplexManager:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        range_index: bool = False,
+        value_index: bool = False,
+        modulus_index: bool = False,
+        undo_budget: int = 1_000_000,
+        pool: ChunkPool | None = None,
+    ) -> None:
+        """Initialize the manager.
+
+        Args:
+            range_index (bool, optional): answer sum_seq and prod_seq from a RangeIndex. Defaults to False.
+            value_index (bool, optional): answer find_number and replace_number from a ValueIndex. Defaults to False.
+            modulus_index (bool, optional): answer the abs queries and filters from a ModulusIndex. Defaults to False.
+            undo_budget (int, optional): maximum number of numbers and edits kept by the undo history. Defaults to 1_000_000.
+            pool (ChunkPool | None, optional): worker processes for checks, sums and products over long sequences. Defaults to None.
+        """
         self._list: list[ComplexNumber] = []
-        self._prev: list[ComplexNumber] = []
+        self.pool = pool
+        self.history = History(self, undo_budget)
+        self._indexes: list[ListIndex] = [self.history]
+        self.__range_index: RangeIndex | None = None
+        if range_index:
+            self.__range_index = RangeIndex(self._list)
+            self._indexes.append(self.__range_index)
+        self.__value_index: ValueIndex | None = None
+        if value_index:
+            self.__value_index = ValueIndex(self._list)
+            self._indexes.append(self.__value_index)
+        self.__modulus_index: ModulusIndex | None = None
+        if modulus_index:
+            self.__modulus_index = ModulusIndex(self._list)
+            self._indexes.append(self.__modulus_index)
 
     @property
     def nlist(self) -> list[ComplexNumber]:
@@ -24,24 +73,99 @@ class ComplexManager:
         """Number of elements in _list"""
         return len(self._list)
 
-    def undo(self) -> None:
-        """Undoes the latest change to the list (undo history of 1)"""
-        self._list = self._prev.copy()
+    def undo(self) -> bool:
+        """Undoes the latest change to the list
+
+        Returns:
+            bool: False if there was nothing to undo
+        """
+        return self.history.undo()
+
+    def redo(self) -> bool:
+        """Redoes the latest undone change to the list
+
+        Returns:
+            bool: False if there was nothing to redo
+        """
+        return self.history.redo()
+
+    def _reset(self, values: list[ComplexNumber]) -> None:
+        """Replaces all numbers in _list
+
+        _list is changed in place, so indexes keep their reference to it.
+
+        Args:
+            values (list[ComplexNumber]): new numbers
+        """
+        old = self._list.copy()
+        self._list[:] = values
+        for index in self._indexes:
+            index.reset(old)
+
+    def _insert(self, start: int, values: list[ComplexNumber]) -> None:
+        """Inserts a sequence of numbers in _list
+
+        Args:
+            start (int): position to insert in, 0 <= start <= len(_list)
+            values (list[ComplexNumber]): numbers to be inserted
+        """
+        self._list[start:start] = values
+        for index in self._indexes:
+            index.insert(start, values)
+
+    def _delete(self, start: int, end: int) -> None:
+        """Removes a sequence of numbers from _list
+
+        Args:
+            start (int): start position of the sequence, 0 <= start <= end
+            end (int): end position of the sequence, at most len(_list)
+        """
+        removed = self._list[start:end]
+        del self._list[start:end]
+        for index in self._indexes:
+            index.delete(start, end, removed)
+
+    def _replace(self, pos: int, x: ComplexNumber) -> None:
+        """Replaces the number at a position of _list
+
+        Args:
+            pos (int): position of the number, 0 <= pos < len(_list)
+            x (ComplexNumber): new number
+        """
+        old = self._list[pos]
+        self._list[pos] = x
+        for index in self._indexes:
+            index.replace(pos, old, x)
+
+    def __bounds(self, start: int, end: int) -> tuple[int, int]:
+        """Internal: Converts slice bounds to positions in _list
+
+        Args:
+            start (int): start of the slice
+            end (int): end of the slice
+
+        Returns:
+            tuple[int, int]: start and end positions, with start <= end
+        """
+        start, end, _ = slice(start, end).indices(len(self._list))
+        return start, max(start, end)
 
     @staticmethod
     def updates_list(func: Callable) -> function:
         """Function wrapper for undo functionality. Use on functions which modify _list
 
+        The changes made by one call are undone together.
+
         Args:
             func (Callable): function to be wrapped
 
         Returns:
-            function: wrapped function with _prev updating
+            function: wrapped function recording a single change in the history
         """
 
         def _updates_list(*args: Any, **kwargs: Any) -> Any:
-            args[0]._prev = args[0]._list.copy()
-            return func(*args, **kwargs)
+            with args[0].history.change():
+                return func(*args, **kwargs)
 
         return _updates_list
 
@@ -52,9 +176,30 @@ class ComplexManager:
         Args:
             obj (list): list of data
         """
-        self._list.clear()
-        for x in obj:
-            self._list.append(ComplexNumber(*x))
+        self._reset([ComplexNumber(*x) for x in obj])
+
+    @updates_list
+    def load_chunks(
+        self,
+        chunks: Iterable[tuple[Sequence[Number], Sequence[Number]]],
+    ) -> int:
+        """Loads data from chunks of real and imaginary parts
+
+        Replaces the list like load_json, but builds it one chunk at a time,
+        so a large file never has to be parsed at once (see helpers.data).
+        If reading a chunk fails, the numbers before it stay loaded and undo
+        restores the previous list.
+
+        Args:
+            chunks (Iterable[tuple[Sequence[Number], Sequence[Number]]]): real and imaginary parts of consecutive numbers
+
+        Returns:
+            int: number of elements loaded
+        """
+        self._reset([])
+        for reals, imags in chunks:
+            self._insert(len(self._list), list(map(ComplexNumber, reals, imags)))
+        return len(self._list)
 
     @updates_list
     def add_number(self, __o: ComplexType, pos: int = -1) -> None:
@@ -65,9 +210,9 @@ class ComplexManager:
             pos (int, optional): position to insert in. Defaults to appending to the list.
         """
         x: ComplexNumber = ComplexNumber.from_type(__o)
-        if pos < 0:
+        if pos < 0 or pos > len(self._list):
             pos = len(self._list)
-        self._list.insert(pos, x)
+        self._insert(pos, [x])
 
     @updates_list
     def remove_pos_number(self, pos: int) -> None:
@@ -76,7 +221,8 @@ class ComplexManager:
         Args:
             pos (int): position of the element to be removed
         """
-        del self._list[pos]
+        pos = range(len(self._list))[pos]
+        self._delete(pos, pos + 1)
 
     @updates_list
     def remove_seq_number(self, start: int, end: int) -> None:
@@ -86,7 +232,7 @@ class ComplexManager:
             start (int): start position of the sequence
             end (int): end position of the sequence
         """
-        del self._list[start:end]
+        self._delete(*self.__bounds(start, end))
 
     @updates_list
     def replace_number(self, __o1: ComplexType, __o2: ComplexType) -> None:
@@ -96,9 +242,23 @@ class ComplexManager:
             x (ComplexType): number to be replaced
             y (ComplexType): number to replace with
         """
-        x: ComplexNumber = ComplexNumber.from_type(__o1)
         y: ComplexNumber = ComplexNumber.from_type(__o2)
-        self._list = [y if i == x else i for i in self._list]
+        for pos in self.find_number(__o1):
+            self._replace(pos, y)
+
+    def find_number(self, __o: ComplexType) -> list[int]:
+        """Get the positions of a number in _list
+
+        Args:
+            x (ComplexType): number to be found
+
+        Returns:
+            list[int]: positions of the elements equal to x, in ascending order
+        """
+        x: ComplexNumber = ComplexNumber.from_type(__o)
+        if self.__value_index is not None:
+            return self.__value_index.find(x)
+        return [i for i, value in enumerate(self._list) if value == x]
 
     def get_by_check(self, check: Callable) -> list[ComplexNumber]:
         """Get a list of elements that pass a given check
@@ -109,6 +269,10 @@ class ComplexManager:
         Returns:
             list[ComplexNumber]: list of numbers where check(x) is True
         """
+        if self.pool is not None:
+            res = self.pool.get_by_check(self._list, check)
+            if res is not None:
+                return res
         return [x for x in self._list if check(x)]
 
     @updates_list
@@ -118,7 +282,62 @@ class ComplexManager:
         Args:
             check (Callable): check function. Should take ComplexNumber as argument. Expected return is bool.
         """
-        self._list = self.get_by_check(check)
+        self._reset(self.get_by_check(check))
+
+    def get_by_abs(self, op: str, value: float) -> list[ComplexNumber]:
+        """Get a list of elements whose abs compares to a value
+
+        Args:
+            op (str): comparison, one of ABS_OPS
+            value (float): value to compare abs(x) to
+
+        Returns:
+            list[ComplexNumber]: list of numbers where abs(x) op value is True
+        """
+        compare = ABS_OPS[op]
+        if self.__modulus_index is not None:
+            positions = self.__modulus_index.positions(op, value)
+            if positions is not None:
+                return [self._list[i] for i in positions]
+        return [x for x in self._list if compare(abs(x), value)]
+
+    @updates_list
+    def filter_by_abs(self, op: str, value: float) -> None:
+        """Removes elements whose abs does not compare to a value from the list
+
+        Args:
+            op (str): comparison, one of ABS_OPS
+            value (float): value to compare abs(x) to
+        """
+        self._reset(self.get_by_abs(op, value))
+
+    def kth_by_abs(self, k: int) -> ComplexNumber:
+        """Get the k-th smallest element by abs
+
+        Elements with equal abs keep their order in the list.
+
+        Args:
+            k (int): rank, from 0; negative ranks count from the largest
+
+        Returns:
+            ComplexNumber: the element
+        """
+        if self.__modulus_index is not None:
+            return self._list[self.__modulus_index.kth(k)]
+        return sorted(self._list, key=abs)[k]
+
+    def get_sorted_by_imag(self, reverse: bool = False) -> list[ComplexNumber]:
+        """Get the list sorted by the imaginary part
+
+        The sort is stable, so numbers with equal imaginary parts keep their order.
+
+        Args:
+            reverse (bool, optional): sort descending. Defaults to False.
+
+        Returns:
+            list[ComplexNumber]: sorted copy of the list
+        """
+        return sorted(self._list, reverse=reverse, key=lambda x: x.imag)
 
     def sum_seq(self, start: int, end: int) -> ComplexNumber:
         """Get the sum of a sequence
@@ -130,6 +349,12 @@ class ComplexManager:
         Returns:
             ComplexNumber: sum of the elements in _list[start:end]
         """
+        if self.__range_index is not None:
+            return self.__range_index.sum(*self.__bounds(start, end))
+        if self.pool is not None:
+            res = self.pool.sum(self._list, *self.__bounds(start, end))
+            if res is not None:
+                return res
         res = ComplexNumber(0, 0)
         for x in self._list[start:end]:
             res += x
@@ -145,6 +370,12 @@ class ComplexManager:
         Returns:
             ComplexNumber: product of the elements in _list[start:end]
         """
+        if self.__range_index is not None:
+            return self.__range_index.prod(*self.__bounds(start, end))
+        if self.pool is not None:
+            res = self.pool.prod(self._list, *self.__bounds(start, end))
+            if res is not None:
+                return res
         res = ComplexNumber(1, 0)
         for x in self._list[start:end]:
             res *= x
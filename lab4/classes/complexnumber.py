@@ -1,23 +1,40 @@
 from __future__ import annotations
 
+import functools
 import math
+import sys
 from dataclasses import dataclass
+from dataclasses import field
 from typing import Any
 from typing import Callable
 from typing import SupportsAbs
 from typing import SupportsFloat
 from typing import SupportsInt
 from typing import SupportsRound
-
-from typeguard import check_type
+from typing import TypeVar
 
 __all__ = ["Number", "ComplexType", "ComplexNumber"]
 
+_T = TypeVar("_T")
+
 
-@dataclass
+@dataclass(frozen=True, slots=True, init=False)
 class ComplexNumber(SupportsAbs, SupportsFloat, SupportsInt, SupportsRound):
+    """Immutable complex number
+
+    Instances have no __dict__, and abs(x) is computed once and cached.
+    """
+
     real: Number
     imag: Number
+    _abs: float | None = field(default=None, init=False, repr=False, compare=False)
+
+    def __init__(self, real: Number, imag: Number) -> None:
+        # Frozen dataclasses set fields with object.__setattr__; the slot
+        # descriptors are about twice as fast
+        _set_real(self, real)
+        _set_imag(self, imag)
+        _set_abs(self, None)
 
     @classmethod
     def from_type(cls: Any, x: Any) -> ComplexNumber:
@@ -29,35 +46,42 @@ class ComplexNumber(SupportsAbs, SupportsFloat, SupportsInt, SupportsRound):
         Returns:
             x (ComplexNumber): a ComplexNumber object
         """
-        if isinstance(x, cls):
+        if type(x) is ComplexNumber:
             return x
-        if isinstance(x, tuple):
-            return ComplexNumber(*x)
-        try:
-            check_type("x", x, Number)
+        kind = _KINDS.get(type(x)) or _classify(type(x))
+        if kind == _COMPLEX and (cls is ComplexNumber or isinstance(x, cls)):
+            return x
+        if kind == _NUMBER:
             return ComplexNumber(x, 0)
-        except:
-            raise TypeError(f"Type of value is {type(x)}. Expected: {ComplexType}")
+        if kind == _TUPLE and _is_pair(x):
+            return ComplexNumber(*x)
+        raise TypeError(f"Type of value is {type(x)}. Expected: {ComplexType}")
 
     @staticmethod
-    def ensure_type(func: Callable) -> function:
+    def ensure_type(
+        func: Callable[[ComplexNumber, ComplexNumber], _T],
+    ) -> Callable[[ComplexNumber, Any], _T]:
         """Function wrapper for ComplexNumber casting
 
         Args:
-            func (Callable): function to be wrapped
+            func (Callable[[ComplexNumber, ComplexNumber], _T]): function to be wrapped
 
         Returns:
-            function: wrapped function with ComplexType to ComplexNumber casting
+            Callable[[ComplexNumber, Any], _T]: wrapped function with ComplexType to ComplexNumber casting
         """
 
-        def _ensure_type(*args: Any, **kwargs: Any) -> Any:
-            safe_args = args[0], ComplexNumber.from_type(args[1])
-            return func(*safe_args, **kwargs)
+        @functools.wraps(func)
+        def _ensure_type(self: ComplexNumber, other: Any) -> _T:
+            if type(other) is not ComplexNumber:
+                other = ComplexNumber.from_type(other)
+            return func(self, other)
 
         return _ensure_type
 
     def __abs__(self) -> float:
-        return math.sqrt(self.real**2 + self.imag**2)
+        if self._abs is None:
+            _set_abs(self, math.hypot(self.real, self.imag))
+        return self._abs  # type: ignore
 
     def __float__(self) -> float:
         return abs(self)
@@ -129,20 +153,25 @@ class ComplexNumber(SupportsAbs, SupportsFloat, SupportsInt, SupportsRound):
         return abs(self) > abs(__o) or self == __o
 
     def __eq__(self, __o: Any) -> bool:
-        try:
-            check_type("__o", __o, ComplexType)
-        except:
-            return NotImplemented
-        x = ComplexNumber.from_type(__o)
-        return self.real == x.real and self.imag == x.imag
+        if type(__o) is ComplexNumber:
+            return self.real == __o.real and self.imag == __o.imag
+        kind = _KINDS.get(type(__o)) or _classify(type(__o))
+        if kind == _COMPLEX:
+            return self.real == __o.real and self.imag == __o.imag
+        if kind == _NUMBER:
+            return self.real == __o and self.imag == 0
+        if kind == _TUPLE and _is_pair(__o):
+            return self.real == __o[0] and self.imag == __o[1]
+        return NotImplemented
 
     def __ne__(self, __o: Any) -> bool:
-        try:
-            check_type("__o", __o, ComplexType)
-        except:
-            return NotImplemented
-        x = ComplexNumber.from_type(__o)
-        return not self == x
+        res = self.__eq__(__o)
+        return res if res is NotImplemented else not res
+
+    def __hash__(self) -> int:
+        # Hashed like the builtin complex, so ComplexNumber(x, 0) hashes like
+        # the Number x it is equal to. Tuples compare equal but hash differently.
+        return hash(self.real) + _HASH_IMAG * hash(self.imag)
 
     def __repr__(self) -> str:
         return f"ComplexNumber({self.real} + {self.imag}i)"
@@ -151,5 +180,62 @@ class ComplexNumber(SupportsAbs, SupportsFloat, SupportsInt, SupportsRound):
         return f"({self.real} + {self.imag}i)"
 
 
+_HASH_IMAG = sys.hash_info.imag
+
+_set_real = ComplexNumber.real.__set__  # type: ignore
+_set_imag = ComplexNumber.imag.__set__  # type: ignore
+_set_abs = ComplexNumber._abs.__set__  # type: ignore
+
 Number = int | float
 ComplexType = ComplexNumber | tuple[Number, Number] | Number  # type: ignore
+
+
+_COMPLEX, _NUMBER, _TUPLE, _OTHER = range(1, 5)
+
+# Kind of each type seen by the ComplexType dispatch
+_KINDS: dict[type, int] = {}
+
+
+def _classify(cls: type) -> int:
+    """Internal: Classifies a type for the ComplexType dispatch and caches it
+
+    Each type is resolved once, since isinstance checks against ComplexNumber
+    go through the slow Protocol metaclass of its Supports* bases.
+
+    Args:
+        cls (type): type to be classified
+
+    Returns:
+        int: _COMPLEX, _NUMBER (int, bool included, or float), _TUPLE or _OTHER
+    """
+    if issubclass(cls, ComplexNumber):
+        kind = _COMPLEX
+    elif issubclass(cls, (int, float)):
+        kind = _NUMBER
+    elif issubclass(cls, tuple):
+        kind = _TUPLE
+    else:
+        kind = _OTHER
+    _KINDS[cls] = kind
+    return kind
+
+
+def _is_pair(x: tuple) -> bool:
+    """Internal: Checks whether a tuple is a tuple[Number, Number]
+
+    Args:
+        x (tuple): tuple to be checked
+
+    Returns:
+        bool: True if x holds exactly two Numbers
+    """
+    if len(x) != 2:
+        return False
+    for i in x:
+        if (_KINDS.get(type(i)) or _classify(type(i))) != _NUMBER:
+            return False
+    return True
+
+
+for _type in (ComplexNumber, int, float, bool, tuple):
+    _classify(_type)
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+from collections import deque
+from contextlib import contextmanager
+from typing import Any
+from typing import Iterator
+from typing import TYPE_CHECKING
+
+from .complexnumber import ComplexNumber
+from .indexes import ListIndex
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .complexmanager import ComplexManager
+
+__all__ = ["History"]
+
+# An edit is one of
+#   ("insert", start, values)
+#   ("delete", start, removed)
+#   ("replace", pos, old, new)
+#   ("reset", old, new)
+Edit = tuple[Any, ...]
+
+
+def _edit_size(edit: Edit) -> int:
+    """Internal: Counts the numbers held by an edit, plus one for the edit itself
+
+    Args:
+        edit (Edit): edit to be measured
+
+    Returns:
+        int: size of the edit
+    """
+    if edit[0] in ("insert", "delete"):
+        return 1 + len(edit[2])
+    if edit[0] == "reset":
+        return 1 + len(edit[1]) + len(edit[2])
+    return 1
+
+
+class History(ListIndex):
+    """Undo and redo history of a ComplexManager
+
+    Listens to the changes of the manager's list and keeps each one as the
+    edits it made: inserted numbers, removed sequences, replaced numbers
+    and, for whole-list changes, both lists. Undoing applies the inverse
+    edits, so a change costs memory in proportion to what it touched rather
+    than to the length of the list.
+
+    The edits made by one call of a manager method form a single change.
+    When the history holds more than budget numbers, the oldest changes are
+    dropped.
+    """
+
+    def __init__(self, manager: ComplexManager, budget: int = 1_000_000) -> None:
+        """Initialize the history.
+
+        Args:
+            manager (ComplexManager): manager whose changes are recorded
+            budget (int, optional): maximum number of numbers and edits kept. 0 disables the history. Defaults to 1_000_000.
+        """
+        self.__manager = manager
+        self.budget = budget
+        self.__undo: deque[list[Edit]] = deque()
+        self.__redo: list[list[Edit]] = []
+        self.__size = 0
+        self.__change: list[Edit] | None = None
+        self.__replaying = False
+
+    @property
+    def size(self) -> int:
+        """Number of numbers and edits kept"""
+        return self.__size
+
+    @property
+    def can_undo(self) -> bool:
+        """Whether there is a change to undo"""
+        return bool(self.__undo)
+
+    @property
+    def can_redo(self) -> bool:
+        """Whether there is an undone change to redo"""
+        return bool(self.__redo)
+
+    def clear(self) -> None:
+        """Forgets all changes"""
+        self.__undo.clear()
+        self.__redo.clear()
+        self.__size = 0
+
+    @contextmanager
+    def change(self) -> Iterator[None]:
+        """Groups the edits made inside the block into one change
+
+        Nested blocks join the outermost change.
+        """
+        if self.__change is not None:
+            yield
+            return
+        self.__change = []
+        try:
+            yield
+        finally:
+            edits, self.__change = self.__change, None
+            if edits:
+                self.__push(edits)
+
+    def __push(self, edits: list[Edit]) -> None:
+        """Internal: Adds a change and drops the oldest ones over the budget
+
+        Args:
+            edits (list[Edit]): edits of the change
+        """
+        self.__redo_clear()
+        size = sum(_edit_size(x) for x in edits)
+        if size > self.budget:
+            self.clear()
+            return
+        self.__undo.append(edits)
+        self.__size += size
+        while self.__size > self.budget:
+            self.__size -= sum(_edit_size(x) for x in self.__undo.popleft())
+
+    def __redo_clear(self) -> None:
+        """Internal: Forgets the undone changes"""
+        for edits in self.__redo:
+            self.__size -= sum(_edit_size(x) for x in edits)
+        self.__redo.clear()
+
+    def __record(self, edit: Edit) -> None:
+        """Internal: Records an edit of the current change
+
+        Args:
+            edit (Edit): edit to be recorded
+        """
+        if self.__replaying or self.budget <= 0:
+            return
+        if self.__change is None:
+            self.__push([edit])
+        else:
+            self.__change.append(edit)
+
+    def reset(self, old: list[ComplexNumber]) -> None:
+        self.__record(("reset", old, self.__manager.nlist.copy()))
+
+    def insert(self, start: int, values: list[ComplexNumber]) -> None:
+        self.__record(("insert", start, values))
+
+    def delete(self, start: int, end: int, removed: list[ComplexNumber]) -> None:
+        self.__record(("delete", start, removed))
+
+    def replace(self, pos: int, old: ComplexNumber, new: ComplexNumber) -> None:
+        self.__record(("replace", pos, old, new))
+
+    def __apply(self, edit: Edit, inverse: bool) -> None:
+        """Internal: Applies an edit, or its inverse, to the manager
+
+        Args:
+            edit (Edit): edit to be applied
+            inverse (bool): apply the inverse of the edit
+        """
+        manager = self.__manager
+        kind = edit[0]
+        if kind in ("insert", "delete"):
+            start, values = edit[1], edit[2]
+            if inverse == (kind == "insert"):
+                manager._delete(start, start + len(values))
+            else:
+                manager._insert(start, values)
+        elif kind == "replace":
+            manager._replace(edit[1], edit[2] if inverse else edit[3])
+        else:
+            manager._reset(edit[1] if inverse else edit[2])
+
+    def undo(self) -> bool:
+        """Undoes the latest change
+
+        Returns:
+            bool: False if there was nothing to undo
+        """
+        if not self.__undo:
+            return False
+        edits = self.__undo.pop()
+        self.__replaying = True
+        try:
+            for edit in reversed(edits):
+                self.__apply(edit, True)
+        finally:
+            self.__replaying = False
+        self.__redo.append(edits)
+        return True
+
+    def redo(self) -> bool:
+        """Redoes the latest undone change
+
+        Returns:
+            bool: False if there was nothing to redo
+        """
+        if not self.__redo:
+            return False
+        edits = self.__redo.pop()
+        self.__replaying = True
+        try:
+            for edit in edits:
+                self.__apply(edit, False)
+        finally:
+            self.__replaying = False
+        self.__undo.append(edits)
+        return True
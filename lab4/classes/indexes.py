@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+from itertools import chain
+from typing import Iterator
+
+from .complexnumber import ComplexNumber
+
+__all__ = ["ElementIds", "ListIndex"]
+
+
+class ListIndex:
+    """Base class of the indexes a ComplexManager keeps in sync with its list
+
+    The manager calls these hooks after each change to its list, with the
+    positions the change applied to. Indexes that are rebuilt lazily can
+    read the list they were created with.
+    """
+
+    def reset(self, old: list[ComplexNumber]) -> None:
+        """Called after the whole list was replaced
+
+        Args:
+            old (list[ComplexNumber]): the previous numbers
+        """
+        raise NotImplementedError
+
+    def insert(self, start: int, values: list[ComplexNumber]) -> None:
+        """Called after a sequence of numbers was inserted
+
+        Args:
+            start (int): position of the first new number
+            values (list[ComplexNumber]): the new numbers
+        """
+        raise NotImplementedError
+
+    def delete(self, start: int, end: int, removed: list[ComplexNumber]) -> None:
+        """Called after a sequence of numbers was removed
+
+        Args:
+            start (int): start position of the removed sequence
+            end (int): end position of the removed sequence
+            removed (list[ComplexNumber]): the removed numbers
+        """
+        raise NotImplementedError
+
+    def replace(self, pos: int, old: ComplexNumber, new: ComplexNumber) -> None:
+        """Called after a number was replaced
+
+        Args:
+            pos (int): position of the number
+            old (ComplexNumber): the replaced number
+            new (ComplexNumber): the number it was replaced with
+        """
+        raise NotImplementedError
+
+
+class ElementIds:
+    """Stable ids of the numbers of a list, which give their current positions
+
+    Indexes can key their entries by id instead of by position, so that
+    inserting or removing numbers does not change the entries of the other
+    numbers. The ids are kept in list order in blocks of at most 2 * LOAD,
+    with a Fenwick tree of the block sizes: a change updates one or a few
+    blocks and O(log blocks) tree nodes, and the position of an id is the
+    size of the blocks before its own plus its offset in it.
+    """
+
+    LOAD = 256
+
+    def __init__(self, count: int = 0) -> None:
+        """Initialize the ids.
+
+        Args:
+            count (int, optional): length of the list, whose numbers get the ids 0 to count - 1. Defaults to 0.
+        """
+        self.__next = 0
+        self.__len = 0
+        self.__blocks: list[list[int]] = []
+        # Block of each id, and position of each block (by id()) in __blocks
+        self.__block_of: dict[int, list[int]] = {}
+        self.__block_pos: dict[int, int] = {}
+        # Fenwick tree of the block sizes, from 1
+        self.__tree = [0]
+        self.insert(0, count)
+
+    def __len__(self) -> int:
+        return self.__len
+
+    def __iter__(self) -> Iterator[int]:
+        return chain.from_iterable(self.__blocks)
+
+    def __rebuild(self) -> None:
+        """Internal: Drops empty blocks, merges small ones and splits large ones"""
+        load = self.LOAD
+        blocks: list[list[int]] = []
+        for block in self.__blocks:
+            if blocks and len(blocks[-1]) + len(block) <= load:
+                blocks[-1].extend(block)
+                self.__block_of.update(dict.fromkeys(block, blocks[-1]))
+            elif len(block) > 2 * load:
+                blocks.append(block[:load])
+                self.__block_of.update(dict.fromkeys(blocks[-1], blocks[-1]))
+                for i in range(load, len(block), load):
+                    blocks.append(block[i : i + load])
+                    self.__block_of.update(dict.fromkeys(blocks[-1], blocks[-1]))
+            elif block:
+                blocks.append(block)
+        self.__blocks = blocks
+        self.__block_pos = {id(block): i for i, block in enumerate(blocks)}
+        tree = [0] * (len(blocks) + 1)
+        for i, block in enumerate(blocks, 1):
+            tree[i] += len(block)
+            parent = i + (i & -i)
+            if parent <= len(blocks):
+                tree[parent] += tree[i]
+        self.__tree = tree
+
+    def __add(self, i: int, delta: int) -> None:
+        """Internal: Changes the size of a block in the tree
+
+        Args:
+            i (int): position of the block
+            delta (int): change of its size
+        """
+        tree = self.__tree
+        i += 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def __locate(self, pos: int) -> tuple[int, int]:
+        """Internal: Finds the block holding a position
+
+        Args:
+            pos (int): position, 0 <= pos <= len(self)
+
+        Returns:
+            tuple[int, int]: position of the block and offset in it, or (number of blocks, 0) for len(self)
+        """
+        tree = self.__tree
+        i, step = 0, 1 << (len(tree) - 1).bit_length()
+        while step:
+            j = i + step
+            if j < len(tree) and tree[j] <= pos:
+                i = j
+                pos -= tree[j]
+            step >>= 1
+        return i, pos
+
+    def insert(self, start: int, count: int) -> range:
+        """Gives ids to numbers inserted in the list
+
+        Args:
+            start (int): position of the first new number
+            count (int): number of new numbers
+
+        Returns:
+            range: ids of the new numbers, in list order
+        """
+        ids = range(self.__next, self.__next + count)
+        if not count:
+            return ids
+        self.__next += count
+        self.__len += count
+        i, offset = self.__locate(start)
+        if i == len(self.__blocks):
+            if not self.__blocks:
+                self.__blocks.append([])
+                self.__block_pos[id(self.__blocks[0])] = 0
+                self.__tree.append(0)
+            i -= i and 1
+            offset = len(self.__blocks[i])
+        block = self.__blocks[i]
+        block[offset:offset] = ids
+        self.__block_of.update(dict.fromkeys(ids, block))
+        if len(block) > 2 * self.LOAD:
+            self.__rebuild()
+        else:
+            self.__add(i, count)
+        return ids
+
+    def delete(self, start: int, end: int) -> list[int]:
+        """Drops the ids of numbers removed from the list
+
+        Args:
+            start (int): start position of the removed sequence
+            end (int): end position of the removed sequence
+
+        Returns:
+            list[int]: ids of the removed numbers, in list order
+        """
+        removed: list[int] = []
+        i, offset = self.__locate(start)
+        rebuild = False
+        while len(removed) < end - start:
+            block = self.__blocks[i]
+            part = block[offset : offset + end - start - len(removed)]
+            del block[offset : offset + len(part)]
+            removed.extend(part)
+            if block:
+                self.__add(i, -len(part))
+            else:
+                rebuild = True
+            i, offset = i + 1, 0
+        for x in removed:
+            del self.__block_of[x]
+        self.__len -= len(removed)
+        if rebuild:
+            self.__rebuild()
+        return removed
+
+    def id_at(self, pos: int) -> int:
+        """Get the id of the number at a position
+
+        Args:
+            pos (int): position, 0 <= pos < len(self)
+
+        Returns:
+            int: id of the number
+        """
+        i, offset = self.__locate(pos)
+        return self.__blocks[i][offset]
+
+    def position(self, x: int) -> int:
+        """Get the current position of an id
+
+        Args:
+            x (int): id of a number in the list
+
+        Returns:
+            int: position of the number
+        """
+        block = self.__block_of[x]
+        i = self.__block_pos[id(block)]
+        tree, pos = self.__tree, 0
+        while i:
+            pos += tree[i]
+            i -= i & -i
+        return pos + block.index(x)
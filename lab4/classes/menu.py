@@ -7,6 +7,7 @@ from helpers import data
 from helpers import numbers
 from helpers import terminal
 
+from .arraymanager import ArrayComplexManager
 from .complexmanager import ComplexManager
 
 __all__ = ["MenuOption", "Menu"]
@@ -33,8 +34,18 @@ class MenuOption:
 class Menu:
     """Menu class"""
 
-    def __init__(self) -> None:
-        self.manager: ComplexManager = ComplexManager()
+    def __init__(
+        self,
+        manager: ComplexManager | ArrayComplexManager | None = None,
+    ) -> None:
+        """Initialize the menu.
+
+        Args:
+            manager (ComplexManager | ArrayComplexManager | None, optional): manager of the list. Defaults to a new ComplexManager.
+        """
+        self.manager: ComplexManager | ArrayComplexManager = (
+            manager if manager is not None else ComplexManager()
+        )
         self.__options: list[MenuOption] = []
         self.__populate_options()
 
@@ -46,6 +57,13 @@ class Menu:
                 lambda: self.manager.load_json(data.load_sample()),
             ),
         )
+        self.__options.append(
+            MenuOption(
+                "Load numbers from a JSON, CSV or binary file",
+                self.__load_file,
+                True,
+            ),
+        )
         self.__options.append(
             MenuOption(
                 "Append a complex number to the list",
@@ -89,6 +107,15 @@ class Menu:
                 ),
             ),
         )
+        self.__options.append(
+            MenuOption(
+                "Print the positions of a number in the list",
+                lambda: self.manager.find_number(
+                    terminal.read_complex("Enter the number: "),
+                ),
+                True,
+            ),
+        )
         self.__options.append(
             MenuOption(
                 "Print the imaginary part of elements in a subsequence",
@@ -99,14 +126,23 @@ class Menu:
         self.__options.append(
             MenuOption(
                 "Print all elements with an abs lower than 10",
-                lambda: self.manager.get_by_check(lambda x: abs(x) < 10),
+                lambda: self.manager.get_by_abs("<", 10),
                 True,
             ),
         )
         self.__options.append(
             MenuOption(
                 "Print all elements with an abs equal to 10",
-                lambda: self.manager.get_by_check(lambda x: abs(x) == 10),
+                lambda: self.manager.get_by_abs("==", 10),
+                True,
+            ),
+        )
+        self.__options.append(
+            MenuOption(
+                "Print the k-th smallest element by abs",
+                lambda: self.manager.kth_by_abs(
+                    terminal.read_int("Enter k (from 1): ") - 1,
+                ),
                 True,
             ),
         )
@@ -133,16 +169,14 @@ class Menu:
         self.__options.append(
             MenuOption(
                 "Print the list sorted by the imaginary part descending",
-                lambda: sorted(self.manager.nlist, reverse=True, key=lambda x: x.imag),
+                lambda: self.manager.get_sorted_by_imag(reverse=True),
                 True,
             ),
         )
         self.__options.append(
             MenuOption(
                 "Filter numbers with a prime real part",
-                lambda: self.manager.filter_by_check(
-                    lambda x: not numbers.check_prime(x.real),
-                ),
+                self.__filter_prime_real,
             ),
         )
         self.__options.append(
@@ -150,7 +184,7 @@ class Menu:
                 "Filter numbers with abs < a given value",
                 lambda: (
                     chk := terminal.read_int("Enter the number: "),
-                    self.manager.filter_by_check(lambda x: abs(x) > chk),
+                    self.manager.filter_by_abs(">", chk),
                 ),
             ),
         )
@@ -159,7 +193,7 @@ class Menu:
                 "Filter numbers with abs == a given value",
                 lambda: (
                     chk := terminal.read_int("Enter the number: "),
-                    self.manager.filter_by_check(lambda x: abs(x) != chk),
+                    self.manager.filter_by_abs("!=", chk),
                 ),
             ),
         )
@@ -168,7 +202,7 @@ class Menu:
                 "Filter numbers with abs > a given value",
                 lambda: (
                     chk := terminal.read_int("Enter the number: "),
-                    self.manager.filter_by_check(lambda x: abs(x) < chk),
+                    self.manager.filter_by_abs("<", chk),
                 ),
             ),
         )
@@ -178,6 +212,12 @@ class Menu:
                 self.manager.undo,
             ),
         )
+        self.__options.append(
+            MenuOption(
+                "Redo the last undone change to the list",
+                self.manager.redo,
+            ),
+        )
         self.__options.append(
             MenuOption(
                 "Exit",
@@ -185,6 +225,27 @@ class Menu:
             ),
         )
 
+    def __load_file(self) -> data.LoadReport | str:
+        """Internal: Loads the numbers of a file chosen by the user
+
+        Returns:
+            data.LoadReport | str: throughput of the load, or the error which stopped it
+        """
+        path = input("Enter the path: ")
+        try:
+            return data.load_file(self.manager, path)
+        except (OSError, ValueError) as e:
+            return f"Could not load the file: {e}"
+
+    def __filter_prime_real(self) -> None:
+        """Internal: Filters the numbers with a prime real part
+
+        The sieve is grown once to the largest real part, instead of
+        doubling while the numbers are checked.
+        """
+        numbers.PRIMES.reserve(max((x.real for x in self.manager.nlist), default=0))
+        self.manager.filter_by_check(numbers.check_real_not_prime)
+
     def __get_menu_text(self) -> str:
         """Internal: Returns a string representation of the menu text
 
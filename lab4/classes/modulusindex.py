@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import bisect
+import math
+from operator import itemgetter
+from typing import Any
+
+from .complexnumber import ComplexNumber
+from .indexes import ElementIds
+from .indexes import ListIndex
+
+__all__ = ["ModulusIndex"]
+
+
+class _SortedList:
+    """Internal: Sorted list split into buckets of about LOAD items
+
+    Adding or removing an item is a binary search and an insert into one
+    bucket. Positional access goes through the bucket offsets, which are
+    recomputed after changes, one entry per bucket.
+    """
+
+    LOAD = 512
+
+    def __init__(self, items: list) -> None:
+        """Initialize the list.
+
+        Args:
+            items (list): initial items, in any order
+        """
+        items = sorted(items)
+        load = self.LOAD
+        self.__buckets = [items[i : i + load] for i in range(0, len(items), load)]
+        self.__maxes = [x[-1] for x in self.__buckets]
+        self.__offsets: list[int] | None = None
+        self.__len = len(items)
+
+    def __len__(self) -> int:
+        return self.__len
+
+    def add(self, item: Any) -> None:
+        """Adds an item
+
+        Args:
+            item (Any): item to be added
+        """
+        buckets, maxes = self.__buckets, self.__maxes
+        self.__offsets = None
+        self.__len += 1
+        if not buckets:
+            buckets.append([item])
+            maxes.append(item)
+            return
+        i = min(bisect.bisect_left(maxes, item), len(buckets) - 1)
+        bucket = buckets[i]
+        bisect.insort(bucket, item)
+        maxes[i] = bucket[-1]
+        if len(bucket) > 2 * self.LOAD:
+            buckets[i : i + 1] = bucket[: self.LOAD], bucket[self.LOAD :]
+            maxes[i : i + 1] = bucket[self.LOAD - 1], bucket[-1]
+
+    def remove(self, item: Any) -> None:
+        """Removes an item
+
+        Args:
+            item (Any): item to be removed, which must be in the list
+        """
+        buckets, maxes = self.__buckets, self.__maxes
+        i = bisect.bisect_left(maxes, item)
+        bucket = buckets[i]
+        del bucket[bisect.bisect_left(bucket, item)]
+        if bucket:
+            maxes[i] = bucket[-1]
+        else:
+            del buckets[i]
+            del maxes[i]
+        self.__offsets = None
+        self.__len -= 1
+
+    def __get_offsets(self) -> list[int]:
+        """Internal: Returns the position of the first item of each bucket
+
+        Returns:
+            list[int]: offsets of the buckets
+        """
+        if self.__offsets is None:
+            offsets, total = [], 0
+            for bucket in self.__buckets:
+                offsets.append(total)
+                total += len(bucket)
+            self.__offsets = offsets
+        return self.__offsets
+
+    def bisect_left(self, item: Any) -> int:
+        """Get the position where an item would be inserted, before equal items
+
+        Args:
+            item (Any): item to be searched
+
+        Returns:
+            int: number of items smaller than item
+        """
+        i = bisect.bisect_left(self.__maxes, item)
+        if i == len(self.__buckets):
+            return self.__len
+        return self.__get_offsets()[i] + bisect.bisect_left(self.__buckets[i], item)
+
+    def __getitem__(self, index: int) -> Any:
+        offsets = self.__get_offsets()
+        i = bisect.bisect_right(offsets, index) - 1
+        return self.__buckets[i][index - offsets[i]]
+
+    def items(self, start: int, end: int) -> list:
+        """Get the items between two positions
+
+        Args:
+            start (int): position of the first item
+            end (int): position after the last item
+
+        Returns:
+            list: items in sorted order
+        """
+        if start >= end:
+            return []
+        offsets = self.__get_offsets()
+        i = bisect.bisect_right(offsets, start) - 1
+        res = self.__buckets[i][start - offsets[i] : end - offsets[i]]
+        for bucket in self.__buckets[i + 1 :]:
+            if len(res) >= end - start:
+                break
+            res.extend(bucket[: end - start - len(res)])
+        return res
+
+
+class ModulusIndex(ListIndex):
+    """Numbers of a ComplexManager list ordered by abs
+
+    Keeps (abs(x), id) entries in a bucketed sorted list, where id is the
+    ElementIds id of the number, so threshold and equality queries on abs
+    are two binary searches plus the matches, and the k-th smallest number
+    is a positional lookup. abs(x) is the cached modulus of ComplexNumber,
+    so the results are exactly the ones of comparing abs(x) element by
+    element. NaN moduli do not compare, so their ids are kept apart and
+    ranked after every other number.
+
+    Like ValueIndex, inserting, removing or replacing numbers anywhere only
+    updates the entries of those numbers. The index is built by the first
+    query after the whole list is replaced.
+    """
+
+    SCAN_RATIO = 16
+
+    def __init__(self, values: list[ComplexNumber]) -> None:
+        """Initialize the index.
+
+        Args:
+            values (list[ComplexNumber]): list to be indexed, read when the index is built
+        """
+        self.__values = values
+        self.__ids: ElementIds | None = None
+        self.__sorted = _SortedList([])
+        self.__nan: set[int] = set()
+
+    def __add(self, x: ComplexNumber, key: int) -> None:
+        """Internal: Adds the entry of a number
+
+        Args:
+            x (ComplexNumber): value of the number
+            key (int): id of the number
+        """
+        modulus = abs(x)
+        if math.isnan(modulus):
+            self.__nan.add(key)
+        else:
+            self.__sorted.add((modulus, key))
+
+    def __remove(self, x: ComplexNumber, key: int) -> None:
+        """Internal: Removes the entry of a number
+
+        Args:
+            x (ComplexNumber): value of the number
+            key (int): id of the number
+        """
+        modulus = abs(x)
+        if math.isnan(modulus):
+            self.__nan.remove(key)
+        else:
+            self.__sorted.remove((modulus, key))
+
+    def reset(self, old: list[ComplexNumber]) -> None:
+        self.__ids = None
+        self.__sorted = _SortedList([])
+        self.__nan = set()
+
+    def insert(self, start: int, values: list[ComplexNumber]) -> None:
+        if self.__ids is None:
+            return
+        for key, x in zip(self.__ids.insert(start, len(values)), values):
+            self.__add(x, key)
+
+    def delete(self, start: int, end: int, removed: list[ComplexNumber]) -> None:
+        if self.__ids is None:
+            return
+        for key, x in zip(self.__ids.delete(start, end), removed):
+            self.__remove(x, key)
+
+    def replace(self, pos: int, old: ComplexNumber, new: ComplexNumber) -> None:
+        if self.__ids is None:
+            return
+        key = self.__ids.id_at(pos)
+        self.__remove(old, key)
+        self.__add(new, key)
+
+    def __get_ids(self) -> ElementIds:
+        """Internal: Returns the ids of the numbers, building the index if needed
+
+        Returns:
+            ElementIds: ids of the numbers
+        """
+        if self.__ids is None:
+            self.__ids = ElementIds(len(self.__values))
+            entries = [(abs(x), i) for i, x in enumerate(self.__values)]
+            self.__nan = {i for x, i in entries if math.isnan(x)}
+            if self.__nan:
+                entries = [x for x in entries if not math.isnan(x[0])]
+            self.__sorted = _SortedList(entries)
+        return self.__ids
+
+    def positions(self, op: str, value: float) -> list[int] | None:
+        """Get the positions of the numbers whose abs compares to a value
+
+        Takes O(log n + k log k) for k matches. Looking up the position of a
+        match costs about as much as comparing SCAN_RATIO numbers, so
+        queries matching more than 1 / SCAN_RATIO of the list are left to a
+        scan.
+
+        Args:
+            op (str): comparison, one of ABS_OPS
+            value (float): value to compare abs(x) to
+
+        Returns:
+            list[int] | None: positions where abs(x) op value is True, in ascending order, or None if a scan is faster
+        """
+        ids = self.__get_ids()
+        entries = self.__sorted
+        n = len(entries)
+        if math.isnan(value):
+            # Only != is True for NaN
+            ranges: tuple[tuple[int, int], ...] = ((0, n),) if op == "!=" else ()
+        else:
+            # (value,) sorts before and (value, inf) after every entry with abs(x) == value
+            lo = entries.bisect_left((value,))
+            hi = entries.bisect_left((value, math.inf))
+            ranges = {
+                "<": ((0, lo),),
+                "<=": ((0, hi),),
+                "==": ((lo, hi),),
+                "!=": ((0, lo), (hi, n)),
+                ">=": ((lo, n),),
+                ">": ((hi, n),),
+            }[op]
+        count = sum(end - start for start, end in ranges)
+        if op == "!=":
+            count += len(self.__nan)
+        if count * self.SCAN_RATIO > len(self.__values):
+            return None
+        keys: list[int] = []
+        for start, end in ranges:
+            keys.extend(map(itemgetter(1), entries.items(start, end)))
+        if op == "!=":
+            keys.extend(self.__nan)
+        return sorted(map(ids.position, keys))
+
+    def kth(self, k: int) -> int:
+        """Get the position of the k-th smallest number by abs
+
+        Numbers with equal abs are ordered by position, and numbers with a
+        NaN abs come last.
+
+        Args:
+            k (int): rank, from 0; negative ranks count from the largest
+
+        Returns:
+            int: position of the number
+        """
+        position = self.__get_ids().position
+        entries = self.__sorted
+        k = range(len(entries) + len(self.__nan))[k]
+        if k >= len(entries):
+            return sorted(map(position, self.__nan))[k - len(entries)]
+        modulus = entries[k][0]
+        lo = entries.bisect_left((modulus,))
+        hi = entries.bisect_left((modulus, math.inf))
+        if hi - lo == 1:
+            return position(entries[k][1])
+        return sorted(position(x[1]) for x in entries.items(lo, hi))[k - lo]
@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress
+from typing import Any
+from typing import Callable
+
+from .complexnumber import ComplexNumber
+
+__all__ = ["ChunkPool"]
+
+# List of the worker processes, inherited from the parent when they are forked
+_values: list[ComplexNumber] = []
+
+
+def _init(values: list[ComplexNumber]) -> None:
+    """Internal: Sets the list of a forked worker
+
+    Args:
+        values (list[ComplexNumber]): list of the parent
+    """
+    global _values
+    _values = values
+
+
+def _call(
+    func: Callable,
+    start: int,
+    end: int,
+    chunk: list[ComplexNumber] | None,
+    *args: Any,
+) -> Any:
+    """Internal: Runs a function on a chunk, in a worker
+
+    Args:
+        func (Callable): function taking the chunk and args
+        start (int): start position of the chunk in the list
+        end (int): end position of the chunk in the list
+        chunk (list[ComplexNumber] | None): the chunk, or None to read it from the inherited list
+        args (Any): other arguments of func
+
+    Returns:
+        Any: result of func
+    """
+    if chunk is None:
+        chunk = _values[start:end]
+    return func(chunk, *args)
+
+
+def _mask(chunk: list[ComplexNumber], check: Callable) -> bytes:
+    """Internal: Runs a check on every number of a chunk
+
+    Args:
+        chunk (list[ComplexNumber]): numbers to be checked
+        check (Callable): check function. Should take ComplexNumber as argument. Expected return is bool.
+
+    Returns:
+        bytes: 1 where check(x) is True, 0 elsewhere
+    """
+    return bytes(map(bool, map(check, chunk)))
+
+
+def _sum(chunk: list[ComplexNumber]) -> ComplexNumber:
+    """Internal: Sums a chunk like ComplexManager.sum_seq
+
+    Args:
+        chunk (list[ComplexNumber]): numbers to be added
+
+    Returns:
+        ComplexNumber: sum of the numbers
+    """
+    res = ComplexNumber(0, 0)
+    for x in chunk:
+        res += x
+    return res
+
+
+def _prod(chunk: list[ComplexNumber]) -> ComplexNumber:
+    """Internal: Multiplies a chunk like ComplexManager.prod_seq
+
+    Args:
+        chunk (list[ComplexNumber]): numbers to be multiplied
+
+    Returns:
+        ComplexNumber: product of the numbers
+    """
+    res = ComplexNumber(1, 0)
+    for x in chunk:
+        res *= x
+    return res
+
+
+def _picklable(func: Callable) -> bool:
+    """Internal: Checks if a function can be sent to a worker
+
+    Lambdas and local functions can not.
+
+    Args:
+        func (Callable): function to be checked
+
+    Returns:
+        bool: True if func can be pickled
+    """
+    try:
+        pickle.dumps(func)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return False
+    return True
+
+
+class ChunkPool:
+    """Runs checks, sums and products over chunks of a list in worker processes
+
+    A ComplexManager created with a pool uses it for get_by_check,
+    filter_by_check, sum_seq and prod_seq on sequences of at least min_size
+    numbers, when it has more than one worker. Smaller sequences, checks
+    which can not be pickled (such as lambdas) and sequences covered by a
+    RangeIndex are handled in the calling process.
+
+    Workers are started for each call. Where processes are forked, they
+    inherit the list, so only the chunk bounds and the results are sent
+    between processes; elsewhere each chunk is pickled.
+
+    Sums and products of floats are grouped by chunk, so they can differ
+    from the ones of a single loop in the last bits.
+    """
+
+    def __init__(self, workers: int | None = None, min_size: int = 1_000_000) -> None:
+        """Initialize the pool.
+
+        Args:
+            workers (int | None, optional): number of worker processes. Defaults to the number of CPUs.
+            min_size (int, optional): smallest sequence handled by the workers. Defaults to 1_000_000.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.min_size = min_size
+
+    def use_for(self, size: int) -> bool:
+        """Checks if a sequence should be handled by the workers
+
+        Args:
+            size (int): length of the sequence
+
+        Returns:
+            bool: True if there is more than one worker and size is at least min_size
+        """
+        return self.workers > 1 and size >= max(self.min_size, 1)
+
+    def map(
+        self,
+        func: Callable,
+        values: list[ComplexNumber],
+        start: int,
+        end: int,
+        *args: Any,
+    ) -> list:
+        """Runs a function on chunks of a sequence in the workers
+
+        Args:
+            func (Callable): picklable function taking a chunk and args
+            values (list[ComplexNumber]): list of numbers
+            start (int): start position of the sequence, 0 <= start <= end
+            end (int): end position of the sequence, at most len(values)
+            args (Any): other arguments of func, which must be picklable
+
+        Returns:
+            list: results of func, in the order of the chunks
+        """
+        # A few chunks per worker, so that uneven chunks balance out
+        count = max(1, min(end - start, 4 * self.workers))
+        bounds = [start + (end - start) * i // count for i in range(count + 1)]
+        fork = "fork" in multiprocessing.get_all_start_methods()
+        if fork:
+            executor = ProcessPoolExecutor(
+                self.workers,
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=_init,
+                initargs=(values,),
+            )
+        else:  # pragma: no cover
+            executor = ProcessPoolExecutor(self.workers)
+        with executor:
+            futures = [
+                executor.submit(_call, func, a, b, None if fork else values[a:b], *args)
+                for a, b in zip(bounds, bounds[1:])
+            ]
+            return [x.result() for x in futures]
+
+    def get_by_check(
+        self,
+        values: list[ComplexNumber],
+        check: Callable,
+    ) -> list[ComplexNumber] | None:
+        """Get a list of elements that pass a given check, in the workers
+
+        Args:
+            values (list[ComplexNumber]): list of numbers
+            check (Callable): check function. Should take ComplexNumber as argument. Expected return is bool.
+
+        Returns:
+            list[ComplexNumber] | None: list of numbers where check(x) is True, or None if the workers should not be used
+        """
+        if not self.use_for(len(values)) or not _picklable(check):
+            return None
+        mask = b"".join(self.map(_mask, values, 0, len(values), check))
+        return list(compress(values, mask))
+
+    def sum(
+        self,
+        values: list[ComplexNumber],
+        start: int,
+        end: int,
+    ) -> ComplexNumber | None:
+        """Get the sum of a sequence, in the workers
+
+        Args:
+            values (list[ComplexNumber]): list of numbers
+            start (int): start position of the sequence, 0 <= start <= end
+            end (int): end position of the sequence, at most len(values)
+
+        Returns:
+            ComplexNumber | None: sum of the elements in values[start:end], or None if the workers should not be used
+        """
+        if not self.use_for(end - start):
+            return None
+        return _sum(self.map(_sum, values, start, end))
+
+    def prod(
+        self,
+        values: list[ComplexNumber],
+        start: int,
+        end: int,
+    ) -> ComplexNumber | None:
+        """Get the product of a sequence, in the workers
+
+        Args:
+            values (list[ComplexNumber]): list of numbers
+            start (int): start position of the sequence, 0 <= start <= end
+            end (int): end position of the sequence, at most len(values)
+
+        Returns:
+            ComplexNumber | None: product of the elements in values[start:end], or None if the workers should not be used
+        """
+        if not self.use_for(end - start):
+            return None
+        return _prod(self.map(_prod, values, start, end))
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+from typing import Callable
+
+from .complexnumber import ComplexNumber
+from .complexnumber import Number
+from .indexes import ListIndex
+
+__all__ = ["RangeIndex"]
+
+Pair = tuple[Number, Number]
+
+ZERO: Pair = (0, 0)
+ONE: Pair = (1, 0)
+
+
+def _add(a: Pair, b: Pair) -> Pair:
+    """Internal: Adds two complex numbers given as (real, imag) pairs
+
+    Args:
+        a (Pair): left operand
+        b (Pair): right operand
+
+    Returns:
+        Pair: sum, computed like ComplexNumber.__add__
+    """
+    return a[0] + b[0], a[1] + b[1]
+
+
+def _mul(a: Pair, b: Pair) -> Pair:
+    """Internal: Multiplies two complex numbers given as (real, imag) pairs
+
+    Args:
+        a (Pair): left operand
+        b (Pair): right operand
+
+    Returns:
+        Pair: product, computed like ComplexNumber.__mul__
+    """
+    return a[0] * b[0] - a[1] * b[1], a[0] * b[1] + a[1] * b[0]
+
+
+class _SegmentTree:
+    """Internal: Segment tree folding a list of numbers with an operation
+
+    Leaves capacity..2 * capacity of the tree hold the numbers as pairs.
+    Leaves from dirty on are stale and recomputed by the next query;
+    leaves from filled on hold the identity of the operation.
+    """
+
+    def __init__(
+        self,
+        values: list[ComplexNumber],
+        op: Callable[[Pair, Pair], Pair],
+        identity: Pair,
+    ) -> None:
+        """Initialize the tree.
+
+        Args:
+            values (list[ComplexNumber]): list to be folded, read on every query
+            op (Callable[[Pair, Pair], Pair]): associative operation
+            identity (Pair): identity of op
+        """
+        self.__values = values
+        self.__op = op
+        self.__identity = identity
+        self.clear()
+
+    def clear(self) -> None:
+        """Drops all leaves"""
+        self.__capacity = 1
+        self.__tree = [self.__identity] * 2
+        self.__dirty = 0
+        self.__filled = 0
+
+    def invalidate(self, pos: int) -> None:
+        """Marks the leaves from a position on as stale
+
+        Args:
+            pos (int): first changed position
+        """
+        self.__dirty = min(self.__dirty, pos)
+
+    def replace(self, pos: int, x: ComplexNumber) -> None:
+        """Updates the leaf of a replaced number
+
+        Args:
+            pos (int): position of the number
+            x (ComplexNumber): new number
+        """
+        if pos >= self.__dirty:
+            return
+        tree, op = self.__tree, self.__op
+        i = self.__capacity + pos
+        tree[i] = x.real, x.imag
+        i //= 2
+        while i:
+            tree[i] = op(tree[2 * i], tree[2 * i + 1])
+            i //= 2
+
+    def __update(self) -> None:
+        """Internal: Recomputes the stale leaves and their parents"""
+        values = self.__values
+        n = len(values)
+        if n > self.__capacity:
+            while self.__capacity < n:
+                self.__capacity *= 2
+            self.__tree = [self.__identity] * (2 * self.__capacity)
+            self.__dirty = self.__filled = 0
+        lo, hi = self.__dirty, max(n, self.__filled)
+        if lo >= hi:
+            return
+        tree, capacity, op = self.__tree, self.__capacity, self.__op
+        for i in range(lo, hi):
+            tree[capacity + i] = (
+                (values[i].real, values[i].imag) if i < n else self.__identity
+            )
+        lo, hi = (capacity + lo) // 2, (capacity + hi - 1) // 2
+        while lo:
+            for i in range(lo, hi + 1):
+                tree[i] = op(tree[2 * i], tree[2 * i + 1])
+            lo, hi = lo // 2, hi // 2
+        self.__dirty = self.__filled = n
+
+    def query(self, start: int, end: int) -> Pair:
+        """Folds a sequence
+
+        Args:
+            start (int): start position of the sequence, 0 <= start <= end
+            end (int): end position of the sequence, at most the length of the list
+
+        Returns:
+            Pair: fold of the elements in list[start:end], in order
+        """
+        self.__update()
+        tree, op = self.__tree, self.__op
+        left = right = self.__identity
+        start += self.__capacity
+        end += self.__capacity
+        while start < end:
+            if start & 1:
+                left = op(left, tree[start])
+                start += 1
+            if end & 1:
+                end -= 1
+                right = op(tree[end], right)
+            start //= 2
+            end //= 2
+        return op(left, right)
+
+
+class RangeIndex(ListIndex):
+    """Range sums and products over a ComplexManager list
+
+    Sums and products come from two segment trees, so a query is O(log n).
+    Each tree is brought up to date lazily, by its first query after a
+    change: a change at position i only invalidates the leaves from i on.
+    Appends and queries near the end of the list are cheap; replacing a
+    number is a point update.
+
+    A query only combines the numbers of its range, so small floats are
+    not lost next to large numbers outside it, as they would be with prefix
+    sums. Integer parts give exactly the results of a left fold. With
+    floats the grouping of the additions and products differs, so results
+    can differ from a fold in the last bits.
+    """
+
+    def __init__(self, values: list[ComplexNumber]) -> None:
+        """Initialize the index.
+
+        Args:
+            values (list[ComplexNumber]): list to be indexed, read on every query
+        """
+        self.__sums = _SegmentTree(values, _add, ZERO)
+        self.__prods = _SegmentTree(values, _mul, ONE)
+
+    def reset(self, old: list[ComplexNumber]) -> None:
+        self.__sums.clear()
+        self.__prods.clear()
+
+    def insert(self, start: int, values: list[ComplexNumber]) -> None:
+        self.__sums.invalidate(start)
+        self.__prods.invalidate(start)
+
+    def delete(self, start: int, end: int, removed: list[ComplexNumber]) -> None:
+        self.__sums.invalidate(start)
+        self.__prods.invalidate(start)
+
+    def replace(self, pos: int, old: ComplexNumber, new: ComplexNumber) -> None:
+        self.__sums.replace(pos, new)
+        self.__prods.replace(pos, new)
+
+    def sum(self, start: int, end: int) -> ComplexNumber:
+        """Get the sum of a sequence
+
+        Args:
+            start (int): start position of the sequence, 0 <= start <= end
+            end (int): end position of the sequence, at most the length of the list
+
+        Returns:
+            ComplexNumber: sum of the elements in list[start:end]
+        """
+        return ComplexNumber(*self.__sums.query(start, end))
+
+    def prod(self, start: int, end: int) -> ComplexNumber:
+        """Get the product of a sequence
+
+        Args:
+            start (int): start position of the sequence, 0 <= start <= end
+            end (int): end position of the sequence, at most the length of the list
+
+        Returns:
+            ComplexNumber: product of the elements in list[start:end]
+        """
+        return ComplexNumber(*self.__prods.query(start, end))
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from .complexnumber import ComplexNumber
+from .indexes import ElementIds
+from .indexes import ListIndex
+
+__all__ = ["ValueIndex"]
+
+
+class ValueIndex(ListIndex):
+    """Positions of every value in a ComplexManager list
+
+    Each value maps to the ElementIds of the numbers equal to it, so
+    inserting, removing or replacing numbers anywhere only updates the
+    entries of those numbers. Positions are read from the ids by lookups.
+    The index is built by the first lookup after the whole list is replaced.
+    """
+
+    def __init__(self, values: list[ComplexNumber]) -> None:
+        """Initialize the index.
+
+        Args:
+            values (list[ComplexNumber]): list to be indexed, read when the index is built
+        """
+        self.__values = values
+        self.__ids: ElementIds | None = None
+        self.__buckets: dict[ComplexNumber, set[int]] = {}
+
+    def __add(self, x: ComplexNumber, key: int) -> None:
+        """Internal: Adds the id of a number to its value
+
+        Args:
+            x (ComplexNumber): value
+            key (int): id of the number
+        """
+        bucket = self.__buckets.get(x)
+        if bucket is None:
+            self.__buckets[x] = {key}
+        else:
+            bucket.add(key)
+
+    def __discard(self, x: ComplexNumber, key: int) -> None:
+        """Internal: Removes the id of a number from its value
+
+        Args:
+            x (ComplexNumber): value
+            key (int): id of the number
+        """
+        bucket = self.__buckets[x]
+        if len(bucket) == 1:
+            del self.__buckets[x]
+        else:
+            bucket.remove(key)
+
+    def reset(self, old: list[ComplexNumber]) -> None:
+        self.__ids = None
+        self.__buckets = {}
+
+    def insert(self, start: int, values: list[ComplexNumber]) -> None:
+        if self.__ids is None:
+            return
+        for key, x in zip(self.__ids.insert(start, len(values)), values):
+            self.__add(x, key)
+
+    def delete(self, start: int, end: int, removed: list[ComplexNumber]) -> None:
+        if self.__ids is None:
+            return
+        for key, x in zip(self.__ids.delete(start, end), removed):
+            self.__discard(x, key)
+
+    def replace(self, pos: int, old: ComplexNumber, new: ComplexNumber) -> None:
+        if self.__ids is None:
+            return
+        key = self.__ids.id_at(pos)
+        self.__discard(old, key)
+        self.__add(new, key)
+
+    def find(self, x: ComplexNumber) -> list[int]:
+        """Get the positions of a value
+
+        Args:
+            x (ComplexNumber): value to be found
+
+        Returns:
+            list[int]: positions of the numbers equal to x, in ascending order
+        """
+        if self.__ids is None:
+            self.__ids = ElementIds(len(self.__values))
+            for key, value in enumerate(self.__values):
+                self.__add(value, key)
+        return sorted(map(self.__ids.position, self.__buckets.get(x, ())))
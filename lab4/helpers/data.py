@@ -1,10 +1,349 @@
 from __future__ import annotations
 
+import csv
 import json
+import math
+import mmap
+import os
+import re
+import sys
+import time
+from array import array
+from dataclasses import dataclass
+from operator import itemgetter
+from typing import Any
+from typing import Iterator
+from typing import Sequence
 
-__all__ = ["load_sample"]
+from classes.complexnumber import Number
 
+__all__ = [
+    "Chunk",
+    "CHUNK_SIZE",
+    "FORMATS",
+    "LoadReport",
+    "load_sample",
+    "read_chunks",
+    "load_file",
+]
 
-def load_sample() -> list:
-    with open("data/sample.json") as f:
+# Real and imaginary parts of consecutive numbers
+Chunk = tuple[Sequence[Number], Sequence[Number]]
+
+FORMATS = {".json": "json", ".csv": "csv", ".bin": "binary"}
+
+CHUNK_SIZE = 65_536
+
+_BLOCK_SIZE = 1 << 20
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def load_sample(path: str = "data/sample.json") -> list:
+    with open(path) as f:
         return json.load(f)
+
+
+def _decode_pairs(text: str) -> list | None:
+    """Internal: Decodes a sequence of [real, imag] pairs separated by commas
+
+    Args:
+        text (str): pairs, without the brackets of the array
+
+    Returns:
+        list | None: the pairs, or None if text is not valid JSON
+    """
+    try:
+        return json.loads(f"[{text}]")
+    except ValueError:
+        return None
+
+
+def _read_json(path: str, chunk_size: int) -> Iterator[Chunk]:
+    """Internal: Reads a JSON array of [real, imag] pairs in chunks
+
+    The file is read in blocks of text. Pairs hold no brackets, so every
+    "]" but the last one of the file closes a pair: all the pairs of a block
+    up to its last "]" are decoded with a single json.loads. Text which
+    does not decode that way is decoded one pair at a time, which also
+    locates errors.
+
+    Args:
+        path (str): path of the file
+        chunk_size (int): numbers per chunk
+
+    Yields:
+        Chunk: parts of the next numbers
+    """
+    decoder = json.JSONDecoder()
+    reals: list[Number] = []
+    imags: list[Number] = []
+    with open(path, encoding="utf-8") as f:
+        buf, pos, eof = "", 0, False
+        # "start" before the array, "item" before a pair, "next" after one
+        state = "start"
+        while True:
+            # Keep a block of text after pos, so that pairs are seldom cut
+            if not eof and len(buf) - pos < _BLOCK_SIZE:
+                more = f.read(_BLOCK_SIZE)
+                eof = not more
+                buf, pos = buf[pos:] + more, 0
+            pos = _WHITESPACE.match(buf, pos).end()  # type: ignore
+            if pos == len(buf):
+                if eof:
+                    raise ValueError(f"{path}: unexpected end of the JSON array")
+                continue
+            if state == "start":
+                if buf[pos] != "[":
+                    raise ValueError(f"{path}: expected a JSON array")
+                pos += 1
+                state = "first"
+            elif state == "first" and buf[pos] == "]":
+                break
+            elif state in ("first", "item"):
+                # The last "]" may close the array, so try the one before too
+                end = buf.rfind("]", pos)
+                pairs = None
+                for _ in range(2):
+                    if end <= pos:
+                        break
+                    pairs = _decode_pairs(buf[pos : end + 1])
+                    if pairs is not None:
+                        pos = end + 1
+                        break
+                    end = buf.rfind("]", pos, end)
+                if pairs is None:
+                    try:
+                        pair, pos = decoder.raw_decode(buf, pos)
+                    except json.JSONDecodeError as e:
+                        if eof:
+                            raise ValueError(f"{path}: {e}") from None
+                        # The pair is longer than the text left: read more of it
+                        more = f.read(_BLOCK_SIZE)
+                        eof = not more
+                        buf, pos = buf[pos:] + more, 0
+                        continue
+                    pairs = [pair]
+                for pair in pairs:
+                    if type(pair) is not list or len(pair) != 2:
+                        raise ValueError(f"{path}: {pair!r} is not a [real, imag] pair")
+                reals.extend(map(itemgetter(0), pairs))
+                imags.extend(map(itemgetter(1), pairs))
+                if len(reals) >= chunk_size:
+                    n = len(reals) - len(reals) % chunk_size
+                    for i in range(0, n, chunk_size):
+                        yield reals[i : i + chunk_size], imags[i : i + chunk_size]
+                    reals, imags = reals[n:], imags[n:]
+                state = "next"
+            elif buf[pos] == ",":
+                pos += 1
+                state = "item"
+            elif buf[pos] == "]":
+                break
+            else:
+                raise ValueError(
+                    f"{path}: expected ',' or ']' at {buf[pos:pos + 20]!r}",
+                )
+        if (buf[pos + 1 :] + f.read()).strip():
+            raise ValueError(f"{path}: extra data after the JSON array")
+    if reals:
+        yield reals, imags
+
+
+def _parse_number(text: str) -> Number:
+    """Internal: Parses a number, as an int if it is written as one
+
+    Args:
+        text (str): text of the number
+
+    Returns:
+        Number: parsed number
+    """
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def _read_csv(path: str, chunk_size: int) -> Iterator[Chunk]:
+    """Internal: Reads real,imag rows in chunks
+
+    A first row which is not made of numbers is taken as a header and skipped.
+
+    Args:
+        path (str): path of the file
+        chunk_size (int): numbers per chunk
+
+    Yields:
+        Chunk: parts of the next numbers
+    """
+    reals: list[Number] = []
+    imags: list[Number] = []
+    with open(path, newline="") as f:
+        for line, row in enumerate(csv.reader(f), 1):
+            if not row:
+                continue
+            if len(row) != 2:
+                raise ValueError(f"{path}:{line}: expected 2 columns, got {len(row)}")
+            try:
+                real, imag = _parse_number(row[0]), _parse_number(row[1])
+            except ValueError:
+                if line == 1:
+                    continue
+                raise ValueError(f"{path}:{line}: {row!r} is not a pair of numbers")
+            reals.append(real)
+            imags.append(imag)
+            if len(reals) == chunk_size:
+                yield reals, imags
+                reals, imags = [], []
+    if reals:
+        yield reals, imags
+
+
+def _split(values: array) -> Chunk:
+    """Internal: Splits interleaved little-endian float64 parts
+
+    Args:
+        values (array): real and imaginary parts, one after the other
+
+    Returns:
+        Chunk: real and imaginary parts
+    """
+    if sys.byteorder == "big":  # pragma: no cover
+        values.byteswap()
+    return values[0::2], values[1::2]
+
+
+def _read_binary(path: str, chunk_size: int, use_mmap: bool) -> Iterator[Chunk]:
+    """Internal: Reads little-endian float64 (real, imag) pairs in chunks
+
+    Args:
+        path (str): path of the file
+        chunk_size (int): numbers per chunk
+        use_mmap (bool): memory-map the file instead of reading it
+
+    Yields:
+        Chunk: parts of the next numbers, as float arrays
+    """
+    size = os.path.getsize(path)
+    if size % 16:
+        raise ValueError(f"{path}: size {size} is not a multiple of 16 bytes")
+    step = 16 * chunk_size
+    with open(path, "rb") as f:
+        if not use_mmap:
+            while block := f.read(step):
+                yield _split(array("d", block))
+            return
+        if not size:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                for start in range(0, size, step):
+                    values = array("d")
+                    values.frombytes(view[start : start + step])
+                    yield _split(values)
+            finally:
+                view.release()
+
+
+def read_chunks(
+    path: str,
+    fmt: str | None = None,
+    chunk_size: int = CHUNK_SIZE,
+    use_mmap: bool = False,
+) -> Iterator[Chunk]:
+    """Reads the numbers of a file in chunks
+
+    Supported formats are a JSON array of [real, imag] pairs (like
+    data/sample.json), CSV rows of real,imag and raw binary, where each
+    number is two little-endian float64 values.
+
+    Args:
+        path (str): path of the file
+        fmt (str | None, optional): "json", "csv" or "binary". Defaults to guessing from the extension (see FORMATS).
+        chunk_size (int, optional): numbers per chunk. Defaults to CHUNK_SIZE.
+        use_mmap (bool, optional): memory-map binary files instead of reading them. Defaults to False.
+
+    Raises:
+        ValueError: if the format is unknown or the file is malformed
+
+    Yields:
+        Chunk: real and imaginary parts of the next chunk_size numbers
+    """
+    if fmt is None:
+        fmt = FORMATS.get(os.path.splitext(path)[1].lower())
+        if fmt is None:
+            raise ValueError(f"{path}: unknown format, expected one of {FORMATS}")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    if fmt == "json":
+        return _read_json(path, chunk_size)
+    if fmt == "csv":
+        return _read_csv(path, chunk_size)
+    if fmt == "binary":
+        return _read_binary(path, chunk_size, use_mmap)
+    raise ValueError(f"unknown format {fmt!r}")
+
+
+@dataclass(frozen=True)
+class LoadReport:
+    """Result of loading a file
+
+    Args:
+        count (int): numbers loaded
+        size (int): size of the file in bytes
+        seconds (float): duration of the load
+    """
+
+    count: int
+    size: int
+    seconds: float
+
+    @property
+    def numbers_per_second(self) -> float:
+        """Numbers loaded per second"""
+        return self.count / self.seconds if self.seconds else math.inf
+
+    @property
+    def megabytes_per_second(self) -> float:
+        """Megabytes (10**6 bytes) read per second"""
+        return self.size / 1e6 / self.seconds if self.seconds else math.inf
+
+    def __str__(self) -> str:
+        return (
+            f"Loaded {self.count} numbers ({self.size / 1e6:.1f} MB) in "
+            f"{self.seconds:.3f} s: {self.numbers_per_second:,.0f} numbers/s, "
+            f"{self.megabytes_per_second:.1f} MB/s"
+        )
+
+
+def load_file(
+    manager: Any,
+    path: str,
+    fmt: str | None = None,
+    chunk_size: int = CHUNK_SIZE,
+    use_mmap: bool = False,
+) -> LoadReport:
+    """Replaces the numbers of a manager with the ones of a file
+
+    The file is streamed into manager.load_chunks, see read_chunks.
+
+    Args:
+        manager (Any): ComplexManager or ArrayComplexManager
+        path (str): path of the file
+        fmt (str | None, optional): "json", "csv" or "binary". Defaults to guessing from the extension.
+        chunk_size (int, optional): numbers per chunk. Defaults to CHUNK_SIZE.
+        use_mmap (bool, optional): memory-map binary files instead of reading them. Defaults to False.
+
+    Raises:
+        OSError: if the file can not be read. A missing file leaves the manager unchanged.
+        ValueError: if the format is unknown or the file is malformed, see read_chunks
+
+    Returns:
+        LoadReport: number of numbers loaded and throughput
+    """
+    size = os.path.getsize(path)
+    start = time.perf_counter()
+    count = manager.load_chunks(read_chunks(path, fmt, chunk_size, use_mmap))
+    seconds = time.perf_counter() - start
+    return LoadReport(count, size, seconds)
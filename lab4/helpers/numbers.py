@@ -2,15 +2,146 @@ from __future__ import annotations
 
 import math
 
+from classes.complexnumber import ComplexNumber
 from classes.complexnumber import Number
 
-__all__ = ["check_prime"]
+__all__ = ["PrimeOracle", "PRIMES", "check_prime", "check_real_not_prime"]
 
+# Witnesses which make Miller-Rabin exact below 3.3 * 10**24
+_WITNESSES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
 
-def check_prime(x: Number) -> bool:
-    if x < 2 or x % 2 == 0 or x % 3 == 0:
-        return False
-    for i in range(5, int(math.sqrt(x)) + 1, 2):
-        if x % i == 0:
+
+def _miller_rabin(n: int) -> bool:
+    """Internal: Miller-Rabin test with the first 13 primes as witnesses
+
+    The answer is exact for n < 3_317_044_064_679_887_385_961_981. Above
+    that, n passing is a strong probable prime to all 13 bases.
+
+    Args:
+        n (int): odd number to be checked, n > 2
+
+    Returns:
+        bool: True if n is prime
+    """
+    for p in _WITNESSES:
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in _WITNESSES:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
             return False
     return True
+
+
+class PrimeOracle:
+    """Primality checks backed by a sieve of Eratosthenes
+
+    The sieve holds one flag per odd number and grows lazily: checking a
+    number above it at least doubles it. Numbers above sieve_limit are
+    checked with Miller-Rabin instead, so memory stays bounded.
+    """
+
+    def __init__(self, sieve_limit: int = 1 << 24) -> None:
+        """Initialize the oracle.
+
+        Args:
+            sieve_limit (int, optional): largest number the sieve may cover. Uses about sieve_limit / 2 bytes. Defaults to 1 << 24.
+        """
+        self.sieve_limit = sieve_limit
+        self.__limit = 0
+        # __sieve[i] is 1 if 2 * i + 1 is prime
+        self.__sieve = bytearray(1)
+
+    @property
+    def limit(self) -> int:
+        """Largest number covered by the sieve"""
+        return self.__limit
+
+    def reserve(self, limit: Number) -> None:
+        """Extends the sieve to cover a number
+
+        Args:
+            limit (Number): number to be covered, capped to sieve_limit
+        """
+        if not limit > self.__limit:
+            return
+        limit = int(min(limit, self.sieve_limit))
+        if limit <= self.__limit:
+            return
+        size = limit // 2 + 1
+        top = 2 * size - 1
+        sieve = bytearray([1]) * size
+        sieve[0] = 0
+        for i in range(1, (math.isqrt(top) - 1) // 2 + 1):
+            if sieve[i]:
+                p = 2 * i + 1
+                start = p * p // 2
+                sieve[start::p] = bytes(len(range(start, size, p)))
+        self.__sieve = sieve
+        self.__limit = top
+
+    def is_prime(self, x: Number) -> bool:
+        """Checks if a number is prime
+
+        Floats are prime if they are integral and their integer value is.
+
+        Args:
+            x (Number): number to be checked
+
+        Returns:
+            bool: True if x is prime
+        """
+        if type(x) is not int:
+            if not float(x).is_integer():
+                return False
+            x = int(x)
+        if x < 2:
+            return False
+        if x % 2 == 0:
+            return x == 2
+        if x > self.__limit:
+            if x > self.sieve_limit:
+                return _miller_rabin(x)
+            self.reserve(max(x, 2 * self.__limit, 1 << 10))
+        return self.__sieve[x // 2] == 1
+
+    __call__ = is_prime
+
+
+PRIMES = PrimeOracle()
+
+
+def check_prime(x: Number) -> bool:
+    """Checks if a number is prime, using PRIMES
+
+    Args:
+        x (Number): number to be checked
+
+    Returns:
+        bool: True if x is prime
+    """
+    return PRIMES.is_prime(x)
+
+
+def check_real_not_prime(x: ComplexNumber) -> bool:
+    """Checks if the real part of a number is not prime, using PRIMES
+
+    Unlike a lambda, this check can be pickled, so a ChunkPool can run it.
+
+    Args:
+        x (ComplexNumber): number to be checked
+
+    Returns:
+        bool: True if x.real is not prime
+    """
+    return not PRIMES.is_prime(x.real)
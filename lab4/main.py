@@ -1,11 +1,68 @@
 from __future__ import annotations
 
+import argparse
+
 import classes
+from helpers import data
+from helpers import terminal
 
 
 def main() -> None:
     """Main function. Runs a menu."""
-    menu = classes.Menu()
+    parser = argparse.ArgumentParser(description="Manages a list of complex numbers.")
+    parser.add_argument(
+        "--numpy",
+        action="store_true",
+        help="store the list in a NumPy array (requires numpy)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="worker processes for checks, sums and products over lists of at "
+        "least a million numbers. Defaults to the number of CPUs",
+    )
+    parser.add_argument(
+        "--load",
+        metavar="PATH",
+        help="load numbers from a JSON, CSV or binary (.bin) file and print the throughput",
+    )
+    parser.add_argument(
+        "--format",
+        choices=("json", "csv", "binary"),
+        help="format of the --load file. Defaults to guessing from the extension",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=data.CHUNK_SIZE,
+        help="numbers read per chunk by --load",
+    )
+    parser.add_argument(
+        "--mmap",
+        action="store_true",
+        help="memory-map the --load file if it is binary",
+    )
+    args = parser.parse_args()
+    manager: classes.ComplexManager | classes.ArrayComplexManager
+    if args.numpy:
+        manager = classes.ArrayComplexManager()
+    else:
+        manager = classes.ComplexManager(
+            range_index=True,
+            value_index=True,
+            modulus_index=True,
+            pool=classes.ChunkPool(args.workers),
+        )
+    if args.load is not None:
+        report = data.load_file(
+            manager,
+            args.load,
+            args.format,
+            args.chunk_size,
+            args.mmap,
+        )
+        terminal.print_wait(f"{report}\nPress any key to continue.")
+    menu = classes.Menu(manager)
 
     menu.run()
 
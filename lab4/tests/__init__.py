@@ -4,6 +4,14 @@ import sys
 
 sys.path.append("..")
 
+from .test_arraymanager import *
 from .test_complexmanager import *
 from .test_complexnumber import *
+from .test_data import *
+from .test_history import *
+from .test_modulusindex import *
+from .test_numbers import *
+from .test_parallel import *
+from .test_rangeindex import *
+from .test_valueindex import *
 from classes import *
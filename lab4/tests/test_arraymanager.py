@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import math
+
+import pytest
+from classes import ArrayComplexManager
+from classes import arraymanager
+from classes import ComplexManager
+from classes import ComplexNumber
+
+pytestmark = pytest.mark.skipif(arraymanager.np is None, reason="requires numpy")
+
+SampleType = list[list[int]]
+
+
+@pytest.fixture
+def managers() -> tuple[ComplexManager, ArrayComplexManager]:
+    sample = [[1, 0], [0, 1], [10, 0], [3, 1], [2, 2], [15, 6], [13, 11], [60, 5]]
+    list_manager, array_manager = ComplexManager(), ArrayComplexManager()
+    list_manager.load_json(sample)
+    array_manager.load_json(sample)
+    return list_manager, array_manager
+
+
+def test_array_load_json(managers: tuple[ComplexManager, ArrayComplexManager]) -> None:
+    """
+    +---------------------+-----------------------+
+    | Input (sample_data) |        Output         |
+    +---------------------+-----------------------+
+    | manager.nlist       | same numbers, as ints |
+    +---------------------+-----------------------+
+    """
+    list_manager, array_manager = managers
+    assert array_manager.count == 8
+    assert array_manager.nlist == list_manager.nlist
+    assert str(array_manager.nlist[0]) == "(1 + 0i)"
+
+
+def test_mutators(managers: tuple[ComplexManager, ArrayComplexManager]) -> None:
+    """
+    +-------------------------------------+-----------------------------+
+    |                Input                |           Output            |
+    +-------------------------------------+-----------------------------+
+    | add_number, remove_*, replace, undo | same list as ComplexManager |
+    +-------------------------------------+-----------------------------+
+    """
+    calls = (
+        ("add_number", (ComplexNumber(5, 3),)),
+        ("add_number", ((2.5, 1), 0)),
+        ("add_number", (7, 4)),
+        ("add_number", (8, 100)),
+        ("remove_pos_number", (1,)),
+        ("remove_pos_number", (-1,)),
+        ("remove_seq_number", (2, 4)),
+        ("replace_number", ((60, 5), (120, 3))),
+        ("filter_by_check", (lambda x: x.real != 15,)),
+        ("filter_by_abs", (">", 1)),
+        ("undo", ()),
+    )
+    for manager in managers:
+        for _ in range(20):
+            manager.add_number((1, 1))
+    for name, args in calls:
+        for manager in managers:
+            getattr(manager, name)(*args)
+        assert managers[1].nlist == managers[0].nlist, name
+
+
+def test_queries(managers: tuple[ComplexManager, ArrayComplexManager]) -> None:
+    """
+    +-------------------------------------+-------------------------------+
+    |                Input                |            Output             |
+    +-------------------------------------+-------------------------------+
+    | sum_seq, prod_seq, get_by_*, sorted | same result as ComplexManager |
+    +-------------------------------------+-------------------------------+
+    """
+    list_manager, array_manager = managers
+    for start, end in ((0, 2), (2, 5), (0, 8), (3, 3), (-3, 8)):
+        assert array_manager.sum_seq(start, end) == list_manager.sum_seq(start, end)
+        assert array_manager.prod_seq(start, end) == list_manager.prod_seq(start, end)
+    for op in ("<", "<=", "==", "!=", ">=", ">"):
+        assert array_manager.get_by_abs(op, 10) == list_manager.get_by_abs(op, 10)
+    check = lambda x: x.imag > 1
+    assert array_manager.get_by_check(check) == list_manager.get_by_check(check)
+    for reverse in (False, True):
+        assert array_manager.get_sorted_by_imag(
+            reverse,
+        ) == list_manager.get_sorted_by_imag(reverse)
+
+
+def test_array_undo_redo(managers: tuple[ComplexManager, ArrayComplexManager]) -> None:
+    """
+    +------------------------------------------+-----------------------------+
+    |                  Input                   |           Output            |
+    +------------------------------------------+-----------------------------+
+    | each mutator, then undo, redo, undo      | same list as ComplexManager |
+    | undo twice, redo twice                   | False the second time       |
+    +------------------------------------------+-----------------------------+
+    """
+    calls = (
+        ("replace_number", ((1, 1), (120, 3))),
+        ("add_number", ((5, 3),)),
+        ("add_number", ((2.5, 1), 0)),
+        ("remove_pos_number", (2,)),
+        ("remove_pos_number", (-1,)),
+        ("remove_seq_number", (2, 5)),
+        ("remove_seq_number", (-3, 100)),
+        ("filter_by_check", (lambda x: x.real != 15,)),
+        ("filter_by_abs", (">", 5)),
+        ("load_json", ([[4, 4]],)),
+    )
+    for manager in managers:
+        manager.add_number((1, 1), 3)
+        manager.add_number((1, 1))
+    list_manager, array_manager = managers
+    for name, args in calls:
+        before = array_manager.nlist
+        for manager in managers:
+            getattr(manager, name)(*args)
+        after = array_manager.nlist
+        assert after == list_manager.nlist, name
+        assert array_manager.undo()
+        assert array_manager.nlist == before, name
+        assert array_manager.redo()
+        assert array_manager.nlist == after, name
+        assert not array_manager.redo()
+        assert array_manager.undo()
+        assert not array_manager.undo()
+        assert array_manager.nlist == before, name
+        array_manager.redo()
+
+
+def test_large_moduli() -> None:
+    """
+    +-------------------------------+-------------------------------+
+    |    Input (parts near 1e200)   |            Output             |
+    +-------------------------------+-------------------------------+
+    | get_by_abs, kth_by_abs        | same result as ComplexManager |
+    +-------------------------------+-------------------------------+
+    """
+    sample = [[3e200, 4e200], [1e200, 0], [0, 6e200], [1, 1]]
+    list_manager, array_manager = ComplexManager(), ArrayComplexManager()
+    list_manager.load_json(sample)
+    array_manager.load_json(sample)
+    for op in ("<", "<=", "==", "!=", ">=", ">"):
+        for value in (1, 5e200, math.inf):
+            assert array_manager.get_by_abs(op, value) == list_manager.get_by_abs(
+                op,
+                value,
+            )
+    for k in range(-4, 4):
+        assert array_manager.kth_by_abs(k) == list_manager.kth_by_abs(k)
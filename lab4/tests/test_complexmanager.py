@@ -153,3 +153,39 @@ def test_filter_by_check(sample_data: SampleType) -> None:
     manager.load_json(sample_data)
     manager.filter_by_check(check_abs)
     assert manager.count == 4
+
+
+def test_get_by_abs(sample_data: SampleType) -> None:
+    """
+    +------------------------------+--------+
+    |     Input (sample_data)      | Output |
+    +------------------------------+--------+
+    | len(get_by_abs("<", 10))     |      4 |
+    | len(get_by_abs("==", 10))    |      1 |
+    | len(get_by_abs(">=", 10))    |      4 |
+    | count after ("!=", 10)       |      7 |
+    +------------------------------+--------+
+    """
+    manager = ComplexManager()
+    manager.load_json(sample_data)
+    assert manager.get_by_abs("<", 10) == manager.get_by_check(check_abs)
+    assert manager.get_by_abs("==", 10) == [ComplexNumber(10, 0)]
+    assert len(manager.get_by_abs(">=", 10)) == 4
+    manager.filter_by_abs("!=", 10)
+    assert manager.count == 7
+    assert ComplexNumber(10, 0) not in manager.nlist
+
+
+def test_get_sorted_by_imag(sample_data: SampleType) -> None:
+    """
+    +-------------------------------------+-----------------------+
+    |         Input (sample_data)         |        Output         |
+    +-------------------------------------+-----------------------+
+    | get_sorted_by_imag(reverse=True)[0] | ComplexNumber(13, 11) |
+    | get_sorted_by_imag()[:2]            | [(1, 0), (10, 0)]     |
+    +-------------------------------------+-----------------------+
+    """
+    manager = ComplexManager()
+    manager.load_json(sample_data)
+    assert manager.get_sorted_by_imag(reverse=True)[0] == ComplexNumber(13, 11)
+    assert manager.get_sorted_by_imag()[:2] == [(1, 0), (10, 0)]
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
 import math
+import pickle
+import random
+from typing import Any
+from dataclasses import FrozenInstanceError
 
+import pytest
 from classes import ComplexNumber
 
 
@@ -222,3 +227,118 @@ def test_ceil() -> None:
     """
     a = ComplexNumber(5.32, 2.13)
     assert math.ceil(a) == ComplexNumber(6, 3)
+
+
+def test_from_type() -> None:
+    """
+    +-----------+-----------------------+
+    | Input (x) |        Output         |
+    +-----------+-----------------------+
+    | (5, 3)    | ComplexNumber(5, 3)   |
+    | 5         | ComplexNumber(5, 0)   |
+    | 2.5       | ComplexNumber(2.5, 0) |
+    | True      | ComplexNumber(1, 0)   |
+    | "5"       | TypeError             |
+    | (5, 3, 1) | TypeError             |
+    | ("5", 3)  | TypeError             |
+    +-----------+-----------------------+
+    """
+    a = ComplexNumber(5, 3)
+    assert ComplexNumber.from_type(a) is a
+    assert ComplexNumber.from_type((5, 3)) == a
+    assert ComplexNumber.from_type(5) == ComplexNumber(5, 0)
+    assert ComplexNumber.from_type(2.5) == ComplexNumber(2.5, 0)
+    assert ComplexNumber.from_type(True) == ComplexNumber(1, 0)
+    for x in ("5", (5, 3, 1), ("5", 3)):
+        with pytest.raises(TypeError):
+            ComplexNumber.from_type(x)
+    with pytest.raises(TypeError):
+        a + "5"
+
+
+def test_eq_other_types() -> None:
+    """
+    +----------------------------------+--------+
+    |           Input (x, y)           | Output |
+    +----------------------------------+--------+
+    | ComplexNumber(1, 0) == True      | True   |
+    | ComplexNumber(1, 0) == "1"       | False  |
+    | ComplexNumber(1, 0) == (1, 0, 0) | False  |
+    | ComplexNumber(1, 0) != None      | True   |
+    +----------------------------------+--------+
+    """
+    a = ComplexNumber(1, 0)
+    assert a == True
+    assert not a == "1"
+    assert not a == (1, 0, 0)
+    assert a != None
+
+
+def test_hash() -> None:
+    """
+    +----------------------------------------------+--------+
+    |                 Input (x, y)                 | Output |
+    +----------------------------------------------+--------+
+    | hash(ComplexNumber(1, 0)) == hash(1)         | True   |
+    | ComplexNumber(2, 3), ComplexNumber(2.0, 3)   | same   |
+    | hash(ComplexNumber(2, 3)) == hash(2 + 3j)    | True   |
+    | ComplexNumber(2, 3) in {ComplexNumber(2, 3)} | True   |
+    +----------------------------------------------+--------+
+    """
+    assert hash(ComplexNumber(1, 0)) == hash(1) == hash(1.0)
+    assert hash(ComplexNumber(2, 3)) == hash(ComplexNumber(2.0, 3))
+    assert hash(ComplexNumber(2, 3)) == hash(2 + 3j)
+    assert ComplexNumber(2, 3) in {ComplexNumber(2, 3)}
+    lookup: dict[Any, str] = {ComplexNumber(1, 0): "a"}
+    assert lookup[1] == "a"
+
+
+def test_frozen() -> None:
+    """
+    +-----------------------------------+---------------------+
+    |               Input               |       Output        |
+    +-----------------------------------+---------------------+
+    | x.real = 5, x.imag = 5, x.foo = 5 | FrozenInstanceError |
+    | x += ComplexNumber(1, 1)          | new object, x kept  |
+    +-----------------------------------+---------------------+
+    """
+    x = ComplexNumber(3, 4)
+    for name in ("real", "imag", "_abs"):
+        with pytest.raises(FrozenInstanceError):
+            setattr(x, name, 5)
+    # Other names have no slot; on some Python versions the frozen
+    # __setattr__ of a slotted dataclass raises TypeError for them
+    with pytest.raises((FrozenInstanceError, AttributeError, TypeError)):
+        x.foo = 5  # type: ignore
+    assert not hasattr(x, "foo")
+    with pytest.raises(FrozenInstanceError):
+        del x.real
+    y = x
+    y += ComplexNumber(1, 1)
+    assert x == ComplexNumber(3, 4) and y == ComplexNumber(4, 5)
+    assert abs(x) == 5
+
+
+def test_hash_abs_consistency() -> None:
+    """
+    +-------------------------------------+--------------------------------+
+    |            Input (x, y)             |             Output             |
+    +-------------------------------------+--------------------------------+
+    | x == y for random int / float parts | hash(x) == hash(y), same abs   |
+    | abs(x) twice, pickle.loads(...)     | same value, same hash and abs  |
+    +-------------------------------------+--------------------------------+
+    """
+    rng = random.Random(0)
+    for _ in range(1000):
+        real, imag = rng.randint(-50, 50), rng.randint(-50, 50)
+        x = ComplexNumber(real, imag)
+        y = ComplexNumber(float(real), float(imag))
+        abs(y)  # y caches abs, x does not
+        assert x == y
+        assert hash(x) == hash(y)
+        assert abs(x) == abs(y) == abs(x) == math.hypot(real, imag)
+        z = pickle.loads(pickle.dumps(y))
+        assert z == x and hash(z) == hash(x) and abs(z) == abs(x)
+        other = ComplexNumber(real + 1, imag)
+        assert other != x
+        assert len({x, y, other}) == 2
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import json
+from array import array
+from pathlib import Path
+
+import pytest
+from classes import ArrayComplexManager
+from classes import arraymanager
+from classes import ComplexManager
+from classes import ComplexNumber
+from helpers import data
+
+SAMPLE: list[list[float]] = [
+    [1, 0],
+    [0, 1],
+    [10, 0],
+    [3, 1],
+    [2, 2],
+    [15, 6],
+    [13, 11],
+    [60, 5.5],
+]
+
+
+@pytest.fixture
+def files(tmp_path: Path) -> dict[str, str]:
+    paths = {x: str(tmp_path / f"sample.{x}") for x in ("json", "csv", "bin")}
+    with open(paths["json"], "w") as f:
+        json.dump(SAMPLE, f, indent=4)
+    with open(paths["csv"], "w") as f:
+        f.write("real,imag\n" + "".join(f"{x},{y}\n" for x, y in SAMPLE))
+    with open(paths["bin"], "wb") as f:
+        array("d", [x for pair in SAMPLE for x in pair]).tofile(f)
+    return paths
+
+
+@pytest.mark.parametrize("ext", ["json", "csv", "bin"])
+@pytest.mark.parametrize("chunk_size", [1, 3, 100])
+@pytest.mark.parametrize("use_mmap", [False, True])
+def test_load_file(
+    files: dict[str, str],
+    ext: str,
+    chunk_size: int,
+    use_mmap: bool,
+) -> None:
+    """
+    +------------------------------------------+----------------------------+
+    |                  Input                   |           Output           |
+    +------------------------------------------+----------------------------+
+    | data.load_file(manager, sample.json/csv) | same numbers as load_json  |
+    | data.load_file(manager, sample.bin)      | same numbers, as floats    |
+    | manager.undo()                           | the previous list          |
+    +------------------------------------------+----------------------------+
+    """
+    expected = ComplexManager()
+    expected.load_json(SAMPLE)
+    manager = ComplexManager(value_index=True)
+    manager.add_number((7, 7))
+    report = data.load_file(
+        manager,
+        files[ext],
+        chunk_size=chunk_size,
+        use_mmap=use_mmap,
+    )
+    assert report.count == manager.count == 8
+    assert manager.nlist == expected.nlist
+    assert manager.find_number((60, 5.5)) == [7]
+    if ext != "bin":
+        assert [type(x.real) for x in manager.nlist] == [int] * 8
+    assert "Loaded 8 numbers" in str(report)
+    manager.undo()
+    assert manager.nlist == [ComplexNumber(7, 7)]
+
+
+@pytest.mark.skipif(arraymanager.np is None, reason="requires numpy")
+@pytest.mark.parametrize("ext", ["json", "csv", "bin"])
+def test_load_file_array(files: dict[str, str], ext: str) -> None:
+    """
+    +-----------------------------------------+-----------------------+
+    |                  Input                  |        Output         |
+    +-----------------------------------------+-----------------------+
+    | data.load_file(array_manager, sample.*) | same numbers, as ints |
+    +-----------------------------------------+-----------------------+
+    """
+    manager = ArrayComplexManager()
+    manager.add_number((7, 7))
+    assert data.load_file(manager, files[ext], chunk_size=3).count == 8
+    assert manager.nlist == [ComplexNumber(*x) for x in SAMPLE]
+    manager.undo()
+    assert manager.nlist == [ComplexNumber(7, 7)]
+
+
+@pytest.mark.parametrize(
+    ("text", "fmt"),
+    [
+        ("[[1, 2], [3]]", "json"),
+        ("[[1, 2] [3, 4]]", "json"),
+        ("[[1, 2], [3, 4]", "json"),
+        ("[[1, 2]] 5", "json"),
+        ("{}", "json"),
+        ("1,2\n3,x\n", "csv"),
+        ("1,2,3\n", "csv"),
+        ("123", "binary"),
+    ],
+)
+def test_malformed(tmp_path: Path, text: str, fmt: str) -> None:
+    """
+    +-------------------------------+------------+
+    |             Input             |   Output   |
+    +-------------------------------+------------+
+    | malformed JSON, CSV or binary | ValueError |
+    +-------------------------------+------------+
+    """
+    path = tmp_path / "numbers.txt"
+    path.write_text(text)
+    with pytest.raises(ValueError):
+        list(data.read_chunks(str(path), fmt))
+    with pytest.raises(ValueError):
+        data.read_chunks(str(path))
+
+
+def test_json_blocks(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    +-------------------------------------+----------------+
+    |                Input                |     Output     |
+    +-------------------------------------+----------------+
+    | pairs cut by the ends of the blocks | the same pairs |
+    | empty array                         | no chunks      |
+    +-------------------------------------+----------------+
+    """
+    monkeypatch.setattr(data, "_BLOCK_SIZE", 7)
+    pairs = [[i, -i / 4] for i in range(100)]
+    path = tmp_path / "numbers.json"
+    path.write_text(json.dumps(pairs))
+    reals: list[float] = []
+    imags: list[float] = []
+    for chunk in data.read_chunks(str(path), chunk_size=30):
+        reals.extend(chunk[0])
+        imags.extend(chunk[1])
+    assert [list(x) for x in zip(reals, imags)] == pairs
+    path.write_text("[ ]")
+    assert list(data.read_chunks(str(path))) == []
+
+
+def test_load_missing(tmp_path: Path) -> None:
+    """
+    +------------------------------------+-----------------------------------+
+    |               Input                |              Output               |
+    +------------------------------------+-----------------------------------+
+    | data.load_file(manager, missing)   | FileNotFoundError, list unchanged |
+    +------------------------------------+-----------------------------------+
+    """
+    manager = ComplexManager()
+    manager.add_number((7, 7))
+    with pytest.raises(FileNotFoundError):
+        data.load_file(manager, str(tmp_path / "missing.json"))
+    assert manager.nlist == [ComplexNumber(7, 7)]
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import random
+from typing import Any
+
+from classes import ComplexManager
+from classes import ComplexNumber
+
+
+def test_undo_redo() -> None:
+    """
+    +---------------------------+-----------------------+
+    |           Input           |        Output         |
+    +---------------------------+-----------------------+
+    | 3 changes, undo x 3       | empty list            |
+    | redo x 2                  | list after 2 changes  |
+    | undo with nothing to undo | False, list unchanged |
+    | new change after undo     | nothing to redo       |
+    +---------------------------+-----------------------+
+    """
+    manager = ComplexManager()
+    assert not manager.undo()
+    manager.load_json([[1, 0], [2, 0], [3, 0]])
+    manager.remove_seq_number(0, 2)
+    manager.replace_number(3, 5)
+    assert manager.nlist == [ComplexNumber(5, 0)]
+    assert manager.undo() and manager.undo() and manager.undo()
+    assert manager.nlist == []
+    assert not manager.undo()
+    assert manager.redo() and manager.redo()
+    assert manager.nlist == [ComplexNumber(3, 0)]
+    manager.add_number(4)
+    assert not manager.redo()
+    assert manager.nlist == [ComplexNumber(3, 0), ComplexNumber(4, 0)]
+
+
+def test_undo_random() -> None:
+    """
+    +-----------------------------------+-----------------------------+
+    |               Input               |           Output            |
+    +-----------------------------------+-----------------------------+
+    | 200 random changes, then undo all | each earlier list, in order |
+    | redo all                          | each later list, in order   |
+    +-----------------------------------+-----------------------------+
+    """
+    rng = random.Random(0)
+    manager = ComplexManager(range_index=True)
+    states = [manager.nlist.copy()]
+    for _ in range(200):
+        count = manager.count
+        x = rng.randint(-3, 3), rng.randint(-3, 3)
+        calls: list[tuple[str, tuple[Any, ...]]] = [
+            ("add_number", (x,)),
+            ("add_number", (x, rng.randint(0, count))),
+            ("remove_seq_number", (rng.randint(0, count), rng.randint(0, count))),
+            ("filter_by_abs", ("<", 3)),
+        ]
+        if count:
+            calls.append(("remove_pos_number", (rng.randrange(count),)))
+            calls.append(("replace_number", (manager.nlist[rng.randrange(count)], x)))
+        name, args = rng.choice(calls)
+        size = manager.history.size
+        getattr(manager, name)(*args)
+        # Calls which did not edit the list record nothing
+        if manager.history.size != size:
+            states.append(manager.nlist.copy())
+    for state in reversed(states[:-1]):
+        assert manager.undo()
+        assert manager.nlist == state
+        assert manager.sum_seq(0, manager.count) == sum(state, ComplexNumber(0, 0))
+    assert not manager.undo()
+    for state in states[1:]:
+        assert manager.redo()
+        assert manager.nlist == state
+    assert not manager.redo()
+
+
+def test_undo_budget() -> None:
+    """
+    +--------------------------------------+-----------------------------+
+    |                Input                 |           Output            |
+    +--------------------------------------+-----------------------------+
+    | 1000 appends to 1000 numbers         | history.size == 1000 + 2000 |
+    | budget of 10, 20 appends             | 10 undos possible           |
+    | budget of 0                          | no undo                     |
+    +--------------------------------------+-----------------------------+
+    """
+    manager = ComplexManager()
+    manager.load_json([[1, 1]] * 1000)
+    for _ in range(1000):
+        manager.add_number(1)
+    assert manager.history.size == 1 + 1000 + 2 * 1000
+
+    manager = ComplexManager(undo_budget=20)
+    for i in range(20):
+        manager.add_number(i)
+    assert manager.history.size <= 20
+    undone = 0
+    while manager.undo():
+        undone += 1
+    assert undone == 10
+    assert manager.count == 10
+
+    manager = ComplexManager(undo_budget=0)
+    manager.add_number(1)
+    assert not manager.undo()
+    assert manager.count == 1
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import random
+from typing import Any
+
+import pytest
+from classes import ComplexManager
+from classes import ComplexNumber
+from classes import indexes
+from classes import modulusindex
+
+
+def test_abs_queries(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    +-----------------------------------------+--------------------------+
+    |           Input (sample data)           |          Output          |
+    +-----------------------------------------+--------------------------+
+    | manager.get_by_abs("<", 10)             | 4 numbers, in list order |
+    | manager.get_by_abs("==", 10)            | [ComplexNumber(10, 0)]   |
+    | manager.kth_by_abs(0), kth_by_abs(-1)   | (1, 0) and (60, 5)       |
+    +-----------------------------------------+--------------------------+
+    """
+    # Answer every query from the index, however many numbers match
+    monkeypatch.setattr(modulusindex.ModulusIndex, "SCAN_RATIO", 0)
+    sample = [[1, 0], [0, 1], [10, 0], [3, 1], [2, 2], [15, 6], [13, 11], [60, 5]]
+    indexed, plain = ComplexManager(modulus_index=True), ComplexManager()
+    for manager in indexed, plain:
+        manager.load_json(sample)
+    assert indexed.get_by_abs("<", 10) == [(1, 0), (0, 1), (3, 1), (2, 2)]
+    assert indexed.get_by_abs("==", 10) == [ComplexNumber(10, 0)]
+    assert indexed.kth_by_abs(0) == ComplexNumber(1, 0)
+    assert indexed.kth_by_abs(1) == ComplexNumber(0, 1)
+    assert indexed.kth_by_abs(-1) == ComplexNumber(60, 5)
+    for op in ("<", "<=", "==", "!=", ">=", ">"):
+        for value in (0, 1, 5, 10, 100):
+            assert indexed.get_by_abs(op, value) == plain.get_by_abs(op, value)
+    with pytest.raises(IndexError):
+        indexed.kth_by_abs(8)
+
+
+def test_modulus_index_mutations(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    +---------------------------------------+----------------------------+
+    |                 Input                 |           Output           |
+    +---------------------------------------+----------------------------+
+    | random add/remove/replace/filter/undo | same abs queries as a scan |
+    +---------------------------------------+----------------------------+
+    """
+    # Small buckets and blocks, so they are split and emptied
+    monkeypatch.setattr(modulusindex._SortedList, "LOAD", 4)
+    monkeypatch.setattr(indexes.ElementIds, "LOAD", 4)
+    monkeypatch.setattr(modulusindex.ModulusIndex, "SCAN_RATIO", 0)
+    rng = random.Random(0)
+    indexed, plain = ComplexManager(modulus_index=True), ComplexManager()
+    for _ in range(500):
+        count = plain.count
+        x = rng.randint(-5, 5), rng.randint(-5, 5)
+        calls: list[tuple[str, tuple[Any, ...]]] = [
+            ("add_number", (x,)),
+            ("add_number", (x,)),
+            ("add_number", (x,)),
+            ("add_number", (x, rng.randint(0, count))),
+            ("replace_number", (x, (rng.randint(-5, 5), rng.randint(-5, 5)))),
+            ("remove_seq_number", (rng.randint(0, count), count)),
+            ("undo", ()),
+            ("redo", ()),
+        ]
+        if count:
+            calls.append(("remove_pos_number", (-1,)))
+            calls.append(("remove_pos_number", (rng.randrange(count),)))
+        if rng.random() < 0.05:
+            calls.append(("filter_by_abs", (">", 1)))
+        name, args = rng.choice(calls)
+        for manager in indexed, plain:
+            getattr(manager, name)(*args)
+        assert indexed.nlist == plain.nlist
+        op = rng.choice(("<", "<=", "==", "!=", ">=", ">"))
+        value = rng.choice((0, 1, 5, 2**0.5, 5**0.5, 7.5))
+        assert indexed.get_by_abs(op, value) == plain.get_by_abs(op, value)
+        if plain.count:
+            k = rng.randrange(-plain.count, plain.count)
+            assert indexed.kth_by_abs(k) == plain.kth_by_abs(k)
+
+
+def test_modulus_index_few_matches() -> None:
+    """
+    +---------------------------------------------+--------------------------+
+    |         Input (2000 random numbers)         |          Output          |
+    +---------------------------------------------+--------------------------+
+    | remove_pos_number(0), add_number(x, 0)      | same abs queries as scan |
+    +---------------------------------------------+--------------------------+
+    """
+    rng = random.Random(0)
+    sample = [[rng.randint(-50, 50), rng.randint(-50, 50)] for _ in range(2000)]
+    indexed, plain = ComplexManager(modulus_index=True), ComplexManager()
+    for manager in indexed, plain:
+        manager.load_json(sample)
+    for _ in range(20):
+        x = rng.randint(-50, 50), rng.randint(-50, 50)
+        pos = rng.randint(0, 10)
+        for manager in indexed, plain:
+            manager.remove_pos_number(0)
+            manager.add_number(x, pos)
+        for op, value in (("==", 5), ("<", 3), ("==", abs(complex(*x))), (">", 70)):
+            assert indexed.get_by_abs(op, value) == plain.get_by_abs(op, value)
+
+
+def test_modulus_index_nan(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    +-------------------------------------------+------------------------+
+    |      Input ([3, nan, 1, nan + 1j])        |         Output         |
+    +-------------------------------------------+------------------------+
+    | get_by_abs(op, 2), get_by_abs(op, nan)    | same as a scan         |
+    | kth_by_abs(0), kth_by_abs(-1)             | (1, 0) and (nan, 1)    |
+    +-------------------------------------------+------------------------+
+    """
+    monkeypatch.setattr(modulusindex.ModulusIndex, "SCAN_RATIO", 0)
+    nan = float("nan")
+    sample = [[3, 0], [nan, 0], [1, 0], [nan, 1]]
+    indexed, plain = ComplexManager(modulus_index=True), ComplexManager()
+    for manager in indexed, plain:
+        manager.load_json(sample)
+        manager.add_number((nan, 2), 0)
+        manager.remove_pos_number(0)
+        manager.replace_number((3, 0), (2, 0))
+    for op in ("<", "<=", "==", "!=", ">=", ">"):
+        for value in (0, 2, nan):
+            assert repr(indexed.get_by_abs(op, value)) == repr(
+                plain.get_by_abs(op, value),
+            )
+    assert indexed.kth_by_abs(0) == ComplexNumber(1, 0)
+    assert indexed.kth_by_abs(1) == ComplexNumber(2, 0)
+    assert repr(indexed.kth_by_abs(2)) == repr(ComplexNumber(nan, 0))
+    assert repr(indexed.kth_by_abs(-1)) == repr(ComplexNumber(nan, 1))
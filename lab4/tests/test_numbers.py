@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import pytest
+from classes import ComplexManager
+from helpers import numbers
+from helpers.numbers import PrimeOracle
+
+
+def trial_division(n: int) -> bool:
+    """Simple primality check, by trial division
+
+    Args:
+        n (int): number to be checked
+
+    Returns:
+        bool: True if n is prime
+    """
+    return n >= 2 and all(n % i for i in range(2, int(n**0.5) + 1))
+
+
+@pytest.mark.parametrize("sieve_limit", [1 << 24, 1000, 10, 0])
+def test_prime_oracle(sieve_limit: int) -> None:
+    """
+    +------------------------------------+-------------------------+
+    |               Input                |         Output          |
+    +------------------------------------+-------------------------+
+    | oracle(n), -10 <= n < 20000        | same as trial division  |
+    | oracle.reserve(n), then oracle(n)  | same as trial division  |
+    +------------------------------------+-------------------------+
+    """
+    oracle = PrimeOracle(sieve_limit)
+    assert [oracle(n) for n in range(-10, 20000)] == [
+        trial_division(n) for n in range(-10, 20000)
+    ]
+    for limit in range(0, 200):
+        oracle = PrimeOracle(sieve_limit)
+        oracle.reserve(limit)
+        assert oracle.limit >= min(limit, sieve_limit)
+        assert [oracle(n) for n in range(300)] == [
+            trial_division(n) for n in range(300)
+        ]
+
+
+@pytest.mark.parametrize(
+    ("x", "expected"),
+    [
+        (2, True),
+        (3, True),
+        (7.0, True),
+        (7.5, False),
+        (-7, False),
+        (float("nan"), False),
+        (float("inf"), False),
+        (2**61 - 1, True),
+        (2**89 - 1, True),
+        (561, False),
+        (3_215_031_751, False),
+        (3_825_123_056_546_413_051, False),
+        ((2**61 - 1) * (2**31 - 1), False),
+    ],
+)
+def test_check_prime(x: float, expected: bool) -> None:
+    """
+    +---------------------------------------------------+--------------+
+    |                       Input                       |    Output    |
+    +---------------------------------------------------+--------------+
+    | check_prime(2), check_prime(3), Mersenne primes   | True         |
+    | non-integral floats, Carmichael and pseudoprimes  | False        |
+    +---------------------------------------------------+--------------+
+    """
+    assert numbers.check_prime(x) is expected
+
+
+def test_filter_prime_real() -> None:
+    """
+    +----------------------------------------------+------------------------+
+    |                    Input                     |         Output         |
+    +----------------------------------------------+------------------------+
+    | filter_by_check(not PRIMES(x.real))          | non-prime real parts   |
+    +----------------------------------------------+------------------------+
+    """
+    manager = ComplexManager()
+    manager.load_json([[x, 1] for x in range(-5, 30)] + [[7.5, 0], [7.0, 0]])
+    manager.filter_by_check(lambda x: not numbers.PRIMES(x.real))
+    assert [x.real for x in manager.nlist] == [
+        x for x in range(-5, 30) if not trial_division(x)
+    ] + [7.5]
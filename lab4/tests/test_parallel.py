@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+from classes import ChunkPool
+from classes import ComplexManager
+from classes import ComplexNumber
+from helpers import numbers
+
+
+def check_abs(x: ComplexNumber) -> bool:
+    """Simple function to check if abs(x) < 10
+
+    Args:
+        x (ComplexNumber): number to be checked
+
+    Returns:
+        check (bool): True if abs(x) < 10 and False otherwise
+    """
+    return abs(x) < 10
+
+
+@pytest.fixture
+def managers() -> tuple[ComplexManager, ComplexManager]:
+    rng = random.Random(0)
+    sample = [[rng.randint(-20, 20), rng.randint(-3, 3)] for _ in range(1000)]
+    parallel = ComplexManager(pool=ChunkPool(workers=2, min_size=100))
+    serial = ComplexManager()
+    for manager in parallel, serial:
+        manager.load_json(sample)
+    return parallel, serial
+
+
+def test_use_for() -> None:
+    """
+    +---------------------------------------+-------------+
+    |                 Input                 |   Output    |
+    +---------------------------------------+-------------+
+    | ChunkPool(1, 0).use_for(10)           | False       |
+    | ChunkPool(2, 100).use_for(99), (100)  | False, True |
+    | ChunkPool(2, 0).use_for(0)            | False       |
+    +---------------------------------------+-------------+
+    """
+    assert not ChunkPool(1, 0).use_for(10)
+    assert not ChunkPool(2, 100).use_for(99)
+    assert ChunkPool(2, 100).use_for(100)
+    assert not ChunkPool(2, 0).use_for(0)
+
+
+def test_parallel_checks(managers: tuple[ComplexManager, ComplexManager]) -> None:
+    """
+    +------------------------------------------+--------------------------+
+    |                  Input                   |          Output          |
+    +------------------------------------------+--------------------------+
+    | get_by_check(check_abs), lambda checks   | same as without the pool |
+    | filter_by_check(check_real_not_prime)    | same as without the pool |
+    +------------------------------------------+--------------------------+
+    """
+    parallel, serial = managers
+    assert parallel.get_by_check(check_abs) == serial.get_by_check(check_abs)
+    assert parallel.get_by_check(lambda x: x.imag > 0) == serial.get_by_check(
+        lambda x: x.imag > 0,
+    )
+    for manager in managers:
+        manager.filter_by_check(numbers.check_real_not_prime)
+    assert parallel.nlist == serial.nlist
+    parallel.undo()
+    assert parallel.count == 1000
+
+
+@pytest.mark.parametrize(
+    ("start", "end"),
+    [(0, 1000), (0, 100), (0, 99), (17, 950), (-400, -3), (500, 100)],
+)
+def test_parallel_reductions(
+    managers: tuple[ComplexManager, ComplexManager],
+    start: int,
+    end: int,
+) -> None:
+    """
+    +-----------------------------------+--------------------------+
+    |               Input               |          Output          |
+    +-----------------------------------+--------------------------+
+    | sum_seq(start, end) (int parts)   | same as without the pool |
+    | prod_seq(start, end) (int parts)  | same as without the pool |
+    +-----------------------------------+--------------------------+
+    """
+    parallel, serial = managers
+    assert parallel.sum_seq(start, end) == serial.sum_seq(start, end)
+    assert parallel.prod_seq(start, end) == serial.prod_seq(start, end)
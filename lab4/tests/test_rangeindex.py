@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import random
+from typing import Any
+
+from classes import ComplexManager
+from classes import ComplexNumber
+
+
+def check_ranges(indexed: ComplexManager, plain: ComplexManager) -> None:
+    """Compares every range sum and product of two managers
+
+    Args:
+        indexed (ComplexManager): manager with a range index
+        plain (ComplexManager): manager without indexes
+    """
+    assert indexed.nlist == plain.nlist
+    for start in range(-2, indexed.count + 2):
+        for end in range(-2, indexed.count + 2):
+            assert indexed.sum_seq(start, end) == plain.sum_seq(start, end)
+            assert indexed.prod_seq(start, end) == plain.prod_seq(start, end)
+
+
+def test_range_queries() -> None:
+    """
+    +--------------------------------------+---------------------------+
+    |   Input ([[1, 1], [2, 1], [3, 1]])   |          Output           |
+    +--------------------------------------+---------------------------+
+    | manager.sum_seq(0, 3)                | ComplexNumber(6, 3)       |
+    | manager.prod_seq(1, 3)               | ComplexNumber(5, 5)       |
+    | sum_seq, prod_seq of any range       | same as without the index |
+    +--------------------------------------+---------------------------+
+    """
+    indexed, plain = ComplexManager(range_index=True), ComplexManager()
+    for manager in indexed, plain:
+        manager.load_json([[1, 1], [2, 1], [3, 1]])
+    assert indexed.sum_seq(0, 3) == ComplexNumber(6, 3)
+    assert indexed.prod_seq(1, 3) == ComplexNumber(5, 5)
+    check_ranges(indexed, plain)
+
+
+def test_float_ranges() -> None:
+    """
+    +----------------------------------------------+-----------------------+
+    |                    Input                     |        Output         |
+    +----------------------------------------------+-----------------------+
+    | [[1e20, 0], [1, 0], [1, 0]], sum_seq(1, 3)   | ComplexNumber(2, 0)   |
+    | [1e300, 1e300, 1, 2] (real), sum_seq(2, 4)   | ComplexNumber(3, 0)   |
+    | [[0, 1e20], [0, 1], [0.5, 1]], sum_seq(1, 3) | ComplexNumber(0.5, 2) |
+    +----------------------------------------------+-----------------------+
+    """
+    manager = ComplexManager(range_index=True)
+    manager.load_json([[1e20, 0], [1, 0], [1, 0]])
+    assert manager.sum_seq(1, 3) == ComplexNumber(2, 0)
+    assert manager.sum_seq(0, 3) == ComplexNumber(1e20 + 1 + 1, 0)
+    manager.load_json([[1e300, 0], [1e300, 0], [1, 0], [2, 0]])
+    assert manager.sum_seq(2, 4) == ComplexNumber(3, 0)
+    manager.load_json([[0, 1e20], [0, 1], [0.5, 1]])
+    assert manager.sum_seq(1, 3) == ComplexNumber(0.5, 2)
+    manager.replace_number((0, 1e20), (0, -1e20))
+    assert manager.sum_seq(1, 3) == ComplexNumber(0.5, 2)
+    assert manager.prod_seq(1, 3) == ComplexNumber(-1, 0.5)
+
+
+def test_range_index_mutations() -> None:
+    """
+    +---------------------------------------+-------------------------+
+    |                 Input                 |         Output          |
+    +---------------------------------------+-------------------------+
+    | random add/remove/replace/filter/undo | same ranges as no index |
+    +---------------------------------------+-------------------------+
+    """
+    rng = random.Random(0)
+    indexed, plain = ComplexManager(range_index=True), ComplexManager()
+    for _ in range(200):
+        count = plain.count
+        x = rng.randint(-3, 3), rng.randint(-3, 3)
+        calls: list[tuple[str, tuple[Any, ...]]] = [
+            ("add_number", (x,)),
+            ("add_number", (x, rng.randint(0, count + 1))),
+            (
+                "replace_number",
+                (plain.nlist[rng.randrange(count)], x) if count else (x, x),
+            ),
+            (
+                "remove_seq_number",
+                (rng.randint(-count, count), rng.randint(-count, count)),
+            ),
+            ("undo", ()),
+        ]
+        if count:
+            calls.append(("remove_pos_number", (rng.randrange(-count, count),)))
+        if rng.random() < 0.05:
+            calls.append(("filter_by_check", (lambda x: x.real != 0,)))
+        name, args = rng.choice(calls)
+        for manager in indexed, plain:
+            getattr(manager, name)(*args)
+        if rng.random() < 0.2:
+            check_ranges(indexed, plain)
+    check_ranges(indexed, plain)
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import random
+from typing import Any
+
+import pytest
+from classes import ComplexManager
+from classes import ComplexNumber
+from classes import ElementIds
+from classes import indexes
+
+
+def test_find_number() -> None:
+    """
+    +--------------------------------+-----------+
+    | Input ([1, 2, 1, 1.0, (1, 1)]) |  Output   |
+    +--------------------------------+-----------+
+    | manager.find_number(1)         | [0, 2, 3] |
+    | manager.find_number((1, 1))    | [4]       |
+    | manager.find_number(5)         | []        |
+    +--------------------------------+-----------+
+    """
+    for value_index in False, True:
+        manager = ComplexManager(value_index=value_index)
+        manager.load_json([[1, 0], [2, 0], [1, 0], [1.0, 0], [1, 1]])
+        assert manager.find_number(1) == [0, 2, 3]
+        assert manager.find_number((1, 1)) == [4]
+        assert manager.find_number(5) == []
+
+
+def test_element_ids(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    +-----------------------------+----------------------------+
+    |            Input            |           Output           |
+    +-----------------------------+----------------------------+
+    | random inserts and removals | same positions as a list   |
+    | ids.id_at(i)                | id at position i           |
+    +-----------------------------+----------------------------+
+    """
+    # Small blocks, so they are split, merged and emptied
+    monkeypatch.setattr(indexes.ElementIds, "LOAD", 4)
+    rng = random.Random(0)
+    ids, order = ElementIds(10), list(range(10))
+    for _ in range(1000):
+        start = rng.randint(0, len(order))
+        if rng.random() < 0.5:
+            order[start:start] = ids.insert(start, rng.choice((1, 2, 20)))
+        else:
+            end = min(len(order), start + rng.choice((1, 3, 15)))
+            assert ids.delete(start, end) == order[start:end]
+            del order[start:end]
+        assert len(ids) == len(order)
+        assert list(ids) == order
+        for pos, x in enumerate(order):
+            assert ids.position(x) == pos
+            assert ids.id_at(pos) == x
+
+
+def test_value_index_mutations(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    +---------------------------------------+--------------------------+
+    |                 Input                 |          Output          |
+    +---------------------------------------+--------------------------+
+    | random add/remove/replace/filter/undo | same positions as a scan |
+    +---------------------------------------+--------------------------+
+    """
+    monkeypatch.setattr(indexes.ElementIds, "LOAD", 4)
+    rng = random.Random(0)
+    indexed, plain = ComplexManager(value_index=True), ComplexManager()
+    for _ in range(500):
+        count = plain.count
+        x = rng.randint(-2, 2), rng.randint(-2, 2)
+        calls: list[tuple[str, tuple[Any, ...]]] = [
+            ("add_number", (x,)),
+            ("add_number", (x,)),
+            ("add_number", (x, rng.randint(0, count))),
+            ("replace_number", (x, (rng.randint(-2, 2), rng.randint(-2, 2)))),
+            ("remove_seq_number", (rng.randint(0, count), count)),
+            ("undo", ()),
+            ("redo", ()),
+        ]
+        if count:
+            calls.append(("remove_pos_number", (-1,)))
+            calls.append(("remove_pos_number", (rng.randrange(count),)))
+        if rng.random() < 0.05:
+            calls.append(("filter_by_abs", ("<", 2)))
+        name, args = rng.choice(calls)
+        for manager in indexed, plain:
+            getattr(manager, name)(*args)
+        assert indexed.nlist == plain.nlist
+        value = rng.randint(-2, 2), rng.randint(-2, 2)
+        assert indexed.find_number(value) == plain.find_number(value)
+    for pair in {(x.real, x.imag) for x in plain.nlist}:
+        assert indexed.find_number(pair) == plain.find_number(pair)
+    assert all(
+        indexed.nlist[i] == ComplexNumber(1, 1) for i in indexed.find_number((1, 1))
+    )
@@ -0,0 +1,113 @@
+"""Compares compressed and uncompressed lab7 data files.
+
+Run from the lab7 directory::
+
+    python -m benchmarks.compression --labs 200 --submissions 200000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from helpers.data import COMPRESSED_EXTENSIONS
+from helpers.data import DateTimeEncoder
+from helpers.synthetic import generate
+from repository import LabFileRepository
+from repository import SubmissionFileRepository
+
+
+def measure(repo_cls: type, obj: list, filename: str) -> tuple[int, float, float]:
+    """Saves and loads a repository through the given file
+
+    Args:
+        repo_cls (type): file repository class
+        obj (list): data to store
+        filename (str): name of the file
+
+    Returns:
+        tuple[int, float, float]: file size in bytes, save time and load time in seconds
+    """
+    repo = repo_cls(filename)
+    repo.load_json(obj)
+    start = time.perf_counter()
+    repo.save()
+    save_time = time.perf_counter() - start
+
+    repo = repo_cls(filename)
+    start = time.perf_counter()
+    repo.load()
+    load_time = time.perf_counter() - start
+    return os.path.getsize(filename), save_time, load_time
+
+
+def measure_baseline(obj: list, filename: str) -> tuple[int, float, float]:
+    """Saves and loads the data with json.dump(indent=4) and json.load
+
+    Args:
+        obj (list): data to store
+        filename (str): name of the file
+
+    Returns:
+        tuple[int, float, float]: file size in bytes, save time and load time in seconds
+    """
+    start = time.perf_counter()
+    with open(filename, "w") as f:
+        json.dump(obj, f, indent=4, cls=DateTimeEncoder)
+    save_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with open(filename) as f:
+        json.load(f)
+    load_time = time.perf_counter() - start
+    return os.path.getsize(filename), save_time, load_time
+
+
+def main() -> None:
+    """Runs the benchmark and prints a table per repository."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--labs", type=int, default=100)
+    parser.add_argument("--problems", type=int, default=10)
+    parser.add_argument("--submissions", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    data = generate(
+        students=args.submissions // 10,
+        labs=args.labs,
+        problems=args.problems,
+        submissions=args.submissions,
+        seed=args.seed,
+    )
+    cases = (
+        ("labs", LabFileRepository, data["labs"]),
+        ("submissions", SubmissionFileRepository, data["submissions"]),
+    )
+    extensions = [".json"] + [".json" + x for x in COMPRESSED_EXTENSIONS]
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name, repo_cls, obj in cases:
+            print(f"\n{name}: {len(obj)} records")
+            print(
+                f"{'file':<20}{'size (KiB)':>12}{'ratio':>8}{'save (s)':>10}{'load (s)':>10}"
+            )
+            # Ratios are against a plain json.dump with indent=4
+            filename = os.path.join(directory, name + ".baseline.json")
+            base_size, save_time, load_time = measure_baseline(obj, filename)
+            print(
+                f"{'json.dump indent=4':<20}{base_size / 1024:>12.1f}{1:>8.1f}"
+                f"{save_time:>10.3f}{load_time:>10.3f}",
+            )
+            for ext in extensions:
+                filename = os.path.join(directory, name + ext)
+                size, save_time, load_time = measure(repo_cls, obj, filename)
+                print(
+                    f"{name + ext:<20}{size / 1024:>12.1f}{base_size / size:>8.1f}"
+                    f"{save_time:>10.3f}{load_time:>10.3f}",
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Compares parallel lab report generation with sequential get_lab_grades_str loops.
+
+Run from the lab7 directory::
+
+    python -m benchmarks.reports --labs 200 --submissions 1000000 --workers 4
+"""
+from __future__ import annotations
+
+import argparse
+import functools
+import os
+import tempfile
+import time
+from typing import Callable
+
+from entities import Submission
+from helpers.data import open_data
+from helpers.synthetic import generate
+from repository import LabRepository
+from repository import StudentRepository
+from repository import SubmissionRepository
+from services import Journal
+from services import LabService
+from services import ReportService
+from services import StudentService
+from services import SubmissionService
+from services.reports import write_lab_report
+
+
+def sequential(submission_service: SubmissionService, directory: str) -> None:
+    """Writes every lab report with a get_lab_grades_str call per lab
+
+    Args:
+        submission_service (SubmissionService): submission service
+        directory (str): directory of the reports
+    """
+    for lab in submission_service.lab_service.get_labs():
+        filename = os.path.join(directory, f"lab_{lab.lid}.txt")
+        with open_data(filename, "w") as file:
+            file.write(submission_service.get_lab_grades_str(lab.lid))
+            file.write("\n")
+
+
+def resorting(submission_service: SubmissionService, directory: str) -> None:
+    """Writes every lab report the way get_lab_grades_str used to build them
+
+    Each report sorted all graded submissions, then kept the lab's own.
+
+    Args:
+        submission_service (SubmissionService): submission service
+        directory (str): directory of the reports
+    """
+    student_service = submission_service.student_service
+    for lab in submission_service.lab_service.get_labs():
+        graded: list[tuple[str, float, Submission]] = []
+        for x in submission_service.get_submissions():
+            student = student_service.get_student_by_id(x.sid)
+            if student is not None and x.grade is not None:
+                graded.append((student.name, x.grade, x))
+        graded.sort(key=lambda x: x[:2])
+        rows: list[tuple[str, str, float]] = []
+        for name, grade, x in graded:
+            problem = lab.get_problem_by_id(x.pid)
+            if x.lid == lab.lid and problem is not None:
+                rows.append((name, problem.description, grade))
+        filename = os.path.join(directory, f"lab_{lab.lid}.txt")
+        write_lab_report(lab.lid, rows, filename)
+
+
+def write_reports(
+    submission_service: SubmissionService,
+    workers: int,
+    directory: str,
+) -> None:
+    """Writes every lab report with the report service
+
+    Args:
+        submission_service (SubmissionService): submission service
+        workers (int): number of worker processes
+        directory (str): directory of the reports
+    """
+    ReportService(submission_service, workers).write_lab_reports(directory)
+
+
+def main() -> None:
+    """Runs the benchmark and prints a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--labs", type=int, default=100)
+    parser.add_argument("--problems", type=int, default=10)
+    parser.add_argument("--submissions", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    data = generate(
+        students=args.submissions // 10,
+        labs=args.labs,
+        problems=args.problems,
+        submissions=args.submissions,
+        seed=args.seed,
+    )
+    journal = Journal(budget=0)
+    lab_service = LabService(LabRepository(), journal)
+    student_service = StudentService(StudentRepository(), journal)
+    submission_service = SubmissionService(
+        SubmissionRepository(),
+        lab_service,
+        student_service,
+    )
+    lab_service.load_json(data["labs"])
+    student_service.load_json(data["students"])
+    submission_service.load_json(data["submissions"])
+
+    cases: list[tuple[str, Callable[[str], None]]] = [
+        ("re-sorting loop", lambda x: resorting(submission_service, x)),
+        ("sequential loop", lambda x: sequential(submission_service, x)),
+    ]
+    for workers in sorted({1, args.workers}):
+        cases.append(
+            (
+                f"report service, {workers} worker{'s' if workers > 1 else ''}",
+                functools.partial(write_reports, submission_service, workers),
+            )
+        )
+    print(f"{args.labs} labs, {args.submissions} submissions")
+    if min(args.workers, os.cpu_count() or 1) == 1:
+        print("single worker or CPU: parallel speedup not measured")
+    print(f"{'path':<32}{'time (s)':>10}{'speedup':>9}")
+    base_time = None
+    for name, run in cases:
+        with tempfile.TemporaryDirectory() as directory:
+            start = time.perf_counter()
+            run(directory)
+            seconds = time.perf_counter() - start
+        base_time = base_time or seconds
+        print(f"{name:<32}{seconds:>10.3f}{base_time / seconds:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
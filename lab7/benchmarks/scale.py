@@ -0,0 +1,221 @@
+"""Times lab7 services and file repositories on synthetic data sets.
+
+Run from the lab7 directory::
+
+    python -m benchmarks.scale --sizes 1000,100000,1000000 --output scale.json
+
+Each size is a number of submissions. The results file holds one record
+per size and operation, so runs of different versions can be compared.
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import time
+from typing import Callable
+
+from helpers.synthetic import generate
+from repository import LabFileRepository
+from repository import LabRepository
+from repository import StudentFileRepository
+from repository import StudentRepository
+from repository import SubmissionFileRepository
+from repository import SubmissionRepository
+from services import Journal
+from services import LabService
+from services import StudentService
+from services import SubmissionService
+
+LOOKUPS = 1000
+
+
+def timed(func: Callable[[], object]) -> float:
+    """Returns the time taken by a call
+
+    Args:
+        func (Callable[[], object]): function to be timed
+
+    Returns:
+        float: elapsed time in seconds
+    """
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def make_services(
+    lab_repo: LabRepository,
+    student_repo: StudentRepository,
+    submission_repo: SubmissionRepository,
+) -> tuple[LabService, StudentService, SubmissionService]:
+    """Builds the services over the given repositories
+
+    Returns:
+        tuple[LabService, StudentService, SubmissionService]: services
+    """
+    journal = Journal(budget=0)
+    lab_service = LabService(lab_repo, journal)
+    student_service = StudentService(student_repo, journal)
+    submission_service = SubmissionService(
+        submission_repo,
+        lab_service,
+        student_service,
+    )
+    return lab_service, student_service, submission_service
+
+
+def run_size(size: int, seed: int, directory: str) -> list[dict]:
+    """Runs every operation for one data set size
+
+    Args:
+        size (int): number of submissions
+        seed (int): random seed
+        directory (str): directory for the data files
+
+    Returns:
+        list[dict]: one record per operation
+    """
+    labs = 20
+    problems = 10
+    data = generate(
+        students=max(10, size // 10),
+        labs=labs,
+        problems=problems,
+        submissions=size,
+        seed=seed,
+    )
+    rng = random.Random(seed)
+    records = []
+
+    def record(operation: str, seconds: float, count: int = 1) -> None:
+        records.append(
+            {
+                "size": size,
+                "operation": operation,
+                "count": count,
+                "seconds": seconds,
+                "per_op": seconds / count,
+            },
+        )
+        print(f"{size:>10} {operation:<24} {count:>6} {seconds:>10.4f}s")
+
+    # File repositories: save and load
+    names = {x: os.path.join(directory, f"{x}.json") for x in data}
+    file_repos: list[
+        tuple[str, LabFileRepository | StudentFileRepository | SubmissionFileRepository]
+    ] = [
+        ("labs", LabFileRepository(names["labs"])),
+        ("students", StudentFileRepository(names["students"])),
+        ("submissions", SubmissionFileRepository(names["submissions"])),
+    ]
+    for key, repo in file_repos:
+        repo.load_json(data[key])
+        record(f"save_{key}", timed(repo.save))
+    for repo_cls, key in zip(
+        (LabFileRepository, StudentFileRepository, SubmissionFileRepository),
+        ("labs", "students", "submissions"),
+    ):
+        record(f"load_{key}", timed(repo_cls(names[key]).load))
+
+    # In-memory services: lookups, assignments and reports
+    lab_service, student_service, submission_service = make_services(
+        LabRepository(),
+        StudentRepository(),
+        SubmissionRepository(),
+    )
+
+    def load_services() -> None:
+        lab_service.load_json(data["labs"])
+        student_service.load_json(data["students"])
+        submission_service.load_json(data["submissions"])
+
+    record("load_json", timed(load_services))
+    keys = [
+        (x["sid"], x["lid"], x["pid"])
+        for x in rng.choices(data["submissions"], k=LOOKUPS)
+    ]
+    record(
+        "get_submission",
+        timed(lambda: [submission_service.get_submission(*x) for x in keys]),
+        LOOKUPS,
+    )
+    sids = [x[0] for x in keys]
+    record(
+        "get_student_by_id",
+        timed(lambda: [student_service.get_student_by_id(x) for x in sids]),
+        LOOKUPS,
+    )
+    record(
+        "get_student_average",
+        timed(lambda: [submission_service.get_student_average(x) for x in sids]),
+        LOOKUPS,
+    )
+    record(
+        "assign_lab_problem",
+        timed(
+            lambda: [
+                submission_service.assign_lab_problem(*x, rng.randint(1, 10))
+                for x in keys
+            ],
+        ),
+        LOOKUPS,
+    )
+    record(
+        "get_lab_grades_str", timed(lambda: submission_service.get_lab_grades_str(1))
+    )
+    record("get_failing_students", timed(submission_service.get_failing_students))
+    return records
+
+
+def git_version() -> str | None:
+    """Returns the current git commit, if available
+
+    Returns:
+        str | None: short commit hash
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    """Runs the benchmark for every size and writes the results file."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,100000,1000000")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="scale.json")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for size in (int(x) for x in args.sizes.split(",")):
+            results.extend(run_size(size, args.seed, directory))
+
+    with open(args.output, "w") as f:
+        json.dump(
+            {
+                "version": git_version(),
+                "python": platform.python_version(),
+                "date": datetime.datetime.now().isoformat(timespec="seconds"),
+                "seed": args.seed,
+                "results": results,
+            },
+            f,
+            indent=4,
+        )
+
+
+if __name__ == "__main__":
+    main()
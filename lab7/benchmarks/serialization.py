@@ -0,0 +1,118 @@
+"""Compares the lab7 entity serializer with dataclasses.asdict and DateTimeEncoder.
+
+Run from the lab7 directory::
+
+    python -m benchmarks.serialization --submissions 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import io
+import json
+import time
+from typing import Any
+from typing import Callable
+
+from entities import Lab
+from entities import Student
+from entities import Submission
+from helpers import serialization
+from helpers.data import DateTimeEncoder
+from helpers.synthetic import generate
+
+
+def asdict_dump(items: list, file: io.StringIO, indent: int | None) -> None:
+    """Writes the items the way the file repositories used to
+
+    Args:
+        items (list): items to be written
+        file (io.StringIO): output
+        indent (int | None): indentation of the output
+    """
+    json.dump(
+        [dataclasses.asdict(x) for x in items],
+        file,
+        indent=indent,
+        cls=DateTimeEncoder,
+    )
+
+
+def timed(func: Callable[[], Any]) -> float:
+    """Returns the duration of a call
+
+    Args:
+        func (Callable[[], Any]): function to be called
+
+    Returns:
+        float: duration in seconds
+    """
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Runs the benchmark and prints a table per repository."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--labs", type=int, default=500)
+    parser.add_argument("--problems", type=int, default=20)
+    parser.add_argument("--submissions", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    data = generate(
+        students=args.submissions // 10,
+        labs=args.labs,
+        problems=args.problems,
+        submissions=args.submissions,
+        seed=args.seed,
+    )
+    cases = (
+        ("labs", [Lab.from_type(x) for x in data["labs"]], serialization.lab_to_dict),
+        (
+            "students",
+            [Student.from_type(x) for x in data["students"]],
+            serialization.student_to_dict,
+        ),
+        (
+            "submissions",
+            [Submission.from_type(x) for x in data["submissions"]],
+            serialization.submission_to_dict,
+        ),
+    )
+
+    for name, items, to_dict in cases:
+        print(f"\n{name}: {len(items)} records")
+        print(f"{'path':<28}{'time (s)':>10}{'size (KiB)':>12}{'speedup':>9}")
+        indent = 4 if name == "labs" else None
+        paths = (
+            ("asdict + DateTimeEncoder", lambda f: asdict_dump(items, f, indent)),
+            (
+                "serializer",
+                lambda f: serialization.dump(items, f, to_dict, indent=indent),
+            ),
+            ("serializer, compact", lambda f: serialization.dump(items, f, to_dict)),
+            (
+                "serializer, chunked",
+                lambda f: serialization.dump(
+                    items,
+                    f,
+                    to_dict,
+                    chunk_size=serialization.CHUNK_SIZE,
+                ),
+            ),
+        )
+        base_time = None
+        for label, dump in paths:
+            file = io.StringIO()
+            seconds = timed(lambda: dump(file))
+            base_time = base_time or seconds
+            print(
+                f"{label:<28}{seconds:>10.3f}{len(file.getvalue()) / 1024:>12.1f}"
+                f"{base_time / seconds:>9.1f}",
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,32 @@
 from __future__ import annotations
 
 import datetime
+import functools
 from dataclasses import dataclass
 from dataclasses import field
 
-__all__ = ["Lab", "Problem"]
+__all__ = ["Lab", "Problem", "parse_deadline", "EPOCH"]
+
+EPOCH = datetime.datetime(1970, 1, 1)
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_deadline(value: str | int | float) -> datetime.datetime:
+    """Converts an ISO 8601 string or seconds since EPOCH to a datetime object
+
+    Results are cached, as most problems share a few deadlines.
+
+    Args:
+        value (str | int | float): ISO 8601 string or seconds since EPOCH
+
+    Returns:
+        datetime.datetime: deadline
+    """
+    if isinstance(value, bool):
+        raise TypeError("Deadline must be a string or a number of seconds")
+    if isinstance(value, str):
+        return datetime.datetime.fromisoformat(value)
+    return EPOCH + datetime.timedelta(seconds=value)
 
 
 @dataclass
@@ -23,8 +45,8 @@ class Problem:
 
     def __post_init__(self):
         """Enforces the deadline to be a datetime object"""
-        if isinstance(self.deadline, str):
-            self.deadline = datetime.datetime.fromisoformat(self.deadline)
+        if isinstance(self.deadline, (str, int, float)):
+            self.deadline = parse_deadline(self.deadline)
 
     @classmethod
     def from_type(cls, obj: Problem | dict) -> Problem:
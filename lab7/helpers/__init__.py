@@ -1,4 +1,8 @@
 from __future__ import annotations
 
 from . import data
+from . import profiling
+from . import serialization
+from . import strings
+from . import synthetic
 from . import terminal
@@ -1,19 +1,108 @@
 from __future__ import annotations
 
+import bz2
 import datetime
+import functools
+import gzip
 import json
+import lzma
+from typing import Any
+from typing import Callable
+from typing import IO
 
-__all__ = ["load_sample"]
+from entities.lab import EPOCH
+
+try:
+    from compression import zstd  # type: ignore[import-not-found]  # Python 3.14+
+except ImportError:  # pragma: no cover
+    zstd = None
+
+__all__ = [
+    "load_sample",
+    "open_data",
+    "format_datetime",
+    "DateTimeEncoder",
+    "COMPRESSED_EXTENSIONS",
+]
+
+COMPRESSED_EXTENSIONS: dict[str, Callable[..., IO[Any]]] = {
+    ".gz": gzip.open,
+    ".bz2": bz2.open,
+    ".xz": lzma.open,
+}
+if zstd is not None:  # pragma: no cover
+    COMPRESSED_EXTENSIONS[".zst"] = zstd.open
+
+
+@functools.lru_cache(maxsize=4096)
+def format_datetime(
+    value: datetime.date | datetime.datetime,
+    epoch: bool = False,
+) -> str | int | float:
+    """Converts a date or datetime to an ISO 8601 string or to seconds since EPOCH
+
+    Results are cached, as most problems share a few deadlines. Naive values
+    are taken as UTC, like the ones parsed from seconds since EPOCH.
+
+    Args:
+        value (datetime.date | datetime.datetime): value to be converted
+        epoch (bool, optional): whether to return seconds since EPOCH. Defaults to False.
+
+    Returns:
+        str | int | float: ISO 8601 string, or seconds (int when whole)
+    """
+    if not epoch:
+        return value.isoformat()
+    if not isinstance(value, datetime.datetime):
+        value = datetime.datetime.combine(value, datetime.time())
+    if value.tzinfo is not None:
+        seconds = value.timestamp()
+    else:
+        seconds = (value - EPOCH) / datetime.timedelta(seconds=1)
+    return int(seconds) if seconds.is_integer() else seconds
 
 
 class DateTimeEncoder(json.JSONEncoder):
+    def __init__(self, *args: Any, epoch: bool = False, **kwargs: Any) -> None:
+        """Initialize the encoder.
+
+        Args:
+            epoch (bool, optional): whether to write dates as seconds since EPOCH. Defaults to False.
+        """
+        super().__init__(*args, **kwargs)
+        self.epoch = epoch
+
     # Override the default method
     def default(self, obj):
         if isinstance(obj, (datetime.date, datetime.datetime)):
-            return obj.isoformat()
+            return format_datetime(obj, self.epoch)
         raise TypeError(f"Type {type(obj)} not serializable")
 
 
 def load_sample() -> list:
     with open("data/sample.json") as f:
         return json.load(f)
+
+
+def open_data(
+    filename: str,
+    mode: str = "r",
+    newline: str | None = None,
+) -> IO[str]:
+    """Opens a data file in text mode, compressed based on its extension
+
+    Files ending in .gz, .bz2 or .xz (and .zst where the standard
+    library supports it) are compressed transparently.
+
+    Args:
+        filename (str): name of the file
+        mode (str, optional): "r" to read or "w" to write. Defaults to "r".
+        newline (str | None, optional): newline mode, as for open(). Defaults to None.
+
+    Returns:
+        IO[str]: text file object
+    """
+    for ext, opener in COMPRESSED_EXTENSIONS.items():
+        if filename.endswith(ext):
+            return opener(filename, mode + "t", encoding="utf-8", newline=newline)
+    return open(filename, mode, newline=newline)
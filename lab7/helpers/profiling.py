@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import functools
+import math
+import os
+import random
+import time
+from typing import Any
+from typing import Callable
+
+__all__ = ["Samples", "Profiler", "enable", "disable", "active", "record_write"]
+
+_active: Profiler | None = None
+
+# Number of durations kept per method for the percentiles
+RESERVOIR_SIZE = 1024
+
+
+class Samples:
+    """Running aggregates of a method's durations
+
+    The count, total and maximum are exact. Percentiles are estimated from
+    a uniform sample of at most RESERVOIR_SIZE durations, so memory stays
+    constant however many calls are recorded.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the aggregates."""
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.reservoir: list[float] = []
+
+    def add(self, seconds: float) -> None:
+        """Adds a duration
+
+        Args:
+            seconds (float): duration of the call
+        """
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        if len(self.reservoir) < RESERVOIR_SIZE:
+            self.reservoir.append(seconds)
+            return
+        # Reservoir sampling keeps every duration with equal probability
+        i = random.randrange(self.count)
+        if i < RESERVOIR_SIZE:
+            self.reservoir[i] = seconds
+
+
+class Profiler:
+    """Records call counts, latencies and bytes written."""
+
+    def __init__(self) -> None:
+        """Initialize the profiler."""
+        self.__timings: dict[str, Samples] = {}
+        # Number of writes and bytes written by writer name
+        self.__writes: dict[str, list[int]] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        """Records the duration of a call
+
+        Args:
+            name (str): name of the method
+            seconds (float): duration of the call
+        """
+        samples = self.__timings.get(name)
+        if samples is None:
+            samples = self.__timings[name] = Samples()
+        samples.add(seconds)
+
+    def record_bytes(self, name: str, count: int) -> None:
+        """Records a file write
+
+        Args:
+            name (str): name of the writer
+            count (int): number of bytes written
+        """
+        writes = self.__writes.setdefault(name, [0, 0])
+        writes[0] += 1
+        writes[1] += count
+
+    def wrap(self, name: str, func: Callable) -> Callable:
+        """Wraps a function so that its calls are recorded
+
+        Args:
+            name (str): name to record the calls under
+            func (Callable): function to be wrapped
+
+        Returns:
+            Callable: wrapped function
+        """
+
+        @functools.wraps(func)
+        def _wrap(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(name, time.perf_counter() - start)
+
+        return _wrap
+
+    def instrument(self, obj: Any, prefix: str | None = None) -> Any:
+        """Records the calls of every public method of an object
+
+        Only the given instance is affected. Properties are not recorded.
+        Repositories look their load method up on each lazy load, so the
+        instrumented one times it.
+
+        Args:
+            obj (Any): object to be instrumented
+            prefix (str | None, optional): prefix of the recorded names. Defaults to the class name.
+
+        Returns:
+            Any: the instrumented object
+        """
+        prefix = prefix or type(obj).__name__
+        for name in dir(type(obj)):
+            if name.startswith("_") or not callable(getattr(type(obj), name)):
+                continue
+            setattr(obj, name, self.wrap(f"{prefix}.{name}", getattr(obj, name)))
+        return obj
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Returns the statistics of every recorded method
+
+        Returns:
+            dict[str, dict[str, float]]: calls, total, max, p50 and p99 (in seconds) by method name
+        """
+        return {
+            name: {
+                "calls": samples.count,
+                "total": samples.total,
+                "max": samples.max,
+                "p50": percentile(samples.reservoir, 50),
+                "p99": percentile(samples.reservoir, 99),
+            }
+            for name, samples in self.__timings.items()
+        }
+
+    def bytes_written(self) -> dict[str, int]:
+        """Returns the number of bytes written by every writer
+
+        Returns:
+            dict[str, int]: bytes written by writer name
+        """
+        return {name: total for name, (_, total) in self.__writes.items()}
+
+    def reset(self) -> None:
+        """Clears all recorded data."""
+        self.__timings.clear()
+        self.__writes.clear()
+
+    def summary(self) -> str:
+        """Returns a table of the recorded data, slowest methods first
+
+        Returns:
+            str: summary table
+        """
+        res = [
+            f"{'method':<48}{'calls':>8}{'total ms':>12}{'p50 ms':>10}{'p99 ms':>10}"
+            f"{'max ms':>10}",
+        ]
+        stats = sorted(self.stats().items(), key=lambda x: -x[1]["total"])
+        for name, x in stats:
+            res.append(
+                f"{name:<48}{x['calls']:>8}{x['total'] * 1000:>12.3f}"
+                f"{x['p50'] * 1000:>10.3f}{x['p99'] * 1000:>10.3f}"
+                f"{x['max'] * 1000:>10.3f}",
+            )
+        for name, (writes, count) in self.__writes.items():
+            res.append(f"{name:<48}{writes:>8} writes, {count} bytes")
+        return "\n".join(res)
+
+
+def percentile(samples: list[float], p: float) -> float:
+    """Returns a nearest-rank percentile
+
+    Args:
+        samples (list[float]): samples
+        p (float): percentile, between 0 and 100
+
+    Returns:
+        float: value of the percentile, 0 if there are no samples
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def enable() -> Profiler:
+    """Enables profiling, returning the active profiler
+
+    Returns:
+        Profiler: active profiler
+    """
+    global _active
+    if _active is None:
+        _active = Profiler()
+    return _active
+
+
+def disable() -> None:
+    """Disables profiling."""
+    global _active
+    _active = None
+
+
+def active() -> Profiler | None:
+    """Returns the active profiler
+
+    Returns:
+        Profiler | None: active profiler, None if profiling is disabled
+    """
+    return _active
+
+
+def record_write(name: str, filename: str) -> None:
+    """Records the size of a written file if profiling is enabled
+
+    Args:
+        name (str): name of the writer
+        filename (str): name of the written file
+    """
+    if _active is not None:
+        _active.record_bytes(name, os.path.getsize(filename))
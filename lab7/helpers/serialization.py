@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import itertools
+import json
+from typing import Any
+from typing import Callable
+from typing import IO
+from typing import Iterable
+
+from entities import Lab
+from entities import Problem
+from entities import Student
+from entities import Submission
+from helpers.data import format_datetime
+
+__all__ = [
+    "student_to_dict",
+    "submission_to_dict",
+    "problem_to_dict",
+    "lab_to_dict",
+    "dump",
+    "CHUNK_SIZE",
+]
+
+COMPACT_SEPARATORS = (",", ":")
+# Items encoded at once by the file repositories
+CHUNK_SIZE = 10_000
+
+
+def student_to_dict(x: Student) -> dict:
+    """Converts a student to a JSON serializable dict
+
+    Args:
+        x (Student): student
+
+    Returns:
+        dict: student data
+    """
+    return {"sid": x.sid, "name": x.name, "group": x.group}
+
+
+def submission_to_dict(x: Submission) -> dict:
+    """Converts a submission to a JSON serializable dict
+
+    Args:
+        x (Submission): submission
+
+    Returns:
+        dict: submission data
+    """
+    return {"sid": x.sid, "lid": x.lid, "pid": x.pid, "grade": x.grade}
+
+
+def problem_to_dict(x: Problem, epoch: bool = False) -> dict:
+    """Converts a problem to a JSON serializable dict
+
+    Args:
+        x (Problem): problem
+        epoch (bool, optional): whether to write the deadline as seconds since EPOCH. Defaults to False.
+
+    Returns:
+        dict: problem data
+    """
+    return {
+        "pid": x.pid,
+        "description": x.description,
+        "deadline": format_datetime(x.deadline, epoch),
+    }
+
+
+def lab_to_dict(x: Lab, epoch: bool = False) -> dict:
+    """Converts a lab and its problems to a JSON serializable dict
+
+    Args:
+        x (Lab): lab
+        epoch (bool, optional): whether to write deadlines as seconds since EPOCH. Defaults to False.
+
+    Returns:
+        dict: lab data
+    """
+    return {"lid": x.lid, "problems": [problem_to_dict(p, epoch) for p in x.problems]}
+
+
+def dump(
+    items: Iterable[Any],
+    file: IO[str],
+    to_dict: Callable[[Any], dict],
+    indent: int | None = None,
+    chunk_size: int | None = None,
+) -> None:
+    """Writes the items to a file as a JSON list
+
+    Without indent the output is compact. With chunk_size the list is encoded
+    and written that many items at a time, so the whole document is never
+    held in memory. Compact output goes through the C encoder, which
+    json.dump never uses.
+
+    Args:
+        items (Iterable[Any]): items to be written
+        file (IO[str]): file opened for writing
+        to_dict (Callable[[Any], dict]): converts an item to a dict
+        indent (int | None, optional): indentation of the output. Defaults to None.
+        chunk_size (int | None, optional): number of items encoded at once. Defaults to None.
+    """
+    separators = None if indent is not None else COMPACT_SEPARATORS
+    if chunk_size is None:
+        file.write(
+            json.dumps(
+                [to_dict(x) for x in items],
+                indent=indent,
+                separators=separators,
+            ),
+        )
+        return
+
+    encode = json.JSONEncoder(indent=indent, separators=separators).encode
+    # Each chunk is encoded as a list, then stripped of its brackets
+    strip, delimiter = (2, ",\n") if indent is not None else (1, ",")
+    iterator = iter(items)
+    written = False
+    file.write("[")
+    while chunk := [to_dict(x) for x in itertools.islice(iterator, chunk_size)]:
+        body = encode(chunk)[strip:-strip]
+        file.write((delimiter if written else "\n" * (strip - 1)) + body)
+        written = True
+    file.write("\n]" if written and indent is not None else "]")
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import sys
+
+__all__ = ["StringTable", "STRINGS"]
+
+# References to an unused stored string while prune() checks it: the key and
+# the value of its table entry, the loop variable and sys.getrefcount's argument
+_TABLE_REFS = 4
+
+
+class StringTable:
+    """Deduplicates equal strings so that they share a single object.
+
+    Strings only referenced by the table, such as names of deleted students
+    or descriptions of deleted problems, are dropped by prune(). intern()
+    runs it whenever the table has doubled since the last prune, so the
+    table stays proportional to the strings in use.
+    """
+
+    def __init__(self, prune_size: int = 1024) -> None:
+        """Initialize the string table.
+
+        Args:
+            prune_size (int, optional): size of the table at which intern() first prunes it. Defaults to 1024.
+        """
+        self.__strings: dict[str, str] = {}
+        self.__prune_size = prune_size
+        self.__prune_at = prune_size
+
+    def __len__(self) -> int:
+        return len(self.__strings)
+
+    def intern(self, value: str) -> str:
+        """Returns the stored string equal to value, storing value if there is none
+
+        Args:
+            value (str): string to be interned
+
+        Returns:
+            str: the shared string object
+        """
+        stored = self.__strings.setdefault(value, value)
+        if len(self.__strings) >= self.__prune_at:
+            self.prune()
+        return stored
+
+    def get(self, value: str) -> str | None:
+        """Returns the stored string equal to value without storing it
+
+        Args:
+            value (str): string to look up
+
+        Returns:
+            str | None: the shared string object, None if no stored object uses it
+        """
+        return self.__strings.get(value)
+
+    def prune(self) -> int:
+        """Removes the strings which are only referenced by the table
+
+        Uses CPython reference counts, so a string still held anywhere else
+        is kept.
+
+        Returns:
+            int: number of removed strings
+        """
+        unused = [x for x in self.__strings if sys.getrefcount(x) <= _TABLE_REFS]
+        for x in unused:
+            del self.__strings[x]
+        self.__prune_at = max(self.__prune_size, 2 * len(self.__strings))
+        return len(unused)
+
+    def clear(self) -> None:
+        """Removes all strings from the table."""
+        self.__strings.clear()
+        self.__prune_at = self.__prune_size
+
+
+# Shared by the repositories, so that equal names and descriptions loaded
+# by different repositories are a single object
+STRINGS = StringTable()
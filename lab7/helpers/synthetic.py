@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import datetime
+import random
+
+__all__ = ["generate"]
+
+FIRST_NAMES = [
+    "Ana",
+    "Andrei",
+    "Bianca",
+    "Cristian",
+    "Diana",
+    "Elena",
+    "George",
+    "Ioana",
+    "Maria",
+    "Mihai",
+    "Radu",
+    "Stefan",
+]
+LAST_NAMES = [
+    "Popescu",
+    "Ionescu",
+    "Pop",
+    "Dumitru",
+    "Stan",
+    "Stoica",
+    "Gheorghe",
+    "Matei",
+    "Ciobanu",
+    "Rusu",
+]
+TOPICS = ["Numere", "Cifre", "Liste", "Siruri", "Matrici", "Sortare", "Cautare"]
+
+
+def generate(
+    students: int = 100,
+    labs: int = 10,
+    problems: int = 5,
+    submissions: int = 1000,
+    graded: float = 0.8,
+    grade_mean: float = 7.0,
+    grade_stdev: float = 2.0,
+    seed: int = 0,
+) -> dict:
+    """Generates a deterministic data set in the format of data/sample.json
+
+    Args:
+        students (int, optional): number of students. Defaults to 100.
+        labs (int, optional): number of labs. Defaults to 10.
+        problems (int, optional): number of problems per lab. Defaults to 5.
+        submissions (int, optional): number of submissions. Defaults to 1000.
+        graded (float, optional): share of graded submissions. Defaults to 0.8.
+        grade_mean (float, optional): mean of the grade distribution. Defaults to 7.0.
+        grade_stdev (float, optional): standard deviation of the grades. Defaults to 2.0.
+        seed (int, optional): random seed. Defaults to 0.
+
+    Returns:
+        dict: data with "labs", "students" and "submissions" lists
+    """
+    rng = random.Random(seed)
+    start = datetime.datetime(2022, 10, 3)
+    return {
+        "labs": [
+            {
+                "lid": lid,
+                "problems": [
+                    {
+                        "pid": pid,
+                        "description": f"{rng.choice(TOPICS)} {pid}",
+                        "deadline": (start + datetime.timedelta(weeks=lid)).isoformat(),
+                    }
+                    for pid in range(1, problems + 1)
+                ],
+            }
+            for lid in range(1, labs + 1)
+        ],
+        "students": [
+            {
+                "sid": sid,
+                "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                "group": 311 + sid % 7,
+            }
+            for sid in range(1, students + 1)
+        ],
+        "submissions": [
+            {
+                "sid": rng.randint(1, students),
+                "lid": rng.randint(1, labs),
+                "pid": rng.randint(1, problems),
+                "grade": (
+                    min(10, max(1, round(rng.gauss(grade_mean, grade_stdev))))
+                    if rng.random() < graded
+                    else None
+                ),
+            }
+            for _ in range(submissions)
+        ],
+    }
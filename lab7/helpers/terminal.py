@@ -6,6 +6,7 @@ from typing import Any
 from entities import Lab
 from entities import Problem
 from entities import Student
+from entities.lab import parse_deadline
 
 __all__ = [
     "clear",
@@ -46,13 +47,13 @@ def read_lab() -> Lab:
     return Lab(lid)
 
 
-def read_lab_problem() -> Lab:
+def read_lab_problem() -> tuple[int, Problem]:
     x = input("Enter problem ID: (lid_pid) ")
     name = input("Enter name: ")
     deadline = input("Enter deadline: ")
     try:
         lid, pid = x.split("_")
-        return int(lid), Problem(int(pid), name, deadline)
+        return int(lid), Problem(int(pid), name, parse_deadline(deadline))
     except:
         print("Invalid value specified. Try again.")
         return read_lab_problem()
@@ -1,26 +1,56 @@
 from __future__ import annotations
 
+import atexit
+import os
+
 import repository
 import services
 import ui
+from helpers import profiling
 
 
 def main() -> None:
-    """Main function. Runs a menu."""
+    """Main function. Runs a menu.
+
+    Set the LAB7_PROFILE environment variable to record the calls of the
+    services and repositories. The summary is printed on exit.
+    """
 
-    lab_repo = repository.LabFileRepository("data/labs.json")
-    student_repo = repository.StudentFileRepository("data/students.json")
-    submission_repo = repository.SubmissionFileRepository("data/submissions.json")
+    lab_repo = repository.LabFileRepository("data/labs.json", prefetch=True)
+    student_repo = repository.StudentFileRepository(
+        "data/students.json",
+        prefetch=True,
+    )
+    submission_repo = repository.SubmissionFileRepository(
+        "data/submissions.json",
+        prefetch=True,
+    )
 
-    lab_service = services.LabService(lab_repo)
-    student_service = services.StudentService(student_repo)
+    # Shared, so that cascaded deletions are undone as one change
+    journal = services.Journal()
+    lab_service = services.LabService(lab_repo, journal)
+    student_service = services.StudentService(student_repo, journal)
     submission_service = services.SubmissionService(
         submission_repo,
         lab_service,
         student_service,
     )
 
-    menu = ui.MainMenu(lab_service, student_service, submission_service)
+    profiler = None
+    if os.environ.get("LAB7_PROFILE"):
+        profiler = profiling.enable()
+        for obj in (
+            lab_repo,
+            student_repo,
+            submission_repo,
+            lab_service,
+            student_service,
+            submission_service,
+        ):
+            profiler.instrument(obj)
+        atexit.register(lambda: print(profiler.summary()))
+
+    menu = ui.MainMenu(lab_service, student_service, submission_service, profiler)
 
     menu.run()
 
@@ -4,5 +4,6 @@ from .lab_repository import LabFileRepository
 from .lab_repository import LabRepository
 from .student_repository import StudentFileRepository
 from .student_repository import StudentRepository
+from .submission_repository import ShardedSubmissionFileRepository
 from .submission_repository import SubmissionFileRepository
 from .submission_repository import SubmissionRepository
@@ -1,19 +1,44 @@
 from __future__ import annotations
 
 import dataclasses
+import functools
 import json
+import threading
+from typing import Iterable
 
 from entities import Lab
 from entities import Problem
-from helpers.data import DateTimeEncoder
+from helpers import profiling
+from helpers import serialization
+from helpers.data import open_data
+from helpers.strings import StringTable
+from helpers.strings import STRINGS
+
+from .lazy import LazyLoader
+from .snapshot import copy_on_write
+from .sorted_view import SortedViews
 
 
 class LabRepository:
     """Repository for lab operations."""
 
-    def __init__(self) -> None:
-        """Initialize the lab repository."""
-        self.__labs = []
+    def __init__(self, strings: StringTable = STRINGS) -> None:
+        """Initialize the lab repository.
+
+        Args:
+            strings (StringTable, optional): table the problem descriptions are interned in. Defaults to the shared table.
+        """
+        self.__labs: dict[int, Lab] = {}
+        self.__problems: dict[tuple[int, int], Problem] = {}
+        # Position of each problem in the problem list of its lab
+        self.__positions: dict[tuple[int, int], int] = {}
+        self.__strings = strings
+        # Whether the dicts are shared with a snapshot, and the IDs of the
+        # labs copied since, which may have their problems changed in place
+        self.__shared = False
+        self.__owned: set[int] | None = None
+        self.__views = SortedViews()
+        self._lock = threading.RLock()
 
     @property
     def lab_count(self) -> int:
@@ -22,6 +47,7 @@ class LabRepository:
         Returns:
             int: number of labs
         """
+        self._ensure_loaded()
         return len(self.__labs)
 
     @property
@@ -31,7 +57,99 @@ class LabRepository:
         Returns:
             int: number of problems
         """
-        return len(self.get_problems())
+        self._ensure_loaded()
+        return len(self.__problems)
+
+    def _ensure_loaded(self) -> None:
+        """Loads the data if the repository defers loading.
+
+        Base repositories hold their data in memory and do nothing here.
+        """
+
+    def _detach(self) -> None:
+        """Copies the data shared with snapshots before it is changed.
+
+        The sorted views are dropped, as they are about to be outdated.
+        """
+        self.__views.clear()
+        if self.__shared:
+            self.__labs = dict(self.__labs)
+            self.__problems = dict(self.__problems)
+            self.__positions = dict(self.__positions)
+            self.__shared = False
+            self.__owned = set()
+
+    def __own_lab(self, lid: int) -> Lab:
+        """Internal: returns a lab whose problems may be changed in place
+
+        Labs shared with a snapshot are replaced by a copy first.
+
+        Args:
+            lid (int): ID of the lab
+
+        Returns:
+            Lab: the stored lab
+        """
+        lab = self.__labs[lid]
+        if self.__owned is not None and lid not in self.__owned:
+            lab = dataclasses.replace(lab, problems=list(lab.problems))
+            self.__labs[lid] = lab
+            self.__owned.add(lid)
+        return lab
+
+    def snapshot(self) -> LabRepository:
+        """Returns a point-in-time copy of the repository
+
+        The copy shares the stored data until either repository changes, so
+        taking it is O(1). The first change after it copies the dicts, and a
+        lab is copied before its problems change. The copy is an in-memory
+        repository and never writes to a file.
+
+        Returns:
+            LabRepository: snapshot of the repository
+        """
+        self._ensure_loaded()
+        with self._lock:
+            snapshot = LabRepository(self.__strings)
+            snapshot.__labs = self.__labs
+            snapshot.__problems = self.__problems
+            snapshot.__positions = self.__positions
+            self.__shared = snapshot.__shared = True
+            return snapshot
+
+    def __index_lab(self, lab: Lab) -> None:
+        """Internal: stores a lab and indexes its problems
+
+        Args:
+            lab (Lab): lab to store
+        """
+        self.__labs[lab.lid] = lab
+        if self.__owned is not None:
+            self.__owned.add(lab.lid)
+        for i, problem in enumerate(lab.problems):
+            self.__index_problem(lab.lid, i, problem)
+
+    def __index_problem(self, lid: int, index: int, problem: Problem) -> None:
+        """Internal: indexes a problem, interning its description
+
+        Args:
+            lid (int): ID of the lab
+            index (int): position of the problem in the lab
+            problem (Problem): problem to index
+        """
+        problem.description = self.__strings.intern(problem.description)
+        self.__problems[lid, problem.pid] = problem
+        self.__positions[lid, problem.pid] = index
+
+    def __unindex_lab(self, lab: Lab) -> None:
+        """Internal: removes the problems of a deleted lab from the indexes
+
+        Args:
+            lab (Lab): deleted lab
+        """
+        for problem in lab.problems:
+            del self.__problems[lab.lid, problem.pid]
+            del self.__positions[lab.lid, problem.pid]
 
     def load_json(self, obj: list) -> None:
         """Loads data from a JSON object
@@ -39,9 +157,15 @@ class LabRepository:
         Args:
             obj (list): list of data
         """
-        self.__labs.clear()
-        for x in obj:
-            self.__labs.append(Lab.from_type(x))
+        with self._lock:
+            self.__labs = {}
+            self.__problems = {}
+            self.__positions = {}
+            self.__shared = False
+            self.__owned = None
+            self.__views.clear()
+            for x in obj:
+                self.__index_lab(Lab.from_type(x))
 
     def get_labs(self) -> list[Lab]:
         """Gets the list of all labs
@@ -49,7 +173,8 @@ class LabRepository:
         Returns:
             list[Lab]: list of labs
         """
-        return self.__labs
+        self._ensure_loaded()
+        return list(self.__labs.values())
 
     def get_lab_by_id(self, lid: int) -> Lab | None:
         """Returns a lab with the given ID
@@ -60,11 +185,34 @@ class LabRepository:
         Returns:
             lab (Lab): Lab with the given ID
         """
-        for lab in self.__labs:
-            if lab.lid == lid:
-                return lab
-        return None
+        self._ensure_loaded()
+        return self.__labs.get(lid)
+
+    def get_labs_page(
+        self,
+        cursor: int | None = None,
+        limit: int = 20,
+    ) -> tuple[list[Lab], int | None]:
+        """Returns a page of labs in ID order
 
+        The order is built once and reused until the labs change.
+
+        Args:
+            cursor (int | None, optional): cursor returned with the previous page. Defaults to the first page.
+            limit (int, optional): maximum number of labs. Defaults to 20.
+
+        Returns:
+            tuple[list[Lab], int | None]: labs, and the cursor of the next page (None after the last page)
+        """
+        self._ensure_loaded()
+        return self.__views.page(
+            "lid",
+            lambda: ((x.lid, x) for x in self.__labs.values()),
+            cursor,
+            limit,
+        )
+
+    @copy_on_write
     def add_lab(self, obj: Lab | dict) -> Lab:
         """Adds a lab to the list
 
@@ -77,16 +225,42 @@ class LabRepository:
         lab = Lab.from_type(obj)
         if self.get_lab_by_id(lab.lid) is not None:
             raise ValueError("Lab with the given ID already exists")
-        self.__labs.append(lab)
-        return self.__labs[-1]
+        self.__index_lab(lab)
+        return lab
+
+    @copy_on_write
+    def add_labs(self, objs: Iterable[Lab | dict]) -> list[Lab]:
+        """Adds several labs at once, either all of them or none
+
+        Args:
+            objs (Iterable[Lab | dict]): lab data
 
+        Returns:
+            list[Lab]: the added labs
+        """
+        labs = [Lab.from_type(x) for x in objs]
+        self._ensure_loaded()
+        lids = set()
+        for lab in labs:
+            if lab.lid in self.__labs or lab.lid in lids:
+                raise ValueError("Lab with the given ID already exists")
+            lids.add(lab.lid)
+        for lab in labs:
+            self.__index_lab(lab)
+        return labs
+
+    @copy_on_write
     def delete_lab(self, obj: Lab | dict) -> None:
         """Deletes a lab from the list
 
         Args:
             obj (Lab | dict): lab data
         """
-        self.__labs.remove(Lab.from_type(obj))
+        self._ensure_loaded()
+        lab = self.__labs.pop(Lab.from_type(obj).lid, None)
+        if lab is None:
+            raise ValueError("Lab with the given ID does not exist")
+        self.__unindex_lab(lab)
 
     def get_problems(self) -> list[Problem]:
         """Gets the list of all problems
@@ -94,25 +268,23 @@ class LabRepository:
         Returns:
             list[Problem]: list of problems
         """
-        return [x for lab in self.__labs for x in lab.problems]
+        self._ensure_loaded()
+        return [x for lab in self.__labs.values() for x in lab.problems]
 
     def get_problem_by_ids(self, lid: int, pid: int) -> Problem | None:
-        """Returns a submission with the given ID
+        """Returns a problem with the given IDs
 
         Args:
             lid (int): ID of the lab
             pid (int): ID of the problem
 
         Returns:
-            submission (Submission): Submission with the given ID
+            problem (Problem): Problem with the given IDs
         """
-        for lab in self.__labs:
-            if lab.lid == lid:
-                for problem in lab.problems:
-                    if problem.pid == pid:
-                        return problem
-        return None
+        self._ensure_loaded()
+        return self.__problems.get((lid, pid))
 
+    @copy_on_write
     def add_problem(self, lid: int, obj: Problem | dict) -> Problem:
         """Adds a problem to the list
 
@@ -129,59 +301,222 @@ class LabRepository:
             raise ValueError("Lab with the given ID does not exist")
         if self.get_problem_by_ids(lid, problem.pid) is not None:
             raise ValueError("Problem with the given ID already exists")
-        lab.problems.append(problem)
-        return lab.problems[-1]
+        problems = self.__own_lab(lid).problems
+        problems.append(problem)
+        self.__index_problem(lid, len(problems) - 1, problem)
+        return problem
+
+    @copy_on_write
+    def add_problems(
+        self,
+        objs: Iterable[tuple[int, Problem | dict]],
+    ) -> list[Problem]:
+        """Adds several problems at once, either all of them or none
+
+        Args:
+            objs (Iterable[tuple[int, Problem | dict]]): pairs of lab ID and problem data
+
+        Returns:
+            list[Problem]: the added problems
+        """
+        pairs = [(lid, Problem.from_type(x)) for lid, x in objs]
+        self._ensure_loaded()
+        keys = set()
+        for lid, problem in pairs:
+            if lid not in self.__labs:
+                raise ValueError("Lab with the given ID does not exist")
+            key = (lid, problem.pid)
+            if key in self.__problems or key in keys:
+                raise ValueError("Problem with the given ID already exists")
+            keys.add(key)
+        for lid, problem in pairs:
+            problems = self.__own_lab(lid).problems
+            problems.append(problem)
+            self.__index_problem(lid, len(problems) - 1, problem)
+        return [problem for _, problem in pairs]
 
     def search_problem_by_description(self, description: str) -> list[Problem]:
         """Searches for problems with the given description
 
+        Descriptions are interned when problems are stored and the table keeps
+        every string still in use, so a description missing from it matches no
+        problem. Descriptions are compared by equality, which is an identity
+        check for the shared objects.
+
         Args:
             description (str): description of the problem
 
         Returns:
             problems (list[Problem]): list of problems with the given description
         """
-        return [x for x in self.get_problems() if x.description == description]
+        stored = self.__strings.get(description)
+        if stored is None:
+            return []
+        return [x for x in self.get_problems() if x.description == stored]
+
+    @copy_on_write
+    def insert_problem(self, lid: int, index: int, obj: Problem | dict) -> Problem:
+        """Inserts a problem at the given position of its lab
+
+        The problem at that position moves to the end, which reverts
+        delete_problem_by_ids returning the same position.
+
+        Args:
+            lid (int): ID of the lab
+            index (int): position of the problem in the lab
+            obj (Problem | dict): problem data
 
-    def delete_problem_by_ids(self, lid: int, pid: int) -> None:
+        Returns:
+            Problem: the inserted problem
+        """
+        problem = Problem.from_type(obj)
+        if self.get_lab_by_id(lid) is None:
+            raise ValueError("Lab with the given ID does not exist")
+        if self.get_problem_by_ids(lid, problem.pid) is not None:
+            raise ValueError("Problem with the given ID already exists")
+        problems = self.__own_lab(lid).problems
+        if index < len(problems):
+            moved = problems[index]
+            problems.append(moved)
+            self.__positions[lid, moved.pid] = len(problems) - 1
+            problems[index] = problem
+        else:
+            problems.append(problem)
+            index = len(problems) - 1
+        self.__index_problem(lid, index, problem)
+        return problem
+
+    @copy_on_write
+    def delete_problem_by_ids(self, lid: int, pid: int) -> int:
         """Deletes a problem from the list by IDs
 
+        The last problem of the lab takes its position, so deleting is O(1).
+
         Args:
             lid (int): lab ID
             pid (int): problem ID
+
+        Returns:
+            int: position the problem had in its lab
+        """
+        self._ensure_loaded()
+        problem = self.__problems.pop((lid, pid), None)
+        if problem is None:
+            raise ValueError("Problem with the given ID does not exist")
+        index = self.__positions.pop((lid, pid))
+        problems = self.__own_lab(lid).problems
+        last = problems.pop()
+        if last is not problem:
+            problems[index] = last
+            self.__positions[lid, last.pid] = index
+        return index
+
+    @copy_on_write
+    def delete_labs(self, objs: Iterable[Lab | dict]) -> list[Lab]:
+        """Deletes several labs at once, either all of them or none
+
+        Args:
+            objs (Iterable[Lab | dict]): lab data
+
+        Returns:
+            list[Lab]: the deleted labs
         """
-        for lab in self.__labs:
-            if lab.lid == lid:
-                lab.problems.remove(self.get_problem_by_ids(lid, pid))
+        lids = [Lab.from_type(x).lid for x in objs]
+        if len(set(lids)) != len(lids) or any(x not in self.__labs for x in lids):
+            raise ValueError("Lab with the given ID does not exist")
+        labs = [self.__labs.pop(x) for x in lids]
+        for lab in labs:
+            self.__unindex_lab(lab)
+        return labs
+
+    @copy_on_write
+    def delete_problems(self, keys: Iterable[tuple[int, int]]) -> list[Problem]:
+        """Deletes several problems at once by IDs, either all of them or none
+
+        Args:
+            keys (Iterable[tuple[int, int]]): pairs of lab ID and problem ID
+
+        Returns:
+            list[Problem]: the deleted problems
+        """
+        keys = list(keys)
+        if len(set(keys)) != len(keys) or any(x not in self.__problems for x in keys):
+            raise ValueError("Problem with the given ID does not exist")
+        deleted: dict[int, set[int]] = {}
+        problems = []
+        for lid, pid in keys:
+            problem = self.__problems.pop((lid, pid))
+            del self.__positions[lid, pid]
+            deleted.setdefault(lid, set()).add(id(problem))
+            problems.append(problem)
+        # One pass over each lab touched, keeping the problem order
+        for lid, ids in deleted.items():
+            lab = self.__own_lab(lid)
+            lab.problems[:] = [x for x in lab.problems if id(x) not in ids]
+            for i, x in enumerate(lab.problems):
+                self.__positions[lid, x.pid] = i
+        return problems
 
 
 class LabFileRepository(LabRepository):
     """Repository for lab operations using a file."""
 
-    def __init__(self, filename: str) -> None:
+    def __init__(
+        self,
+        filename: str,
+        prefetch: bool = False,
+        epoch: bool = False,
+        compact: bool = False,
+    ) -> None:
         """Initialize the lab repository.
 
+        The file is read on first access, or in a background thread if
+        prefetch is set. Deadlines are read in either format.
+
         Args:
             filename (str): name of the file
+            prefetch (bool, optional): whether to start loading in a background thread. Defaults to False.
+            epoch (bool, optional): whether to save deadlines as seconds since EPOCH. Defaults to False.
+            compact (bool, optional): whether to save without indentation. Defaults to False.
         """
         super().__init__()
         self.__filename = filename
-        self.__load_file()
+        self.__epoch = epoch
+        self.__compact = compact
+        # Looked up on each load, so that an instrumented load is timed
+        self.__loader = LazyLoader(lambda: self.load())
+        if prefetch:
+            self.__loader.prefetch()
+
+    def _ensure_loaded(self) -> None:
+        """Loads the data from the file on first access."""
+        self.__loader.ensure_loaded()
+
+    def load_json(self, obj: list) -> None:
+        """Loads data from a JSON object instead of the file
+
+        Args:
+            obj (list): list of data
+        """
+        self.__loader.mark_loaded()
+        super().load_json(obj)
 
-    def __load_file(self) -> None:
-        """Loads the data from the file."""
-        with open(self.__filename) as file:
+    def load(self) -> None:
+        """Loads data from the file."""
+        with open_data(self.__filename) as file:
             self.load_json(json.load(file))
 
-    def __save_file(self) -> None:
-        """Saves the data to the file."""
-        with open(self.__filename, "w") as file:
-            json.dump(
-                [dataclasses.asdict(x) for x in self.get_labs()],
+    def save(self) -> None:
+        """Saves data to the file."""
+        with open_data(self.__filename, "w") as file:
+            serialization.dump(
+                self.get_labs(),
                 file,
-                indent=4,
-                cls=DateTimeEncoder,
+                functools.partial(serialization.lab_to_dict, epoch=self.__epoch),
+                indent=None if self.__compact else 4,
+                chunk_size=serialization.CHUNK_SIZE,
             )
+        profiling.record_write(f"{type(self).__name__}.save", self.__filename)
 
     def add_lab(self, obj: Lab | dict) -> Lab:
         """Adds a lab to the list
@@ -193,9 +528,22 @@ class LabFileRepository(LabRepository):
             Lab: the added lab
         """
         lab = super().add_lab(obj)
-        self.__save_file()
+        self.save()
         return lab
 
+    def add_labs(self, objs: Iterable[Lab | dict]) -> list[Lab]:
+        """Adds several labs at once, saving the file once
+
+        Args:
+            objs (Iterable[Lab | dict]): lab data
+
+        Returns:
+            list[Lab]: the added labs
+        """
+        labs = super().add_labs(objs)
+        self.save()
+        return labs
+
     def delete_lab(self, obj: Lab | dict) -> None:
         """Deletes a lab from the list
 
@@ -203,7 +551,7 @@ class LabFileRepository(LabRepository):
             obj (Lab | dict): lab data
         """
         super().delete_lab(obj)
-        self.__save_file()
+        self.save()
 
     def add_problem(self, lid: int, obj: Problem | dict) -> Problem:
         """Adds a problem to the list
@@ -216,15 +564,76 @@ class LabFileRepository(LabRepository):
             Problem: the added problem
         """
         problem = super().add_problem(lid, obj)
-        self.__save_file()
+        self.save()
+        return problem
+
+    def add_problems(
+        self,
+        objs: Iterable[tuple[int, Problem | dict]],
+    ) -> list[Problem]:
+        """Adds several problems at once, saving the file once
+
+        Args:
+            objs (Iterable[tuple[int, Problem | dict]]): pairs of lab ID and problem data
+
+        Returns:
+            list[Problem]: the added problems
+        """
+        problems = super().add_problems(objs)
+        self.save()
+        return problems
+
+    def insert_problem(self, lid: int, index: int, obj: Problem | dict) -> Problem:
+        """Inserts a problem at the given position of its lab
+
+        Args:
+            lid (int): ID of the lab
+            index (int): position of the problem in the lab
+            obj (Problem | dict): problem data
+
+        Returns:
+            Problem: the inserted problem
+        """
+        problem = super().insert_problem(lid, index, obj)
+        self.save()
         return problem
 
-    def delete_problem_by_ids(self, lid: int, pid: int) -> None:
+    def delete_problem_by_ids(self, lid: int, pid: int) -> int:
         """Deletes a problem from the list by IDs
 
         Args:
             lid (int): lab ID
             pid (int): problem ID
+
+        Returns:
+            int: position the problem had in its lab
+        """
+        index = super().delete_problem_by_ids(lid, pid)
+        self.save()
+        return index
+
+    def delete_labs(self, objs: Iterable[Lab | dict]) -> list[Lab]:
+        """Deletes several labs at once, saving the file once
+
+        Args:
+            objs (Iterable[Lab | dict]): lab data
+
+        Returns:
+            list[Lab]: the deleted labs
+        """
+        labs = super().delete_labs(objs)
+        self.save()
+        return labs
+
+    def delete_problems(self, keys: Iterable[tuple[int, int]]) -> list[Problem]:
+        """Deletes several problems at once by IDs, saving the file once
+
+        Args:
+            keys (Iterable[tuple[int, int]]): pairs of lab ID and problem ID
+
+        Returns:
+            list[Problem]: the deleted problems
         """
-        super().delete_problem_by_ids(lid, pid)
-        self.__save_file()
+        problems = super().delete_problems(keys)
+        self.save()
+        return problems
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import threading
+from typing import Callable
+
+__all__ = ["LazyLoader"]
+
+
+class LazyLoader:
+    """Runs a load function once, on first access or in a background thread."""
+
+    def __init__(self, load: Callable[[], None]) -> None:
+        """Initialize the loader.
+
+        Args:
+            load (Callable[[], None]): function which loads the data
+        """
+        self.__load = load
+        self.__lock = threading.RLock()
+        self.__loaded = False
+        self.__loading = False
+        self.__thread: threading.Thread | None = None
+
+    @property
+    def loaded(self) -> bool:
+        """Returns whether the data has been loaded.
+
+        Returns:
+            bool: True if the data has been loaded
+        """
+        return self.__loaded
+
+    def ensure_loaded(self) -> None:
+        """Loads the data if it has not been loaded yet.
+
+        Blocks while a background prefetch is in progress.
+        """
+        if self.__loaded:
+            return
+        with self.__lock:
+            # The load function may re-enter through the repository methods
+            if self.__loaded or self.__loading:
+                return
+            self.__loading = True
+            try:
+                self.__load()
+                self.__loaded = True
+            finally:
+                self.__loading = False
+
+    def mark_loaded(self) -> None:
+        """Marks the data as loaded without running the load function."""
+        with self.__lock:
+            # A running load marks the data as loaded once it finishes
+            if not self.__loading:
+                self.__loaded = True
+
+    def prefetch(self) -> None:
+        """Starts loading the data in a background thread."""
+        if self.__loaded or self.__thread is not None:
+            return
+        self.__thread = threading.Thread(target=self.__prefetch, daemon=True)
+        self.__thread.start()
+
+    def __prefetch(self) -> None:
+        """Internal: background thread target."""
+        try:
+            self.ensure_loaded()
+        except Exception:
+            # Errors are raised again on the next foreground access
+            pass
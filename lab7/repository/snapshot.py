@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import functools
+from typing import Any
+from typing import Callable
+
+__all__ = ["copy_on_write"]
+
+
+def copy_on_write(method: Callable) -> Callable:
+    """Decorator for repository methods which change the stored data
+
+    The method runs under the repository lock, after the data shared with
+    snapshots has been copied. The data is loaded before the lock is taken,
+    so a background load never waits for a writer.
+
+    Args:
+        method (Callable): repository method
+
+    Returns:
+        Callable: wrapped method
+    """
+
+    @functools.wraps(method)
+    def _wrap(self: Any, *args: Any, **kwargs: Any) -> Any:
+        self._ensure_loaded()
+        with self._lock:
+            self._detach()
+            return method(self, *args, **kwargs)
+
+    return _wrap
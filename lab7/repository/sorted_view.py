@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import bisect
+from typing import Any
+from typing import Callable
+from typing import Hashable
+from typing import Iterable
+
+__all__ = ["SortedViews"]
+
+
+class SortedViews:
+    """Sorted orderings of a repository's entities, built on first use
+
+    Each view holds the sort keys and the entities in key order, so a page
+    after a cursor is a binary search and a slice. Repositories drop the
+    views whenever their data changes.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the views."""
+        self.__views: dict[Hashable, tuple[list, list]] = {}
+
+    def clear(self) -> None:
+        """Drops all views."""
+        # A new dict, so a page being read concurrently keeps its view
+        self.__views = {}
+
+    def page(
+        self,
+        view: Hashable,
+        build: Callable[[], Iterable[tuple[Any, Any]]],
+        cursor: Any | None,
+        limit: int,
+    ) -> tuple[list, Any | None]:
+        """Returns the entities after a cursor in a view
+
+        Args:
+            view (Hashable): name of the view
+            build (Callable[[], Iterable[tuple[Any, Any]]]): returns the (key, entity) pairs of the view
+            cursor (Any | None): key of the last entity already returned, None for the first page
+            limit (int): maximum number of entities
+
+        Returns:
+            tuple[list, Any | None]: entities, and the cursor of the next page (None after the last page)
+        """
+        if limit < 1:
+            raise ValueError("Page size must be positive")
+        views = self.__views
+        if view not in views:
+            pairs = sorted(build(), key=lambda x: x[0])
+            views[view] = ([x[0] for x in pairs], [x[1] for x in pairs])
+        keys, values = views[view]
+        start = 0 if cursor is None else bisect.bisect_right(keys, cursor)
+        end = start + limit
+        return values[start:end], keys[end - 1] if end < len(keys) else None
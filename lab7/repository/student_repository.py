@@ -1,17 +1,45 @@
 from __future__ import annotations
 
-import dataclasses
 import json
+import threading
+from typing import Any
+from typing import Callable
+from typing import Iterable
 
 from entities import Student
+from helpers import profiling
+from helpers import serialization
+from helpers.data import open_data
+from helpers.strings import StringTable
+from helpers.strings import STRINGS
+
+from .lazy import LazyLoader
+from .snapshot import copy_on_write
+from .sorted_view import SortedViews
+
+# Sort keys of the student listing, ending with the ID to make them unique
+SORT_KEYS: dict[str, Callable[[Student], Any]] = {
+    "sid": lambda x: x.sid,
+    "name": lambda x: (x.name, x.sid),
+    "group": lambda x: (x.group, x.sid),
+}
 
 
 class StudentRepository:
     """Student repository class."""
 
-    def __init__(self):
-        """Initialize the student repository."""
-        self.__students = []
+    def __init__(self, strings: StringTable = STRINGS):
+        """Initialize the student repository.
+
+        Args:
+            strings (StringTable, optional): table the student names are interned in. Defaults to the shared table.
+        """
+        self.__students: dict[int, Student] = {}
+        self.__strings = strings
+        # Whether the students dict is shared with a snapshot
+        self.__shared = False
+        self.__views = SortedViews()
+        self._lock = threading.RLock()
 
     @property
     def student_count(self) -> int:
@@ -20,17 +48,67 @@ class StudentRepository:
         Returns:
             int: number of students
         """
+        self._ensure_loaded()
         return len(self.__students)
 
+    def _ensure_loaded(self) -> None:
+        """Loads the data if the repository defers loading.
+
+        Base repositories hold their data in memory and do nothing here.
+        """
+
+    def _detach(self) -> None:
+        """Copies the data shared with snapshots before it is changed.
+
+        The sorted views are dropped, as they are about to be outdated.
+        """
+        self.__views.clear()
+        if self.__shared:
+            self.__students = dict(self.__students)
+            self.__shared = False
+
+    def snapshot(self) -> StudentRepository:
+        """Returns a point-in-time copy of the repository
+
+        The copy shares the stored data until either repository changes, so
+        taking it is O(1) and the first change after it is one shallow copy.
+        The copy is an in-memory repository and never writes to a file.
+
+        Returns:
+            StudentRepository: snapshot of the repository
+        """
+        self._ensure_loaded()
+        with self._lock:
+            snapshot = StudentRepository(self.__strings)
+            snapshot.__students = self.__students
+            self.__shared = snapshot.__shared = True
+            return snapshot
+
+    def __store(self, student: Student) -> Student:
+        """Internal: stores a student, interning its name
+
+        Args:
+            student (Student): student to store
+
+        Returns:
+            Student: the stored student
+        """
+        student.name = self.__strings.intern(student.name)
+        self.__students[student.sid] = student
+        return student
+
     def load_json(self, obj: list) -> None:
         """Loads data from a JSON object
 
         Args:
             obj (list): list of data
         """
-        self.__students.clear()
-        for x in obj:
-            self.__students.append(Student.from_type(x))
+        with self._lock:
+            self.__students = {}
+            self.__shared = False
+            self.__views.clear()
+            for x in obj:
+                self.__store(Student.from_type(x))
 
     def get_students(self) -> list[Student]:
         """Gets the list of all students
@@ -38,7 +116,8 @@ class StudentRepository:
         Returns:
             list[Student]: list of students
         """
-        return self.__students
+        self._ensure_loaded()
+        return list(self.__students.values())
 
     def get_student_by_id(self, sid: int) -> Student | None:
         """Returns a student with the given ID
@@ -49,11 +128,64 @@ class StudentRepository:
         Returns:
             student (Student): Student with the given ID
         """
-        for student in self.__students:
-            if student.sid == sid:
-                return student
-        return None
+        self._ensure_loaded()
+        return self.__students.get(sid)
+
+    def get_students_page(
+        self,
+        cursor: Any | None = None,
+        limit: int = 20,
+        sort: str = "sid",
+        group: int | None = None,
+    ) -> tuple[list[Student], Any | None]:
+        """Returns a page of students in a sorted order
+
+        The order is built once and reused until the students change.
+
+        Args:
+            cursor (Any | None, optional): cursor returned with the previous page. Defaults to the first page.
+            limit (int, optional): maximum number of students. Defaults to 20.
+            sort (str, optional): sort key, one of "sid", "name" and "group". Defaults to "sid".
+            group (int | None, optional): only list the students of this group. Defaults to all groups.
+
+        Returns:
+            tuple[list[Student], Any | None]: students, and the cursor of the next page (None after the last page)
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError("Unknown sort key")
+        self._ensure_loaded()
+        key = SORT_KEYS[sort]
+        return self.__views.page(
+            (sort, group),
+            lambda: (
+                (key(x), x)
+                for x in self.__students.values()
+                if group is None or x.group == group
+            ),
+            cursor,
+            limit,
+        )
+
+    def search_student_by_name(self, name: str) -> list[Student]:
+        """Searches for students with the given name
+
+        Names are interned when students are stored and the table keeps every
+        string still in use, so a name missing from it matches no student.
+        Names are compared by equality, which is an identity check for the
+        shared objects.
 
+        Args:
+            name (str): name of the student
+
+        Returns:
+            students (list[Student]): list of students with the given name
+        """
+        stored = self.__strings.get(name)
+        if stored is None:
+            return []
+        return [x for x in self.get_students() if x.name == stored]
+
+    @copy_on_write
     def add_student(self, obj: Student | dict) -> Student:
         """Adds a student to the list
 
@@ -66,40 +198,112 @@ class StudentRepository:
         student = Student.from_type(obj)
         if self.get_student_by_id(student.sid) is not None:
             raise ValueError("Student with the given ID already exists")
-        self.__students.append(student)
-        return self.__students[-1]
+        return self.__store(student)
+
+    @copy_on_write
+    def add_students(self, objs: Iterable[Student | dict]) -> list[Student]:
+        """Adds several students at once, either all of them or none
 
+        Args:
+            objs (Iterable[Student | dict]): student data
+
+        Returns:
+            list[Student]: the added students
+        """
+        students = [Student.from_type(x) for x in objs]
+        self._ensure_loaded()
+        sids = set()
+        for student in students:
+            if student.sid in self.__students or student.sid in sids:
+                raise ValueError("Student with the given ID already exists")
+            sids.add(student.sid)
+        for student in students:
+            self.__store(student)
+        return students
+
+    @copy_on_write
     def delete_student(self, obj: Student | dict) -> None:
         """Deletes a student from the list
 
         Args:
             obj (Student | dict): student data
         """
-        self.__students.remove(Student.from_type(obj))
+        self._ensure_loaded()
+        if self.__students.pop(Student.from_type(obj).sid, None) is None:
+            raise ValueError("Student with the given ID does not exist")
+
+    @copy_on_write
+    def delete_students(self, objs: Iterable[Student | dict]) -> list[Student]:
+        """Deletes several students at once, either all of them or none
+
+        Args:
+            objs (Iterable[Student | dict]): student data
+
+        Returns:
+            list[Student]: the deleted students
+        """
+        sids = [Student.from_type(x).sid for x in objs]
+        if len(set(sids)) != len(sids) or any(x not in self.__students for x in sids):
+            raise ValueError("Student with the given ID does not exist")
+        return [self.__students.pop(x) for x in sids]
 
 
 class StudentFileRepository(StudentRepository):
     """Student file repository class."""
 
-    def __init__(self, filename: str):
+    def __init__(
+        self,
+        filename: str,
+        prefetch: bool = False,
+        compact: bool = False,
+    ):
         """Initialize the student file repository.
 
+        The file is read on first access, or in a background thread if
+        prefetch is set.
+
         Args:
             filename (str): name of the file
+            prefetch (bool, optional): whether to start loading in a background thread. Defaults to False.
+            compact (bool, optional): whether to save without indentation. Defaults to False.
         """
         super().__init__()
         self.__filename = filename
-        self.load()
+        self.__compact = compact
+        # Looked up on each load, so that an instrumented load is timed
+        self.__loader = LazyLoader(lambda: self.load())
+        if prefetch:
+            self.__loader.prefetch()
+
+    def _ensure_loaded(self) -> None:
+        """Loads the data from the file on first access."""
+        self.__loader.ensure_loaded()
+
+    def load_json(self, obj: list) -> None:
+        """Loads data from a JSON object instead of the file
+
+        Args:
+            obj (list): list of data
+        """
+        self.__loader.mark_loaded()
+        super().load_json(obj)
 
     def load(self) -> None:
         """Loads data from the file."""
-        with open(self.__filename) as file:
+        with open_data(self.__filename) as file:
             self.load_json(json.load(file))
 
     def save(self) -> None:
         """Saves data to the file."""
-        with open(self.__filename, "w") as file:
-            json.dump([dataclasses.asdict(x) for x in self.get_students()], file)
+        with open_data(self.__filename, "w") as file:
+            serialization.dump(
+                self.get_students(),
+                file,
+                serialization.student_to_dict,
+                indent=None if self.__compact else 4,
+                chunk_size=serialization.CHUNK_SIZE,
+            )
+        profiling.record_write(f"{type(self).__name__}.save", self.__filename)
 
     def add_student(self, obj: Student | dict) -> Student:
         """Adds a student to the list
@@ -114,6 +318,19 @@ class StudentFileRepository(StudentRepository):
         self.save()
         return student
 
+    def add_students(self, objs: Iterable[Student | dict]) -> list[Student]:
+        """Adds several students at once, saving the file once
+
+        Args:
+            objs (Iterable[Student | dict]): student data
+
+        Returns:
+            list[Student]: the added students
+        """
+        students = super().add_students(objs)
+        self.save()
+        return students
+
     def delete_student(self, obj: Student | dict) -> None:
         """Deletes a student from the list
 
@@ -122,3 +339,16 @@ class StudentFileRepository(StudentRepository):
         """
         super().delete_student(obj)
         self.save()
+
+    def delete_students(self, objs: Iterable[Student | dict]) -> list[Student]:
+        """Deletes several students at once, saving the file once
+
+        Args:
+            objs (Iterable[Student | dict]): student data
+
+        Returns:
+            list[Student]: the deleted students
+        """
+        students = super().delete_students(objs)
+        self.save()
+        return students
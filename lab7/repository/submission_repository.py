@@ -1,10 +1,18 @@
 from __future__ import annotations
 
-import dataclasses
 import json
+import os
+import threading
+from typing import AbstractSet
+from typing import Iterable
 
 from entities import Submission
-from helpers.data import DateTimeEncoder
+from helpers import profiling
+from helpers import serialization
+from helpers.data import open_data
+
+from .lazy import LazyLoader
+from .snapshot import copy_on_write
 
 
 class SubmissionRepository:
@@ -12,7 +20,18 @@ class SubmissionRepository:
 
     def __init__(self) -> None:
         """Initialize the submission repository"""
-        self.__submissions = []
+        # Submissions are stored by row number, as the sample data holds
+        # several submissions for the same student, lab and problem
+        self.__submissions: dict[int, Submission] = {}
+        self.__rows: dict[tuple[int, int, int], tuple[int, ...]] = {}
+        self.__by_student: dict[int, dict[int, Submission]] = {}
+        self.__by_lab: dict[int, dict[int, Submission]] = {}
+        self.__next_row = 0
+        # Whether the dicts are shared with a snapshot, and the keys of the
+        # index buckets copied since, which may be changed in place
+        self.__shared = False
+        self.__owned: tuple[set[int], set[int]] | None = None
+        self._lock = threading.RLock()
 
     @property
     def submission_count(self) -> int:
@@ -21,17 +40,135 @@ class SubmissionRepository:
         Returns:
             int: number of submissions
         """
+        self._ensure_loaded()
         return len(self.__submissions)
 
+    def _ensure_loaded(self) -> None:
+        """Loads the data if the repository defers loading.
+
+        Base repositories hold their data in memory and do nothing here.
+        """
+
+    def _detach(self) -> None:
+        """Copies the data shared with snapshots before it is changed."""
+        if self.__shared:
+            self.__submissions = dict(self.__submissions)
+            self.__rows = dict(self.__rows)
+            self.__by_student = dict(self.__by_student)
+            self.__by_lab = dict(self.__by_lab)
+            self.__shared = False
+            self.__owned = (set(), set())
+
+    def __bucket(
+        self,
+        index: dict[int, dict[int, Submission]],
+        owned: set[int] | None,
+        key: int,
+    ) -> dict[int, Submission]:
+        """Internal: returns an index bucket which may be changed in place
+
+        Buckets shared with a snapshot are replaced by a copy first.
+
+        Args:
+            index (dict[int, dict[int, Submission]]): student or lab index
+            owned (set[int] | None): keys of the buckets already copied, None if nothing is shared
+            key (int): student or lab ID
+
+        Returns:
+            dict[int, Submission]: the bucket
+        """
+        bucket = index.get(key)
+        if bucket is None:
+            bucket = index[key] = {}
+        elif owned is not None and key not in owned:
+            bucket = index[key] = dict(bucket)
+        if owned is not None:
+            owned.add(key)
+        return bucket
+
+    def snapshot(self) -> SubmissionRepository:
+        """Returns a point-in-time copy of the repository
+
+        The copy shares the stored data until either repository changes, so
+        taking it is O(1). The first change after it copies the top-level
+        dicts, and an index bucket is copied before it changes. The copy is
+        an in-memory repository and never writes to a file.
+
+        Returns:
+            SubmissionRepository: snapshot of the repository
+        """
+        self._ensure_loaded()
+        with self._lock:
+            snapshot = SubmissionRepository()
+            snapshot.__submissions = self.__submissions
+            snapshot.__rows = self.__rows
+            snapshot.__by_student = self.__by_student
+            snapshot.__by_lab = self.__by_lab
+            snapshot.__next_row = self.__next_row
+            self.__shared = snapshot.__shared = True
+            return snapshot
+
+    def __store(self, submission: Submission) -> Submission:
+        """Internal: stores a submission under a new row number
+
+        Args:
+            submission (Submission): submission to store
+
+        Returns:
+            Submission: the stored submission
+        """
+        row = self.__next_row
+        self.__next_row += 1
+        self.__submissions[row] = submission
+        key = (submission.sid, submission.lid, submission.pid)
+        self.__rows[key] = self.__rows.get(key, ()) + (row,)
+        owned = self.__owned or (None, None)
+        self.__bucket(self.__by_student, owned[0], submission.sid)[row] = submission
+        self.__bucket(self.__by_lab, owned[1], submission.lid)[row] = submission
+        return submission
+
+    def __remove(self, row: int) -> Submission:
+        """Internal: removes the submission stored under a row number
+
+        Args:
+            row (int): row number
+
+        Returns:
+            Submission: the removed submission
+        """
+        submission = self.__submissions.pop(row)
+        key = (submission.sid, submission.lid, submission.pid)
+        rows = tuple(x for x in self.__rows[key] if x != row)
+        if rows:
+            self.__rows[key] = rows
+        else:
+            del self.__rows[key]
+        owned = self.__owned or (None, None)
+        for index, value, keys in (
+            (self.__by_student, submission.sid, owned[0]),
+            (self.__by_lab, submission.lid, owned[1]),
+        ):
+            bucket = self.__bucket(index, keys, value)
+            del bucket[row]
+            if not bucket:
+                del index[value]
+        return submission
+
     def load_json(self, obj: list) -> None:
         """Loads data from a JSON object
 
         Args:
             obj (list): list of data
         """
-        self.__submissions.clear()
-        for x in obj:
-            self.__submissions.append(Submission.from_type(x))
+        with self._lock:
+            self.__submissions = {}
+            self.__rows = {}
+            self.__by_student = {}
+            self.__by_lab = {}
+            self.__shared = False
+            self.__owned = None
+            for x in obj:
+                self.__store(Submission.from_type(x))
 
     def get_submissions(self) -> list[Submission]:
         """Returns a list of all submissions
@@ -39,56 +176,243 @@ class SubmissionRepository:
         Returns:
             list[Submission]: list of all submissions
         """
-        return self.__submissions
+        self._ensure_loaded()
+        return list(self.__submissions.values())
 
-    def add_submission(self, obj: Submission | dict) -> None:
+    def get_submission(self, sid: int, lid: int, pid: int) -> Submission | None:
+        """Returns a submission with the given student, lab and problem IDs
+
+        Args:
+            sid (int): ID of the student
+            lid (int): ID of the lab
+            pid (int): ID of the problem
+
+        Returns:
+            submission (Submission): Submission with the given IDs
+        """
+        self._ensure_loaded()
+        rows = self.__rows.get((sid, lid, pid))
+        if not rows:
+            return None
+        return self.__submissions[rows[0]]
+
+    def get_lab_submissions(self, lid: int) -> list[Submission]:
+        """Returns a list of submissions for the given lab
+
+        Args:
+            lid (int): ID of the lab
+
+        Returns:
+            list[Submission]: list of submissions for the given lab
+        """
+        self._ensure_loaded()
+        return list(self.__by_lab.get(lid, {}).values())
+
+    def get_student_submissions(self, sid: int) -> list[Submission]:
+        """Returns a list of submissions for the given student
+
+        Args:
+            sid (int): ID of the student
+
+        Returns:
+            list[Submission]: list of submissions for the given student
+        """
+        self._ensure_loaded()
+        return list(self.__by_student.get(sid, {}).values())
+
+    @copy_on_write
+    def add_submission(self, obj: Submission | dict) -> Submission:
         """Adds a submission
 
         Args:
             obj (Submission | dict): submission to add
+
+        Returns:
+            Submission: the added submission
+        """
+        self._ensure_loaded()
+        return self.__store(Submission.from_type(obj))
+
+    @copy_on_write
+    def add_submissions(self, objs: Iterable[Submission | dict]) -> list[Submission]:
+        """Adds several submissions at once
+
+        Args:
+            objs (Iterable[Submission | dict]): submissions to add
+
+        Returns:
+            list[Submission]: the added submissions
         """
-        self.__submissions.append(Submission.from_type(obj))
+        submissions = [Submission.from_type(x) for x in objs]
+        self._ensure_loaded()
+        return [self.__store(x) for x in submissions]
 
+    @copy_on_write
     def delete_submission(self, obj: Submission | dict) -> None:
         """Deletes a submission
 
         Args:
             obj (Submission | dict): submission to delete
         """
-        self.__submissions.remove(Submission.from_type(obj))
+        self._ensure_loaded()
+        self.__remove(self.__find_row(Submission.from_type(obj)))
+
+    def __find_row(
+        self,
+        submission: Submission,
+        taken: AbstractSet[int] = frozenset(),
+    ) -> int:
+        """Internal: returns the row number of a stored submission
+
+        Args:
+            submission (Submission): submission to find
+            taken (AbstractSet[int], optional): row numbers to skip. Defaults to none.
+
+        Returns:
+            int: row number
+        """
+        key = (submission.sid, submission.lid, submission.pid)
+        rows = [x for x in self.__rows.get(key, ()) if x not in taken]
+        # Prefer the stored object itself, then an equal one
+        row = next((x for x in rows if self.__submissions[x] is submission), None)
+        if row is None:
+            row = next((x for x in rows if self.__submissions[x] == submission), None)
+        if row is None:
+            raise ValueError("Submission does not exist")
+        return row
+
+    @copy_on_write
+    def delete_submissions(self, objs: Iterable[Submission | dict]) -> list[Submission]:
+        """Deletes several submissions at once, either all of them or none
+
+        Args:
+            objs (Iterable[Submission | dict]): submissions to delete
+
+        Returns:
+            list[Submission]: the deleted submissions
+        """
+        rows: set[int] = set()
+        for x in objs:
+            rows.add(self.__find_row(Submission.from_type(x), rows))
+        return [self.__remove(x) for x in sorted(rows)]
+
+    @copy_on_write
+    def delete_student_submissions(self, sid: int) -> list[Submission]:
+        """Deletes all submissions of a student
+
+        Args:
+            sid (int): ID of the student
+
+        Returns:
+            list[Submission]: the deleted submissions
+        """
+        self._ensure_loaded()
+        return [self.__remove(x) for x in list(self.__by_student.get(sid, {}))]
+
+    @copy_on_write
+    def delete_lab_submissions(
+        self, lid: int, pid: int | None = None
+    ) -> list[Submission]:
+        """Deletes all submissions for a lab, or for one of its problems
+
+        Args:
+            lid (int): ID of the lab
+            pid (int | None, optional): ID of the problem. Defaults to all problems.
+
+        Returns:
+            list[Submission]: the deleted submissions
+        """
+        self._ensure_loaded()
+        rows = [
+            row
+            for row, x in self.__by_lab.get(lid, {}).items()
+            if pid is None or x.pid == pid
+        ]
+        return [self.__remove(x) for x in rows]
 
 
 class SubmissionFileRepository(SubmissionRepository):
     """Submission file repository"""
 
-    def __init__(self, filename: str) -> None:
+    def __init__(
+        self,
+        filename: str,
+        prefetch: bool = False,
+        compact: bool = False,
+    ) -> None:
         """Initialize the submission file repository
 
+        The file is read on first access, or in a background thread if
+        prefetch is set.
+
         Args:
             filename (str): name of the file
+            prefetch (bool, optional): whether to start loading in a background thread. Defaults to False.
+            compact (bool, optional): whether to save without indentation. Defaults to False.
         """
         super().__init__()
         self.__filename = filename
-        self.__load()
+        self.__compact = compact
+        # Looked up on each load, so that an instrumented load is timed
+        self.__loader = LazyLoader(lambda: self.load())
+        if prefetch:
+            self.__loader.prefetch()
+
+    def _ensure_loaded(self) -> None:
+        """Loads the data from the file on first access."""
+        self.__loader.ensure_loaded()
 
-    def __load(self) -> None:
+    def load_json(self, obj: list) -> None:
+        """Loads data from a JSON object instead of the file
+
+        Args:
+            obj (list): list of data
+        """
+        self.__loader.mark_loaded()
+        super().load_json(obj)
+
+    def load(self) -> None:
         """Loads data from the file"""
-        with open(self.__filename) as f:
+        with open_data(self.__filename) as f:
             self.load_json(json.load(f))
 
-    def __save(self) -> None:
+    def save(self) -> None:
         """Saves data to the file"""
-        with open(self.__filename, "w") as file:
-            json.dump([dataclasses.asdict(x) for x in self.get_submissions()], file)
+        with open_data(self.__filename, "w") as file:
+            serialization.dump(
+                self.get_submissions(),
+                file,
+                serialization.submission_to_dict,
+                indent=None if self.__compact else 4,
+                chunk_size=serialization.CHUNK_SIZE,
+            )
+        profiling.record_write(f"{type(self).__name__}.save", self.__filename)
 
-    def add_submission(self, submission: Submission) -> None:
+    def add_submission(self, submission: Submission) -> Submission:
         """Adds a submission
 
         Args:
             submission (Submission): submission to add
+
+        Returns:
+            Submission: the added submission
+        """
+        submission = super().add_submission(submission)
+        self.save()
+        return submission
+
+    def add_submissions(self, objs: Iterable[Submission | dict]) -> list[Submission]:
+        """Adds several submissions at once, saving the file once
+
+        Args:
+            objs (Iterable[Submission | dict]): submissions to add
+
+        Returns:
+            list[Submission]: the added submissions
         """
-        super().add_submission(submission)
-        self.__save()
+        submissions = super().add_submissions(objs)
+        self.save()
+        return submissions
 
     def delete_submission(self, submission: Submission) -> None:
         """Removes a submission
@@ -97,4 +421,352 @@ class SubmissionFileRepository(SubmissionRepository):
             submission (Submission): submission to remove
         """
         super().delete_submission(submission)
-        self.__save()
+        self.save()
+
+    def delete_submissions(self, objs: Iterable[Submission | dict]) -> list[Submission]:
+        """Deletes several submissions at once, saving the file once
+
+        Args:
+            objs (Iterable[Submission | dict]): submissions to delete
+
+        Returns:
+            list[Submission]: the deleted submissions
+        """
+        submissions = super().delete_submissions(objs)
+        if submissions:
+            self.save()
+        return submissions
+
+    def delete_student_submissions(self, sid: int) -> list[Submission]:
+        """Deletes all submissions of a student
+
+        Args:
+            sid (int): ID of the student
+
+        Returns:
+            list[Submission]: the deleted submissions
+        """
+        submissions = super().delete_student_submissions(sid)
+        if submissions:
+            self.save()
+        return submissions
+
+    def delete_lab_submissions(
+        self, lid: int, pid: int | None = None
+    ) -> list[Submission]:
+        """Deletes all submissions for a lab, or for one of its problems
+
+        Args:
+            lid (int): ID of the lab
+            pid (int | None, optional): ID of the problem. Defaults to all problems.
+
+        Returns:
+            list[Submission]: the deleted submissions
+        """
+        submissions = super().delete_lab_submissions(lid, pid)
+        if submissions:
+            self.save()
+        return submissions
+
+
+class ShardedSubmissionFileRepository(SubmissionRepository):
+    """Submission file repository storing one file per lab
+
+    Each shard file has the same format as a SubmissionFileRepository file.
+    Shards are read on first access and a change only rewrites its own shard.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        buckets: int | None = None,
+        extension: str = ".json",
+    ) -> None:
+        """Initialize the sharded submission file repository
+
+        Args:
+            directory (str): directory holding the shard files
+            buckets (int | None, optional): number of shards to hash lab IDs into. Defaults to one shard per lab.
+            extension (str, optional): shard file extension, selects compression. Defaults to ".json".
+        """
+        super().__init__()
+        self.__directory = directory
+        self.__buckets = buckets
+        self.__extension = extension
+        self.__shards: dict[int, SubmissionFileRepository] = {}
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def submission_count(self) -> int:
+        """Returns the number of submissions
+
+        Returns:
+            int: number of submissions
+        """
+        return sum(x.submission_count for x in self.__get_shards())
+
+    def __shard_key(self, lid: int) -> int:
+        """Internal: returns the shard key of a lab
+
+        Args:
+            lid (int): ID of the lab
+
+        Returns:
+            int: shard key
+        """
+        return lid if self.__buckets is None else lid % self.__buckets
+
+    def __shard_path(self, key: int) -> str:
+        """Internal: returns the file name of a shard
+
+        Args:
+            key (int): shard key
+
+        Returns:
+            str: name of the shard file
+        """
+        return os.path.join(self.__directory, f"{key}{self.__extension}")
+
+    def __stored_keys(self) -> list[int]:
+        """Internal: returns the keys of the shards stored in the directory
+
+        Returns:
+            list[int]: list of shard keys
+        """
+        keys = []
+        for entry in os.scandir(self.__directory):
+            if not entry.name.endswith(self.__extension):
+                continue
+            stem = entry.name[: -len(self.__extension)]
+            if stem.lstrip("-").isdigit():
+                keys.append(int(stem))
+        return sorted(keys)
+
+    def __get_shard(self, lid: int) -> SubmissionFileRepository | None:
+        """Internal: returns the shard holding the submissions of a lab
+
+        Args:
+            lid (int): ID of the lab
+
+        Returns:
+            SubmissionFileRepository | None: the shard, None if it does not exist
+        """
+        key = self.__shard_key(lid)
+        if key not in self.__shards:
+            path = self.__shard_path(key)
+            if not os.path.exists(path):
+                return None
+            self.__shards[key] = SubmissionFileRepository(path)
+        return self.__shards[key]
+
+    def __create_shard(self, lid: int) -> SubmissionFileRepository:
+        """Internal: returns the shard holding the submissions of a lab, creating it if it does not exist
+
+        Args:
+            lid (int): ID of the lab
+
+        Returns:
+            SubmissionFileRepository: the shard
+        """
+        shard = self.__get_shard(lid)
+        if shard is None:
+            key = self.__shard_key(lid)
+            shard = SubmissionFileRepository(self.__shard_path(key))
+            shard.load_json([])
+            self.__shards[key] = shard
+        return shard
+
+    def __get_shards(self) -> list[SubmissionFileRepository]:
+        """Internal: returns all shards, reading the ones not loaded yet
+
+        Returns:
+            list[SubmissionFileRepository]: list of shards
+        """
+        for key in self.__stored_keys():
+            if key not in self.__shards:
+                self.__shards[key] = SubmissionFileRepository(self.__shard_path(key))
+        return [self.__shards[key] for key in sorted(self.__shards)]
+
+    def load_json(self, obj: list) -> None:
+        """Loads data from a JSON object, replacing all shards
+
+        Args:
+            obj (list): list of data
+        """
+        groups: dict[int, list[Submission]] = {}
+        for x in obj:
+            submission = Submission.from_type(x)
+            groups.setdefault(self.__shard_key(submission.lid), []).append(submission)
+        for key in self.__stored_keys():
+            if key not in groups:
+                os.remove(self.__shard_path(key))
+        self.__shards.clear()
+        for key, submissions in groups.items():
+            shard = SubmissionFileRepository(self.__shard_path(key))
+            shard.load_json(submissions)
+            shard.save()
+            self.__shards[key] = shard
+
+    def snapshot(self) -> SubmissionRepository:
+        """Returns a point-in-time copy of all shards
+
+        Unlike the other repositories, the shards are merged into one
+        in-memory repository, which builds new indexes for every submission.
+
+        Returns:
+            SubmissionRepository: snapshot of the repository
+        """
+        snapshot = SubmissionRepository()
+        snapshot.load_json(self.get_submissions())
+        return snapshot
+
+    def get_submissions(self) -> list[Submission]:
+        """Returns a list of all submissions, grouped by shard
+
+        Returns:
+            list[Submission]: list of all submissions
+        """
+        return [x for shard in self.__get_shards() for x in shard.get_submissions()]
+
+    def get_submission(self, sid: int, lid: int, pid: int) -> Submission | None:
+        """Returns a submission with the given student, lab and problem IDs
+
+        Args:
+            sid (int): ID of the student
+            lid (int): ID of the lab
+            pid (int): ID of the problem
+
+        Returns:
+            submission (Submission): Submission with the given IDs
+        """
+        shard = self.__get_shard(lid)
+        if shard is None:
+            return None
+        return shard.get_submission(sid, lid, pid)
+
+    def get_lab_submissions(self, lid: int) -> list[Submission]:
+        """Returns a list of submissions for the given lab
+
+        Args:
+            lid (int): ID of the lab
+
+        Returns:
+            list[Submission]: list of submissions for the given lab
+        """
+        shard = self.__get_shard(lid)
+        if shard is None:
+            return []
+        return shard.get_lab_submissions(lid)
+
+    def get_student_submissions(self, sid: int) -> list[Submission]:
+        """Returns a list of submissions for the given student, reading all shards
+
+        Args:
+            sid (int): ID of the student
+
+        Returns:
+            list[Submission]: list of submissions for the given student
+        """
+        return [
+            x
+            for shard in self.__get_shards()
+            for x in shard.get_student_submissions(sid)
+        ]
+
+    def add_submission(self, obj: Submission | dict) -> Submission:
+        """Adds a submission, rewriting only its shard
+
+        Args:
+            obj (Submission | dict): submission to add
+
+        Returns:
+            Submission: the added submission
+        """
+        submission = Submission.from_type(obj)
+        return self.__create_shard(submission.lid).add_submission(submission)
+
+    def add_submissions(self, objs: Iterable[Submission | dict]) -> list[Submission]:
+        """Adds several submissions at once, rewriting each shard touched once
+
+        Args:
+            objs (Iterable[Submission | dict]): submissions to add
+
+        Returns:
+            list[Submission]: the added submissions
+        """
+        submissions = [Submission.from_type(x) for x in objs]
+        groups: dict[int, list[Submission]] = {}
+        for submission in submissions:
+            key = self.__shard_key(submission.lid)
+            groups.setdefault(key, []).append(submission)
+        for group in groups.values():
+            self.__create_shard(group[0].lid).add_submissions(group)
+        return submissions
+
+    def delete_submission(self, obj: Submission | dict) -> None:
+        """Deletes a submission, rewriting only its shard
+
+        Args:
+            obj (Submission | dict): submission to delete
+        """
+        submission = Submission.from_type(obj)
+        shard = self.__get_shard(submission.lid)
+        if shard is None:
+            raise ValueError("Submission does not exist")
+        shard.delete_submission(submission)
+
+    def delete_submissions(self, objs: Iterable[Submission | dict]) -> list[Submission]:
+        """Deletes several submissions at once, rewriting each shard touched once
+
+        Each shard deletes either all of its submissions or none, but a
+        missing submission does not restore the shards already rewritten.
+
+        Args:
+            objs (Iterable[Submission | dict]): submissions to delete
+
+        Returns:
+            list[Submission]: the deleted submissions
+        """
+        groups: dict[int, list[Submission]] = {}
+        for x in objs:
+            submission = Submission.from_type(x)
+            groups.setdefault(self.__shard_key(submission.lid), []).append(submission)
+        deleted = []
+        for group in groups.values():
+            shard = self.__get_shard(group[0].lid)
+            if shard is None:
+                raise ValueError("Submission does not exist")
+            deleted.extend(shard.delete_submissions(group))
+        return deleted
+
+    def delete_student_submissions(self, sid: int) -> list[Submission]:
+        """Deletes all submissions of a student, rewriting only the shards touched
+
+        Args:
+            sid (int): ID of the student
+
+        Returns:
+            list[Submission]: the deleted submissions
+        """
+        return [
+            x
+            for shard in self.__get_shards()
+            for x in shard.delete_student_submissions(sid)
+        ]
+
+    def delete_lab_submissions(
+        self, lid: int, pid: int | None = None
+    ) -> list[Submission]:
+        """Deletes all submissions for a lab, or for one of its problems
+
+        Args:
+            lid (int): ID of the lab
+            pid (int | None, optional): ID of the problem. Defaults to all problems.
+
+        Returns:
+            list[Submission]: the deleted submissions
+        """
+        shard = self.__get_shard(lid)
+        if shard is None:
+            return []
+        return shard.delete_lab_submissions(lid, pid)
@@ -1,5 +1,12 @@
 from __future__ import annotations
 
+from .journal import Journal
+from .journal import JournalEntry
+from .pagination import Page
+from .pagination import pages
 from .lab_service import LabService
 from .student_service import StudentService
 from .submission_service import SubmissionService
+from .report_service import ReportService
+from .csv_service import CsvService
+from .csv_service import ImportReport
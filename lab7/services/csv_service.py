@@ -0,0 +1,309 @@
+from __future__ import annotations
+
+import csv
+import time
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Callable
+
+from entities import Lab
+from entities import Problem
+from entities import Student
+from entities import Submission
+from entities.lab import parse_deadline
+from helpers.data import open_data
+from services import LabService
+from services import StudentService
+from services import SubmissionService
+
+__all__ = ["ImportReport", "CsvService"]
+
+STUDENT_FIELDS = ["sid", "name", "group"]
+PROBLEM_FIELDS = ["lid", "pid", "description", "deadline"]
+SUBMISSION_FIELDS = ["sid", "lid", "pid", "grade"]
+GRADE_FIELDS = ["sid", "name", "pid", "description", "grade"]
+
+
+@dataclass
+class ImportReport:
+    """Result of a CSV import
+
+    Attributes:
+        rows (int): number of rows read
+        imported (int): number of rows imported
+        errors (list[tuple[int, str]]): line number and message of each rejected row
+        seconds (float): time spent importing
+    """
+
+    rows: int = 0
+    imported: int = 0
+    errors: list[tuple[int, str]] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Returns the number of rows read per second
+
+        Returns:
+            float: rows per second
+        """
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"Imported {self.imported} of {self.rows} rows in {self.seconds:.2f}s "
+            f"({self.throughput:.0f} rows/s), {len(self.errors)} rejected"
+        )
+
+
+class CsvService:
+    """Streaming CSV import and export for students, labs and submissions."""
+
+    def __init__(
+        self,
+        lab_service: LabService,
+        student_service: StudentService,
+        submission_service: SubmissionService,
+        chunk_size: int = 10_000,
+    ) -> None:
+        """Initialize the CSV service.
+
+        Args:
+            lab_service (LabService): lab service
+            student_service (StudentService): student service
+            submission_service (SubmissionService): submission service
+            chunk_size (int, optional): number of rows validated and added at once. Defaults to 10000.
+        """
+        self.lab_service = lab_service
+        self.student_service = student_service
+        self.submission_service = submission_service
+        self.chunk_size = chunk_size
+
+    def __import(
+        self,
+        filename: str,
+        fields: list[str],
+        parse_row: Callable[[dict, set], Any],
+        add_chunk: Callable[[list], object],
+    ) -> ImportReport:
+        """Internal: reads a CSV file in chunks, validating each row
+
+        Args:
+            filename (str): name of the file
+            fields (list[str]): required columns
+            parse_row (Callable[[dict, set], Any]): builds the entity for a row,
+                raising ValueError for invalid rows. The set holds the keys
+                already used in the current chunk.
+            add_chunk (Callable[[list], object]): adds a chunk of entities
+
+        Returns:
+            ImportReport: import report
+        """
+        report = ImportReport()
+        start = time.perf_counter()
+        with open_data(filename, newline="") as file:
+            reader = csv.DictReader(file)
+            missing = [x for x in fields if x not in (reader.fieldnames or [])]
+            if missing:
+                raise ValueError(f"Missing columns: {', '.join(missing)}")
+            chunk: list = []
+            keys: set = set()
+            for row in reader:
+                report.rows += 1
+                try:
+                    # DictReader fills the fields of a short row with None
+                    empty = [x for x in fields if row[x] is None]
+                    if empty:
+                        raise ValueError(f"Missing fields: {', '.join(empty)}")
+                    chunk.append(parse_row(row, keys))
+                except (ValueError, TypeError) as err:
+                    report.errors.append((reader.line_num, str(err)))
+                if len(chunk) >= self.chunk_size:
+                    add_chunk(chunk)
+                    report.imported += len(chunk)
+                    chunk, keys = [], set()
+            if chunk:
+                add_chunk(chunk)
+                report.imported += len(chunk)
+        report.seconds = time.perf_counter() - start
+        return report
+
+    def import_students(self, filename: str) -> ImportReport:
+        """Imports students from a CSV file with sid, name and group columns
+
+        Args:
+            filename (str): name of the file
+
+        Returns:
+            ImportReport: import report
+        """
+
+        def parse_row(row: dict, keys: set) -> Student:
+            student = Student(int(row["sid"]), row["name"].strip(), int(row["group"]))
+            if not student.name:
+                raise ValueError("Student name is empty")
+            exists = self.student_service.get_student_by_id(student.sid) is not None
+            if exists or student.sid in keys:
+                raise ValueError("Student with the given ID already exists")
+            keys.add(student.sid)
+            return student
+
+        return self.__import(
+            filename,
+            STUDENT_FIELDS,
+            parse_row,
+            self.student_service.add_students,
+        )
+
+    def import_problems(self, filename: str) -> ImportReport:
+        """Imports labs and problems from a CSV file
+
+        The file has lid, pid, description and deadline columns. Missing labs
+        are created, and a row with an empty pid only creates its lab: it is
+        rejected if the lab already exists or an earlier row creates it.
+
+        Args:
+            filename (str): name of the file
+
+        Returns:
+            ImportReport: import report
+        """
+
+        def parse_row(row: dict, keys: set) -> tuple[int, Problem | None]:
+            lid = int(row["lid"])
+            if not row["pid"]:
+                if self.lab_service.get_lab_by_id(lid) is not None or lid in keys:
+                    raise ValueError("Lab with the given ID already exists")
+                keys.add(lid)
+                return lid, None
+            keys.add(lid)
+            problem = Problem(
+                int(row["pid"]),
+                row["description"],
+                parse_deadline(row["deadline"]),
+            )
+            exists = self.lab_service.get_problem_by_ids(lid, problem.pid) is not None
+            if exists or (lid, problem.pid) in keys:
+                raise ValueError("Problem with the given ID already exists")
+            keys.add((lid, problem.pid))
+            return lid, problem
+
+        def add_chunk(chunk: list[tuple[int, Problem | None]]) -> None:
+            lids = dict.fromkeys(
+                lid for lid, _ in chunk if self.lab_service.get_lab_by_id(lid) is None
+            )
+            if lids:
+                self.lab_service.add_labs([Lab(x) for x in lids])
+            self.lab_service.add_problems(
+                [(lid, x) for lid, x in chunk if x is not None],
+            )
+
+        return self.__import(filename, PROBLEM_FIELDS, parse_row, add_chunk)
+
+    def import_submissions(self, filename: str) -> ImportReport:
+        """Imports submissions from a CSV file with sid, lid, pid and grade columns
+
+        An empty grade imports an ungraded submission.
+
+        Args:
+            filename (str): name of the file
+
+        Returns:
+            ImportReport: import report
+        """
+
+        def parse_row(row: dict, keys: set) -> Submission:
+            submission = Submission(
+                int(row["sid"]),
+                int(row["lid"]),
+                int(row["pid"]),
+                float(row["grade"]) if row["grade"] else None,
+            )
+            if self.student_service.get_student_by_id(submission.sid) is None:
+                raise ValueError("Student with the given ID does not exist")
+            if (
+                self.lab_service.get_problem_by_ids(submission.lid, submission.pid)
+                is None
+            ):
+                raise ValueError("Problem with the given ID does not exist")
+            return submission
+
+        return self.__import(
+            filename,
+            SUBMISSION_FIELDS,
+            parse_row,
+            self.submission_service.add_submissions,
+        )
+
+    def export_students(self, filename: str) -> int:
+        """Writes all students to a CSV file
+
+        Args:
+            filename (str): name of the file
+
+        Returns:
+            int: number of rows written
+        """
+        with open_data(filename, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(STUDENT_FIELDS)
+            count = 0
+            for x in self.student_service.get_students():
+                writer.writerow((x.sid, x.name, x.group))
+                count += 1
+        return count
+
+    def export_submissions(self, filename: str) -> int:
+        """Writes all submissions to a CSV file
+
+        Args:
+            filename (str): name of the file
+
+        Returns:
+            int: number of rows written
+        """
+        with open_data(filename, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(SUBMISSION_FIELDS)
+            count = 0
+            for x in self.submission_service.get_submissions():
+                writer.writerow(
+                    (x.sid, x.lid, x.pid, "" if x.grade is None else x.grade)
+                )
+                count += 1
+        return count
+
+    def export_lab_grades(self, lid: int, filename: str) -> int:
+        """Writes the grade sheet of a lab to a CSV file, one row per graded submission
+
+        Args:
+            lid (int): lab ID
+            filename (str): name of the file
+
+        Returns:
+            int: number of rows written
+        """
+        lab = self.lab_service.get_lab_by_id(lid)
+        if lab is None:
+            raise ValueError("Lab with the given ID does not exist")
+        with open_data(filename, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(GRADE_FIELDS)
+            count = 0
+            for x in self.submission_service.get_lab_submissions(lid):
+                if x.grade is None:
+                    continue
+                student = self.student_service.get_student_by_id(x.sid)
+                problem = self.lab_service.get_problem_by_ids(lid, x.pid)
+                writer.writerow(
+                    (
+                        x.sid,
+                        student.name if student else "",
+                        x.pid,
+                        problem.description if problem else "",
+                        x.grade,
+                    ),
+                )
+                count += 1
+        return count
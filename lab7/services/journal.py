@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import contextlib
+import sys
+from collections import deque
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+
+__all__ = ["JournalEntry", "Journal"]
+
+# Approximate size of an entry and its closures, without the entities
+ENTRY_SIZE = 512
+
+
+@dataclass
+class JournalEntry:
+    """Undoable user operation
+
+    Attributes:
+        description (str): description of the operation
+        undo (list[Callable[[], Any]]): inverse operations, run in reverse order
+        redo (list[Callable[[], Any]]): operations, run in order
+        size (int): approximate memory held by the entry in bytes
+    """
+
+    description: str
+    undo: list[Callable[[], Any]] = field(default_factory=list)
+    redo: list[Callable[[], Any]] = field(default_factory=list)
+    size: int = ENTRY_SIZE
+
+
+def estimate_size(objs: Iterable[Any]) -> int:
+    """Approximates the memory held by journaled entities
+
+    Args:
+        objs (Iterable[Any]): entities kept alive by an entry
+
+    Returns:
+        int: size in bytes
+    """
+    return sum(
+        sys.getsizeof(x) + sys.getsizeof(getattr(x, "__dict__", None)) for x in objs
+    )
+
+
+class Journal:
+    """Undo and redo history of the services
+
+    Services record the repository operations which revert and repeat each
+    change, so undoing never copies or re-reads the stored data. The history
+    has no depth limit; the oldest entries are dropped once the entries hold
+    more than the memory budget.
+    """
+
+    def __init__(self, budget: int = 64 * 1024 * 1024) -> None:
+        """Initialize the journal.
+
+        Args:
+            budget (int, optional): memory budget of the entries in bytes, 0 disables the journal. Defaults to 64 MiB.
+        """
+        self.budget = budget
+        self.__undo: deque[JournalEntry] = deque()
+        self.__redo: list[JournalEntry] = []
+        self.__size = 0
+        self.__group: JournalEntry | None = None
+        self.__replaying = False
+
+    @property
+    def size(self) -> int:
+        """Returns the approximate memory held by the entries
+
+        Returns:
+            int: size in bytes
+        """
+        return self.__size
+
+    @property
+    def can_undo(self) -> bool:
+        """Returns whether there is an operation to undo
+
+        Returns:
+            bool: True if undo() would succeed
+        """
+        return bool(self.__undo)
+
+    @property
+    def can_redo(self) -> bool:
+        """Returns whether there is an operation to redo
+
+        Returns:
+            bool: True if redo() would succeed
+        """
+        return bool(self.__redo)
+
+    def record(
+        self,
+        description: str,
+        undo: Callable[[], Any],
+        redo: Callable[[], Any],
+        objs: Iterable[Any] = (),
+    ) -> None:
+        """Records a change, clearing the redo history
+
+        Inside group() the change becomes part of the group's entry.
+
+        Args:
+            description (str): description of the change
+            undo (Callable[[], Any]): reverts the change
+            redo (Callable[[], Any]): repeats the change
+            objs (Iterable[Any], optional): entities kept alive by the change. Defaults to none.
+        """
+        if self.__replaying or not self.budget:
+            return
+        if self.__group is not None:
+            self.__group.undo.append(undo)
+            self.__group.redo.append(redo)
+            self.__group.size += estimate_size(objs)
+            return
+        size = ENTRY_SIZE + estimate_size(objs)
+        self.__push(JournalEntry(description, [undo], [redo], size))
+
+    @contextlib.contextmanager
+    def group(self, description: str) -> Iterator[None]:
+        """Records the changes made inside the block as one entry
+
+        Nested groups join the outermost one. Changes made before an
+        exception are still recorded, so they can be undone.
+
+        Args:
+            description (str): description of the operation
+        """
+        if self.__group is not None or self.__replaying or not self.budget:
+            yield
+            return
+        self.__group = JournalEntry(description)
+        try:
+            yield
+        finally:
+            entry, self.__group = self.__group, None
+            if entry.undo:
+                self.__push(entry)
+
+    def __push(self, entry: JournalEntry) -> None:
+        """Internal: adds an entry, dropping the redo history and the oldest entries over budget
+
+        Args:
+            entry (JournalEntry): entry to add
+        """
+        self.__size -= sum(x.size for x in self.__redo)
+        self.__redo.clear()
+        self.__undo.append(entry)
+        self.__size += entry.size
+        while self.__size > self.budget and self.__undo:
+            self.__size -= self.__undo.popleft().size
+
+    def undo(self) -> str:
+        """Reverts the last operation
+
+        Returns:
+            str: description of the reverted operation
+        """
+        if not self.__undo:
+            raise ValueError("Nothing to undo")
+        entry = self.__undo.pop()
+        self.__replay(reversed(entry.undo))
+        self.__redo.append(entry)
+        return entry.description
+
+    def redo(self) -> str:
+        """Repeats the last reverted operation
+
+        Returns:
+            str: description of the repeated operation
+        """
+        if not self.__redo:
+            raise ValueError("Nothing to redo")
+        entry = self.__redo.pop()
+        self.__replay(entry.redo)
+        self.__undo.append(entry)
+        return entry.description
+
+    def __replay(self, operations: Iterable[Callable[[], Any]]) -> None:
+        """Internal: runs operations without recording them
+
+        Args:
+            operations (Iterable[Callable[[], Any]]): operations to run
+        """
+        self.__replaying = True
+        try:
+            for operation in operations:
+                operation()
+        finally:
+            self.__replaying = False
+
+    def clear(self) -> None:
+        """Drops the whole history."""
+        self.__undo.clear()
+        self.__redo.clear()
+        self.__size = 0
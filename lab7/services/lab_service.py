@@ -1,20 +1,33 @@
 from __future__ import annotations
 
+import functools
+from typing import Callable
+from typing import Iterable
+
 from entities import Lab
 from entities import Problem
 from repository import LabRepository
+from services.journal import Journal
+from services.pagination import Page
 
 
 class LabService:
     """Service for lab operations."""
 
-    def __init__(self, lab_repository: LabRepository) -> None:
+    def __init__(
+        self,
+        lab_repository: LabRepository,
+        journal: Journal | None = None,
+    ) -> None:
         """Initialize the lab service.
 
         Args:
             lab_repository (LabRepository): lab repository
+            journal (Journal | None, optional): undo history, shared with the other services. Defaults to none.
         """
         self.__repository = lab_repository
+        self.__delete_hooks: list[Callable[[int, int | None], None]] = []
+        self.journal = journal if journal is not None else Journal(budget=0)
 
     @property
     def lab_count(self) -> int:
@@ -34,6 +47,28 @@ class LabService:
         """
         return self.__repository.problem_count
 
+    def snapshot(self, journal: Journal | None = None) -> LabService:
+        """Returns a service over a point-in-time copy of the labs
+
+        Args:
+            journal (Journal | None, optional): undo history of the copy. Defaults to none.
+
+        Returns:
+            LabService: service over the snapshot
+        """
+        return LabService(self.__repository.snapshot(), journal)
+
+    def add_delete_hook(self, hook: Callable[[int, int | None], None]) -> None:
+        """Registers a function called before a lab or a problem is deleted
+
+        The hook gets the lab ID and the problem ID, or None when the whole
+        lab is deleted. Raising ValueError from the hook cancels the deletion.
+
+        Args:
+            hook (Callable[[int, int | None], None]): function to be called
+        """
+        self.__delete_hooks.append(hook)
+
     def load_json(self, obj: list) -> None:
         """Loads data from a JSON object
 
@@ -41,6 +76,7 @@ class LabService:
             obj (list): list of data
         """
         self.__repository.load_json(obj)
+        self.journal.clear()
 
     def get_labs(self) -> list[Lab]:
         """Returns a list of all labs
@@ -50,6 +86,18 @@ class LabService:
         """
         return self.__repository.get_labs()
 
+    def list_labs(self, cursor: int | None = None, limit: int = 20) -> Page:
+        """Returns a page of labs in ID order
+
+        Args:
+            cursor (int | None, optional): cursor of the previous page. Defaults to the first page.
+            limit (int, optional): maximum number of labs. Defaults to 20.
+
+        Returns:
+            Page: page of labs
+        """
+        return Page(*self.__repository.get_labs_page(cursor, limit))
+
     def get_lab_by_id(self, lid: int) -> Lab | None:
         """Returns a lab with the given ID
 
@@ -70,7 +118,32 @@ class LabService:
         Returns:
             Lab: the added lab
         """
-        return self.__repository.add_lab(obj)
+        lab = self.__repository.add_lab(obj)
+        self.journal.record(
+            f"Add lab {lab.lid}",
+            functools.partial(self.__repository.delete_lab, lab),
+            functools.partial(self.__repository.add_lab, lab),
+            [lab, *lab.problems],
+        )
+        return lab
+
+    def add_labs(self, objs: Iterable[Lab | dict]) -> list[Lab]:
+        """Adds several labs at once, either all of them or none
+
+        Args:
+            objs (Iterable[Lab | dict]): lab data
+
+        Returns:
+            list[Lab]: the added labs
+        """
+        labs = self.__repository.add_labs(objs)
+        self.journal.record(
+            f"Add {len(labs)} labs",
+            functools.partial(self.__repository.delete_labs, labs),
+            functools.partial(self.__repository.add_labs, labs),
+            [x for lab in labs for x in (lab, *lab.problems)],
+        )
+        return labs
 
     def delete_lab(self, obj: Lab | dict) -> None:
         """Deletes a lab from the list
@@ -78,7 +151,19 @@ class LabService:
         Args:
             obj (Lab | dict): lab data
         """
-        self.__repository.delete_lab(obj)
+        lab = self.get_lab_by_id(Lab.from_type(obj).lid)
+        if lab is None:
+            raise ValueError("Lab with the given ID does not exist")
+        with self.journal.group(f"Delete lab {lab.lid}"):
+            for hook in self.__delete_hooks:
+                hook(lab.lid, None)
+            self.__repository.delete_lab(lab)
+            self.journal.record(
+                f"Delete lab {lab.lid}",
+                functools.partial(self.__repository.add_lab, lab),
+                functools.partial(self.__repository.delete_lab, lab),
+                [lab, *lab.problems],
+            )
 
     def delete_lab_by_id(self, lid: int) -> None:
         """Deletes a lab from the list
@@ -86,7 +171,10 @@ class LabService:
         Args:
             lid (int): ID of the lab
         """
-        self.__repository.delete_lab(self.get_lab_by_id(lid))
+        lab = self.get_lab_by_id(lid)
+        if lab is None:
+            raise ValueError("Lab with the given ID does not exist")
+        self.delete_lab(lab)
 
     def get_problems(self) -> list[Problem]:
         """Returns a list of all problems
@@ -117,7 +205,44 @@ class LabService:
         Returns:
             Problem: the added problem
         """
-        return self.__repository.add_problem(lid, obj)
+        problem = self.__repository.add_problem(lid, obj)
+        self.journal.record(
+            f"Add problem {lid}.{problem.pid}",
+            functools.partial(
+                self.__repository.delete_problem_by_ids,
+                lid,
+                problem.pid,
+            ),
+            functools.partial(self.__repository.add_problem, lid, problem),
+            [problem],
+        )
+        return problem
+
+    def add_problems(
+        self,
+        objs: Iterable[tuple[int, Problem | dict]],
+    ) -> list[Problem]:
+        """Adds several problems at once, either all of them or none
+
+        Args:
+            objs (Iterable[tuple[int, Problem | dict]]): pairs of lab ID and problem data
+
+        Returns:
+            list[Problem]: the added problems
+        """
+        pairs = list(objs)
+        problems = self.__repository.add_problems(pairs)
+        added = [(lid, x) for (lid, _), x in zip(pairs, problems)]
+        self.journal.record(
+            f"Add {len(problems)} problems",
+            functools.partial(
+                self.__repository.delete_problems,
+                [(lid, x.pid) for lid, x in added],
+            ),
+            functools.partial(self.__repository.add_problems, added),
+            problems,
+        )
+        return problems
 
     def search_problem_by_description(self, description: str) -> list[Problem]:
         """Searches for a problem by description
@@ -137,4 +262,18 @@ class LabService:
             lid (int): lab ID
             pid (int): problem ID
         """
-        self.__repository.delete_problem_by_ids(lid, pid)
+        problem = self.get_problem_by_ids(lid, pid)
+        if problem is None:
+            raise ValueError("Problem with the given ID does not exist")
+        with self.journal.group(f"Delete problem {lid}.{pid}"):
+            for hook in self.__delete_hooks:
+                hook(lid, pid)
+            index = self.__repository.delete_problem_by_ids(lid, pid)
+            self.journal.record(
+                f"Delete problem {lid}.{pid}",
+                functools.partial(
+                    self.__repository.insert_problem, lid, index, problem
+                ),
+                functools.partial(self.__repository.delete_problem_by_ids, lid, pid),
+                [problem],
+            )
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+from typing import Callable
+from typing import Iterator
+
+__all__ = ["Page", "pages"]
+
+
+@dataclass
+class Page:
+    """Page of a listing
+
+    Attributes:
+        items (list): entities on the page
+        cursor (Any | None): cursor of the next page, None after the last page
+    """
+
+    items: list
+    cursor: Any | None = None
+
+    @property
+    def has_next(self) -> bool:
+        """Returns whether there is a next page
+
+        Returns:
+            bool: True if there is a next page
+        """
+        return self.cursor is not None
+
+    def __str__(self) -> str:
+        return "\n".join(str(x) for x in self.items)
+
+
+def pages(fetch: Callable[[Any | None], Page]) -> Iterator[Page]:
+    """Yields the pages of a listing, fetching each one when it is needed
+
+    Args:
+        fetch (Callable[[Any | None], Page]): returns the page after a cursor
+
+    Yields:
+        Page: pages of the listing
+    """
+    page = fetch(None)
+    yield page
+    while page.has_next:
+        page = fetch(page.cursor)
+        yield page
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from services import SubmissionService
+from services.reports import write_lab_report
+
+__all__ = ["ReportService"]
+
+
+class ReportService:
+    """Writes the grade sheets of all labs, one file per lab."""
+
+    def __init__(
+        self,
+        submission_service: SubmissionService,
+        workers: int | None = None,
+    ) -> None:
+        """Initialize the report service.
+
+        Args:
+            submission_service (SubmissionService): submission service
+            workers (int | None, optional): number of worker processes, 1 writes in this process. Defaults to the number of CPUs.
+        """
+        self.submission_service = submission_service
+        self.workers = workers
+
+    @staticmethod
+    def partition(
+        submission_service: SubmissionService,
+    ) -> dict[int, list[tuple[str, str, float]]]:
+        """Groups the graded submissions by lab in a single pass
+
+        Every lab gets an entry, including the labs without grades. Like
+        SubmissionService.get_lab_grade_rows, submissions whose student or
+        problem no longer exists are skipped.
+
+        Args:
+            submission_service (SubmissionService): service to read the submissions from
+
+        Returns:
+            dict[int, list[tuple[str, str, float]]]: student name, problem description and grade of each graded submission, by lab ID
+        """
+        lab_service = submission_service.lab_service
+        student_service = submission_service.student_service
+        parts: dict[int, list[tuple[str, str, float]]] = {
+            lab.lid: [] for lab in lab_service.get_labs()
+        }
+        for x in submission_service.get_submissions():
+            if x.grade is None or x.lid not in parts:
+                continue
+            student = student_service.get_student_by_id(x.sid)
+            problem = lab_service.get_problem_by_ids(x.lid, x.pid)
+            if student is None or problem is None:
+                continue
+            parts[x.lid].append((student.name, problem.description, x.grade))
+        return parts
+
+    def write_lab_reports(
+        self,
+        directory: str,
+        extension: str = ".txt",
+    ) -> dict[int, str]:
+        """Writes the grade sheet of every lab to its own file
+
+        The reports are built from a snapshot, so grading can go on while
+        they are written. The files are named lab_<lid><extension>; a
+        compressed extension such as ".txt.gz" compresses them.
+
+        Args:
+            directory (str): directory of the reports
+            extension (str, optional): file extension. Defaults to ".txt".
+
+        Returns:
+            dict[int, str]: file name by lab ID
+        """
+        parts = self.partition(self.submission_service.snapshot())
+        os.makedirs(directory, exist_ok=True)
+        files = {lid: os.path.join(directory, f"lab_{lid}{extension}") for lid in parts}
+        lids = list(parts)
+        args = ([parts[x] for x in lids], [files[x] for x in lids])
+        workers = self.workers or os.cpu_count() or 1
+        if workers == 1 or len(lids) < 2:
+            for lid, rows, filename in zip(lids, *args):
+                write_lab_report(lid, rows, filename)
+            return files
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunksize = max(1, len(lids) // (workers * 4))
+            list(pool.map(write_lab_report, lids, *args, chunksize=chunksize))
+        return files
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from helpers.data import open_data
+
+__all__ = ["format_lab_grades", "write_lab_report"]
+
+
+def format_lab_grades(lid: int, rows: list[tuple[str, str, float]]) -> str:
+    """Formats the grade sheet of a lab
+
+    Rows are sorted by student name, then grade. The sort is stable, so
+    equal rows keep the order of the submissions.
+
+    Args:
+        lid (int): lab ID
+        rows (list[tuple[str, str, float]]): student name, problem description and grade of each graded submission
+
+    Returns:
+        str: grade sheet
+    """
+    res = [f"Lab {lid}"]
+    for name, description, grade in sorted(rows, key=lambda x: (x[0], x[2])):
+        res.append(f"{name} - {description}, {grade}")
+    return "\n".join(res)
+
+
+def write_lab_report(
+    lid: int,
+    rows: list[tuple[str, str, float]],
+    filename: str,
+) -> int:
+    """Writes the grade sheet of a lab to a file
+
+    Only takes plain data, so it can run in a worker process.
+
+    Args:
+        lid (int): lab ID
+        rows (list[tuple[str, str, float]]): student name, problem description and grade of each graded submission
+        filename (str): name of the file
+
+    Returns:
+        int: number of rows written
+    """
+    with open_data(filename, "w") as file:
+        file.write(format_lab_grades(lid, rows))
+        file.write("\n")
+    return len(rows)
@@ -1,15 +1,33 @@
 from __future__ import annotations
 
+import functools
+from typing import Any
+from typing import Callable
+from typing import Iterable
+
 from entities import Student
 from repository import StudentRepository
+from services.journal import Journal
+from services.pagination import Page
 
 
 class StudentService:
     """Student service class."""
 
-    def __init__(self, student_repository: StudentRepository) -> None:
-        """Initialize the student service."""
+    def __init__(
+        self,
+        student_repository: StudentRepository,
+        journal: Journal | None = None,
+    ) -> None:
+        """Initialize the student service.
+
+        Args:
+            student_repository (StudentRepository): student repository
+            journal (Journal | None, optional): undo history, shared with the other services. Defaults to none.
+        """
         self.__repository = student_repository
+        self.__delete_hooks: list[Callable[[int], None]] = []
+        self.journal = journal if journal is not None else Journal(budget=0)
 
     @property
     def student_count(self) -> int:
@@ -20,6 +38,27 @@ class StudentService:
         """
         return self.__repository.student_count
 
+    def snapshot(self, journal: Journal | None = None) -> StudentService:
+        """Returns a service over a point-in-time copy of the students
+
+        Args:
+            journal (Journal | None, optional): undo history of the copy. Defaults to none.
+
+        Returns:
+            StudentService: service over the snapshot
+        """
+        return StudentService(self.__repository.snapshot(), journal)
+
+    def add_delete_hook(self, hook: Callable[[int], None]) -> None:
+        """Registers a function called with the student ID before a deletion
+
+        Raising ValueError from the hook cancels the deletion.
+
+        Args:
+            hook (Callable[[int], None]): function to be called
+        """
+        self.__delete_hooks.append(hook)
+
     def load_json(self, obj: list) -> None:
         """Loads data from a JSON object
 
@@ -27,6 +66,7 @@ class StudentService:
             obj (list): list of data
         """
         self.__repository.load_json(obj)
+        self.journal.clear()
 
     def get_students(self) -> list[Student]:
         """Returns a list of all students
@@ -47,6 +87,28 @@ class StudentService:
         """
         return self.__repository.get_student_by_id(sid)
 
+    def list_students(
+        self,
+        cursor: Any | None = None,
+        limit: int = 20,
+        sort: str = "sid",
+        group: int | None = None,
+    ) -> Page:
+        """Returns a page of students
+
+        Args:
+            cursor (Any | None, optional): cursor of the previous page. Defaults to the first page.
+            limit (int, optional): maximum number of students. Defaults to 20.
+            sort (str, optional): sort key, one of "sid", "name" and "group". Defaults to "sid".
+            group (int | None, optional): only list the students of this group. Defaults to all groups.
+
+        Returns:
+            Page: page of students
+        """
+        return Page(
+            *self.__repository.get_students_page(cursor, limit, sort, group),
+        )
+
     def search_student_by_group(self, group: int) -> list[Student]:
         """Returns a list of students in the given group
 
@@ -67,7 +129,7 @@ class StudentService:
         Returns:
             students (list[Student]): list of students with the given name
         """
-        return [x for x in self.get_students() if x.name == name]
+        return self.__repository.search_student_by_name(name)
 
     def add_student(self, obj: Student | dict) -> Student:
         """Adds a student to the list
@@ -78,7 +140,32 @@ class StudentService:
         Returns:
             Student: the added student
         """
-        self.__repository.add_student(obj)
+        student = self.__repository.add_student(obj)
+        self.journal.record(
+            f"Add student {student.sid}",
+            functools.partial(self.__repository.delete_student, student),
+            functools.partial(self.__repository.add_student, student),
+            [student],
+        )
+        return student
+
+    def add_students(self, objs: Iterable[Student | dict]) -> list[Student]:
+        """Adds several students at once, either all of them or none
+
+        Args:
+            objs (Iterable[Student | dict]): student data
+
+        Returns:
+            list[Student]: the added students
+        """
+        students = self.__repository.add_students(objs)
+        self.journal.record(
+            f"Add {len(students)} students",
+            functools.partial(self.__repository.delete_students, students),
+            functools.partial(self.__repository.add_students, students),
+            students,
+        )
+        return students
 
     def delete_student_by_id(self, sid: int) -> None:
         """Deletes a student from the list by ID
@@ -86,4 +173,16 @@ class StudentService:
         Args:
             sid (int): student ID
         """
-        self.__repository.delete_student(self.get_student_by_id(sid))
+        student = self.get_student_by_id(sid)
+        if student is None:
+            raise ValueError("Student with the given ID does not exist")
+        with self.journal.group(f"Delete student {sid}"):
+            for hook in self.__delete_hooks:
+                hook(sid)
+            self.__repository.delete_student(student)
+            self.journal.record(
+                f"Delete student {sid}",
+                functools.partial(self.__repository.add_student, student),
+                functools.partial(self.__repository.delete_student, student),
+                [student],
+            )
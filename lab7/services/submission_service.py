@@ -1,13 +1,17 @@
 from __future__ import annotations
 
+import functools
 from statistics import mean
 from statistics import StatisticsError
+from typing import Iterable
 
 from entities import Student
 from entities import Submission
 from repository import SubmissionRepository
 from services import LabService
 from services import StudentService
+from services.journal import Journal
+from services.reports import format_lab_grades
 
 
 class SubmissionService:
@@ -16,11 +20,81 @@ class SubmissionService:
         submission_repository: SubmissionRepository,
         lab_service: LabService,
         student_service: StudentService,
+        cascade: bool = True,
+        journal: Journal | None = None,
     ) -> None:
-        """Initialize the submission service."""
+        """Initialize the submission service.
+
+        Args:
+            submission_repository (SubmissionRepository): submission repository
+            lab_service (LabService): lab service
+            student_service (StudentService): student service
+            cascade (bool, optional): whether deleting a student, lab or problem
+                also deletes its submissions. Otherwise the deletion is rejected
+                while submissions exist. Defaults to True.
+            journal (Journal | None, optional): undo history, which the lab and
+                student services must share, so cascaded deletions are undone
+                together. Defaults to the lab service's.
+        """
         self.__repository = submission_repository
         self.lab_service = lab_service
         self.student_service = student_service
+        self.cascade = cascade
+        self.journal = journal if journal is not None else lab_service.journal
+        if (
+            lab_service.journal is not self.journal
+            or student_service.journal is not self.journal
+        ):
+            raise ValueError("The services must share a journal")
+        student_service.add_delete_hook(self.__on_student_delete)
+        lab_service.add_delete_hook(self.__on_lab_delete)
+
+    def __on_student_delete(self, sid: int) -> None:
+        """Internal: deletes or protects the submissions of a deleted student
+
+        Args:
+            sid (int): student ID
+        """
+        if self.cascade:
+            self.__record_delete(
+                f"Delete submissions of student {sid}",
+                self.__repository.delete_student_submissions(sid),
+            )
+        elif self.__repository.get_student_submissions(sid):
+            raise ValueError("Student has submissions")
+
+    def __on_lab_delete(self, lid: int, pid: int | None) -> None:
+        """Internal: deletes or protects the submissions of a deleted lab or problem
+
+        Args:
+            lid (int): lab ID
+            pid (int | None): problem ID, None if the whole lab is deleted
+        """
+        if self.cascade:
+            self.__record_delete(
+                f"Delete submissions of lab {lid}",
+                self.__repository.delete_lab_submissions(lid, pid),
+            )
+        elif any(
+            pid is None or x.pid == pid
+            for x in self.__repository.get_lab_submissions(lid)
+        ):
+            raise ValueError("Lab has submissions")
+
+    def __record_delete(self, description: str, submissions: list[Submission]) -> None:
+        """Internal: records deleted submissions in the journal
+
+        Args:
+            description (str): description of the change
+            submissions (list[Submission]): the deleted submissions
+        """
+        if submissions:
+            self.journal.record(
+                description,
+                functools.partial(self.__repository.add_submissions, submissions),
+                functools.partial(self.__repository.delete_submissions, submissions),
+                submissions,
+            )
 
     @property
     def submission_count(self) -> int:
@@ -31,6 +105,24 @@ class SubmissionService:
         """
         return self.__repository.submission_count
 
+    def snapshot(self) -> SubmissionService:
+        """Returns a service over point-in-time copies of all three repositories
+
+        Reports can query the copy while the live repositories keep changing.
+        Each repository is copied atomically, but not together with the
+        others, so take the snapshot between changes that span repositories.
+
+        Returns:
+            SubmissionService: service over the snapshots
+        """
+        journal = Journal(budget=0)
+        return SubmissionService(
+            self.__repository.snapshot(),
+            self.lab_service.snapshot(journal),
+            self.student_service.snapshot(journal),
+            self.cascade,
+        )
+
     def load_json(self, obj: list) -> None:
         """Loads data from a JSON object
 
@@ -38,6 +130,7 @@ class SubmissionService:
             obj (list): list of data
         """
         self.__repository.load_json(obj)
+        self.journal.clear()
 
     def get_submissions(self) -> list[Submission]:
         """Returns a list of all submissions
@@ -59,14 +152,43 @@ class SubmissionService:
         if submission is None:
             raise ValueError("Submission does not exist")
         self.__repository.delete_submission(submission)
+        self.__record_delete(f"Delete submission {sid}.{lid}.{pid}", [submission])
 
-    def add_submission(self, obj: Submission | dict) -> None:
+    def add_submission(self, obj: Submission | dict) -> Submission:
         """Adds a submission
 
         Args:
             obj (Submission | dict): submission to add
+
+        Returns:
+            Submission: the added submission
+        """
+        submission = self.__repository.add_submission(obj)
+        self.journal.record(
+            f"Add submission {submission.sid}.{submission.lid}.{submission.pid}",
+            functools.partial(self.__repository.delete_submission, submission),
+            functools.partial(self.__repository.add_submission, submission),
+            [submission],
+        )
+        return submission
+
+    def add_submissions(self, objs: Iterable[Submission | dict]) -> list[Submission]:
+        """Adds several submissions at once
+
+        Args:
+            objs (Iterable[Submission | dict]): submissions to add
+
+        Returns:
+            list[Submission]: the added submissions
         """
-        self.__repository.add_submission(obj)
+        submissions = self.__repository.add_submissions(objs)
+        self.journal.record(
+            f"Add {len(submissions)} submissions",
+            functools.partial(self.__repository.delete_submissions, submissions),
+            functools.partial(self.__repository.add_submissions, submissions),
+            submissions,
+        )
+        return submissions
 
     def get_submission(self, sid: int, lid: int, pid: int) -> Submission | None:
         """Returns a submission with the given student and lab IDs
@@ -79,14 +201,7 @@ class SubmissionService:
         Returns:
             submission (Submission): Submission with the given student and lab IDs
         """
-        for submission in self.get_submissions():
-            if (
-                submission.sid == sid
-                and submission.lid == lid
-                and submission.pid == pid
-            ):
-                return submission
-        return None
+        return self.__repository.get_submission(sid, lid, pid)
 
     def assign_lab_problem(
         self,
@@ -112,25 +227,13 @@ class SubmissionService:
             raise ValueError("Lab with the given ID does not exist")
         if self.lab_service.get_problem_by_ids(lid, pid) is None:
             raise ValueError("Problem with the given ID does not exist")
-        try:
-            self.delete_submission(sid, lid, pid)
-        except ValueError:
-            pass
-
-        self.add_submission(Submission(sid, lid, pid, grade))
-        return self.get_submissions()[-1]
+        with self.journal.group(f"Assign problem {lid}.{pid} to student {sid}"):
+            try:
+                self.delete_submission(sid, lid, pid)
+            except ValueError:
+                pass
 
-    def __get_student_submission_pairs(self) -> list[tuple[Student, Submission]]:
-        """Returns a list of tuples of students and their submissions
-
-        Returns:
-            list[tuple[Student, Submission]]: list of tuples of students and their submissions
-        """
-        return [
-            (self.student_service.get_student_by_id(x.sid), x)
-            for x in self.get_submissions()
-            if x.grade is not None
-        ]
+            return self.add_submission(Submission(sid, lid, pid, grade))
 
     def get_lab_submissions(self, lid: int) -> list[Submission]:
         """Returns a list of submissions for the given lab
@@ -141,7 +244,41 @@ class SubmissionService:
         Returns:
             submissions (list[Submission]): list of submissions for the given lab
         """
-        return [x for x in self.get_submissions() if x.lid == lid]
+        return self.__repository.get_lab_submissions(lid)
+
+    def get_student_submissions(self, sid: int) -> list[Submission]:
+        """Returns a list of submissions for the given student
+
+        Args:
+            sid (int): ID of the student
+
+        Returns:
+            submissions (list[Submission]): list of submissions for the given student
+        """
+        return self.__repository.get_student_submissions(sid)
+
+    def get_lab_grade_rows(self, lid: int) -> list[tuple[str, str, float]]:
+        """Returns the graded submissions of a lab, in submission order
+
+        Submissions whose student or problem no longer exists, such as the ones
+        left by reloading the students, are skipped.
+
+        Args:
+            lid (int): lab ID
+
+        Returns:
+            list[tuple[str, str, float]]: student name, problem description and grade of each graded submission
+        """
+        rows = []
+        for x in self.get_lab_submissions(lid):
+            if x.grade is None:
+                continue
+            student = self.student_service.get_student_by_id(x.sid)
+            problem = self.lab_service.get_problem_by_ids(lid, x.pid)
+            if student is None or problem is None:
+                continue
+            rows.append((student.name, problem.description, x.grade))
+        return rows
 
     def get_lab_grades_str(self, lid: int) -> str:
         """Returns a string with the grades of a lab
@@ -152,19 +289,9 @@ class SubmissionService:
         Returns:
             grades (str): string with the grades of a lab
         """
-        lab = self.lab_service.get_lab_by_id(lid)
-        res = [f"Lab {lab.lid}"]
-        for x in sorted(
-            self.__get_student_submission_pairs(),
-            key=lambda x: (x[0].name, x[1].grade),
-        ):
-            student, submission = x
-            if submission.lid == lid:
-                problem = lab.get_problem_by_id(submission.pid)
-                res.append(
-                    f"{student.name} - {problem.description}, {submission.grade}",
-                )
-        return "\n".join(res)
+        if self.lab_service.get_lab_by_id(lid) is None:
+            raise ValueError("Lab with the given ID does not exist")
+        return format_lab_grades(lid, self.get_lab_grade_rows(lid))
 
     def get_student_average(self, sid: int) -> float:
         """Returns the average grade of a student
@@ -179,8 +306,8 @@ class SubmissionService:
             return mean(
                 [
                     x.grade
-                    for x in self.__repository.get_submissions()
-                    if x.sid == sid and x.grade is not None
+                    for x in self.__repository.get_student_submissions(sid)
+                    if x.grade is not None
                 ],
             )
         except StatisticsError:
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import csv
+
+import pytest
+from repository import LabRepository
+from repository import StudentRepository
+from repository import SubmissionRepository
+from services import CsvService
+from services import Journal
+from services import LabService
+from services import StudentService
+from services import SubmissionService
+
+
+@pytest.fixture
+def csv_service() -> CsvService:
+    """Returns a CSV service over empty repositories"""
+    journal = Journal()
+    lab_service = LabService(LabRepository(), journal)
+    student_service = StudentService(StudentRepository(), journal)
+    submission_service = SubmissionService(
+        SubmissionRepository(),
+        lab_service,
+        student_service,
+    )
+    return CsvService(lab_service, student_service, submission_service, chunk_size=2)
+
+
+def write_csv(path, rows: list[list]) -> str:
+    """Writes rows to a CSV file and returns its name"""
+    with open(path, "w", newline="") as f:
+        csv.writer(f).writerows(rows)
+    return str(path)
+
+
+def test_import_students(tmp_path, csv_service):
+    """
+    +-------------------------+--------+
+    |          Input          | Output |
+    +-------------------------+--------+
+    | report.imported         |      3 |
+    | len(report.errors)      |      3 |
+    +-------------------------+--------+
+    """
+    filename = write_csv(
+        tmp_path / "students.csv",
+        [
+            ["sid", "name", "group"],
+            [1, "John", 311],
+            [2, "Mary", 311],
+            [2, "Mary", 312],
+            [3, "", 312],
+            ["x", "Ann", 313],
+            [4, "Bob", 313],
+        ],
+    )
+    report = csv_service.import_students(filename)
+    assert report.rows == 6
+    assert report.imported == 3
+    assert [x[0] for x in report.errors] == [4, 5, 6]
+    assert report.throughput > 0
+    assert csv_service.student_service.student_count == 3
+    with pytest.raises(ValueError):
+        csv_service.import_students(write_csv(tmp_path / "bad.csv", [["sid"]]))
+
+
+def test_import_and_export_grades(tmp_path, csv_service):
+    """
+    +----------------------------------+--------+
+    |              Input               | Output |
+    +----------------------------------+--------+
+    | lab_service.problem_count        |      3 |
+    | export_lab_grades(1) rows        |      2 |
+    +----------------------------------+--------+
+    """
+    csv_service.student_service.add_students(
+        [
+            {"sid": 1, "name": "John", "group": 311},
+            {"sid": 2, "name": "Mary", "group": 311},
+        ],
+    )
+    problems = write_csv(
+        tmp_path / "problems.csv",
+        [
+            ["lid", "pid", "description", "deadline"],
+            [1, 1, "Numere", "2022-10-20T00:00:00"],
+            [1, 2, "Cifre", "2022-10-20T00:00:00"],
+            [2, 1, "Liste", "2022-10-27T00:00:00"],
+            [3, "", "", ""],
+            [2, 2, "Siruri", "next week"],
+        ],
+    )
+    report = csv_service.import_problems(problems)
+    assert report.imported == 4
+    assert [x[0] for x in report.errors] == [6]
+    assert csv_service.lab_service.lab_count == 3
+    assert csv_service.lab_service.problem_count == 3
+
+    submissions = write_csv(
+        tmp_path / "submissions.csv",
+        [
+            ["sid", "lid", "pid", "grade"],
+            [1, 1, 1, 10],
+            [2, 1, 2, 9],
+            [2, 1, 1, ""],
+            [3, 1, 1, 5],
+            [1, 3, 1, 5],
+        ],
+    )
+    report = csv_service.import_submissions(submissions)
+    assert report.imported == 3
+    assert len(report.errors) == 2
+
+    assert csv_service.export_lab_grades(1, str(tmp_path / "lab1.csv.gz")) == 2
+    with pytest.raises(ValueError):
+        csv_service.export_lab_grades(4, str(tmp_path / "lab4.csv"))
+    assert csv_service.export_submissions(str(tmp_path / "out.csv")) == 3
+    assert csv_service.export_students(str(tmp_path / "students.csv")) == 2
+    report = csv_service.import_submissions(str(tmp_path / "out.csv"))
+    assert report.imported == 3
+
+
+def test_import_short_rows(tmp_path, csv_service):
+    """
+    +-------------------------------+------------------------+
+    |             Input             |         Output         |
+    +-------------------------------+------------------------+
+    | rows with missing fields      | rejected, others added |
+    +-------------------------------+------------------------+
+    """
+    students = tmp_path / "students.csv"
+    students.write_text("sid,name,group\n1,Ana,5\n2\n3,Bob\n4,Dan,6\n")
+    report = csv_service.import_students(str(students))
+    assert report.imported == 2
+    assert [x[0] for x in report.errors] == [3, 4]
+    problems = tmp_path / "problems.csv"
+    problems.write_text("lid,pid,description,deadline\n1,1,a,2022-10-20\n1,2\n")
+    report = csv_service.import_problems(str(problems))
+    assert report.imported == 1
+    assert [x[0] for x in report.errors] == [3]
+    submissions = tmp_path / "submissions.csv"
+    submissions.write_text("sid,lid,pid,grade\n1,1,1,10\n1,1\n")
+    report = csv_service.import_submissions(str(submissions))
+    assert report.imported == 1
+    assert [x[0] for x in report.errors] == [3]
+
+
+def test_import_lab_rows(tmp_path, csv_service):
+    """
+    +-------------------------------+--------------------+
+    |             Input             |       Output       |
+    +-------------------------------+--------------------+
+    | three 1,,, rows               | 1 imported         |
+    | 2,,, after a problem of lab 2 | rejected           |
+    +-------------------------------+--------------------+
+    """
+    filename = write_csv(
+        tmp_path / "labs.csv",
+        [
+            ["lid", "pid", "description", "deadline"],
+            [1, "", "", ""],
+            [1, "", "", ""],
+            [1, "", "", ""],
+            [2, 1, "Liste", "2022-10-27T00:00:00"],
+            [2, "", "", ""],
+        ],
+    )
+    report = csv_service.import_problems(filename)
+    assert report.imported == 2
+    assert [x[0] for x in report.errors] == [3, 4, 6]
+    assert csv_service.lab_service.lab_count == 2
+    report = csv_service.import_problems(filename)
+    assert report.imported == 0
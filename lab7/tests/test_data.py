@@ -1,9 +1,18 @@
 from __future__ import annotations
 
+import dataclasses
 import datetime
+import io
+import json
 
 import pytest
+from entities import Lab
+from entities import Student
+from entities import Submission
 from helpers import data
+from helpers import serialization
+from helpers import strings
+from helpers import synthetic
 
 
 def test_load_sample():
@@ -17,3 +26,112 @@ def test_json_encoder():
     encoder.default(datetime.datetime.now()) is not None
     with pytest.raises(TypeError):
         encoder.default(None)
+
+
+def test_format_datetime():
+    """Test format_datetime function."""
+    value = datetime.datetime(2021, 1, 1, 12)
+    assert data.format_datetime(value) == "2021-01-01T12:00:00"
+    assert data.format_datetime(value, epoch=True) == 1609502400
+    assert data.format_datetime(datetime.date(2021, 1, 1), epoch=True) == 1609459200
+    aware = datetime.datetime(
+        2021, 1, 1, 14, tzinfo=datetime.timezone(datetime.timedelta(hours=2))
+    )
+    assert data.format_datetime(aware, epoch=True) == 1609502400
+    encoder = data.DateTimeEncoder(epoch=True)
+    assert encoder.encode({"deadline": value}) == '{"deadline": 1609502400}'
+
+
+@pytest.mark.parametrize("ext", [".json", ".json.gz", ".json.bz2", ".json.xz"])
+def test_open_data(tmp_path, ext):
+    """Test open_data function."""
+    filename = str(tmp_path / f"data{ext}")
+    with data.open_data(filename, "w") as f:
+        json.dump([{"sid": 1}], f)
+    with data.open_data(filename) as f:
+        assert json.load(f) == [{"sid": 1}]
+    with open(filename, "rb") as f:
+        assert (f.read(1) == b"[") == (ext == ".json")
+
+
+def test_synthetic_generate():
+    """Test synthetic.generate function."""
+    sample = synthetic.generate(students=20, labs=3, problems=4, submissions=50, seed=1)
+    assert len(sample["students"]) == 20
+    assert len(sample["labs"]) == 3
+    assert all(len(x["problems"]) == 4 for x in sample["labs"])
+    assert len(sample["submissions"]) == 50
+    assert all(
+        x["grade"] is None or 1 <= x["grade"] <= 10 for x in sample["submissions"]
+    )
+    assert sample == synthetic.generate(
+        students=20,
+        labs=3,
+        problems=4,
+        submissions=50,
+        seed=1,
+    )
+
+
+def test_string_table():
+    """Test StringTable class."""
+    table = strings.StringTable()
+    name = "".join(["Jo", "hn"])
+    assert table.get("John") is None
+    assert table.intern(name) is name
+    assert table.intern("".join(["Jo", "hn"])) is name
+    assert table.get("John") is name
+    assert len(table) == 1
+    table.clear()
+    assert len(table) == 0
+
+
+def test_string_table_prune():
+    """Test StringTable pruning of strings which are no longer used."""
+    table = strings.StringTable(prune_size=4)
+    kept = table.intern("".join(["Jo", "hn"]))
+    table.intern("".join(["Ma", "ry"]))
+    assert table.prune() == 1
+    assert table.get("Mary") is None
+    assert table.get("John") is kept
+
+    for i in range(100):
+        table.intern(f"student {i}")
+    assert len(table) < 10
+    assert table.get("John") is kept
+
+
+@pytest.mark.parametrize("chunk_size", [None, 1, 2, 10])
+@pytest.mark.parametrize("indent", [None, 4])
+def test_serialization_dump(chunk_size, indent):
+    """Test serialization.dump function."""
+    sample = synthetic.generate(students=5, labs=3, problems=2, submissions=7)
+    cases = (
+        ([Lab.from_type(x) for x in sample["labs"]], serialization.lab_to_dict),
+        (
+            [Student.from_type(x) for x in sample["students"]],
+            serialization.student_to_dict,
+        ),
+        (
+            [Submission.from_type(x) for x in sample["submissions"]],
+            serialization.submission_to_dict,
+        ),
+    )
+    for items, to_dict in cases:
+        file = io.StringIO()
+        serialization.dump(items, file, to_dict, indent=indent, chunk_size=chunk_size)
+        expected = json.loads(
+            json.dumps([dataclasses.asdict(x) for x in items], cls=data.DateTimeEncoder)
+        )
+        assert json.loads(file.getvalue()) == expected
+        if chunk_size is not None:
+            whole = io.StringIO()
+            serialization.dump(items, whole, to_dict, indent=indent)
+            assert file.getvalue() == whole.getvalue()
+
+
+def test_serialization_dump_empty():
+    """Test serialization.dump function with no items."""
+    file = io.StringIO()
+    serialization.dump([], file, serialization.student_to_dict, chunk_size=2)
+    assert file.getvalue() == "[]"
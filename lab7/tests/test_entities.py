@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import datetime
 
+import pytest
 from entities import Lab
 from entities import Problem
 from entities import Student
@@ -23,6 +24,15 @@ def test_problem_from_type():
     assert problem_new == problem
 
 
+def test_problem_deadline_parsing():
+    first = Problem(1, "description", "2021-01-01T00:00:00")
+    second = Problem(2, "description", 1609459200)
+    assert first.deadline == second.deadline == datetime.datetime(2021, 1, 1)
+    assert first.deadline is Problem(3, "description", "2021-01-01T00:00:00").deadline
+    with pytest.raises(TypeError):
+        Problem(4, "description", True)
+
+
 def test_problem_str():
     problem = Problem(1, "description", datetime.datetime(year=2021, month=1, day=1))
     assert str(problem)
@@ -1,6 +1,11 @@
 from __future__ import annotations
 
+import datetime
+import json
+import os
+
 from repository import LabFileRepository
+from repository import ShardedSubmissionFileRepository
 from repository import StudentFileRepository
 from repository import SubmissionFileRepository
 
@@ -40,3 +45,130 @@ def test_submission_file_repository(mocker):
     assert repo.submission_count == 1
     repo.delete_submission({"sid": 1, "lid": 1, "pid": 1, "grade": 10})
     assert repo.submission_count == 0
+
+
+def test_file_repository_lazy_load(mocker):
+    mock_file = mocker.mock_open(read_data='[{"sid": 1, "name": "test", "group": 1}]')
+    mocker.patch("builtins.open", mock_file)
+    repo = StudentFileRepository("test.json")
+    mock_file.assert_not_called()
+    assert repo.student_count == 1
+    assert repo.get_student_by_id(1).name == "test"
+    mock_file.assert_called_once()
+
+
+def test_file_repository_load_json_skips_file(mocker):
+    mock_file = mocker.mock_open(read_data="[]")
+    mocker.patch("builtins.open", mock_file)
+    repo = LabFileRepository("test.json")
+    repo.load_json([{"lid": 1, "problems": []}])
+    assert repo.lab_count == 1
+    mock_file.assert_not_called()
+
+
+def test_file_repository_prefetch(mocker):
+    mock_file = mocker.mock_open(
+        read_data='[{"sid": 1, "lid": 1, "pid": 1, "grade": 10}]'
+    )
+    mocker.patch("builtins.open", mock_file)
+    repo = SubmissionFileRepository("test.json", prefetch=True)
+    assert repo.submission_count == 1
+    mock_file.assert_called_once()
+
+
+def test_sharded_submission_file_repository(tmp_path):
+    repo = ShardedSubmissionFileRepository(str(tmp_path))
+    assert repo.submission_count == 0
+    repo.add_submission({"sid": 1, "lid": 1, "pid": 1, "grade": 10})
+    repo.add_submission({"sid": 2, "lid": 2, "pid": 1, "grade": 9})
+    assert sorted(os.listdir(tmp_path)) == ["1.json", "2.json"]
+    lab_2_mtime = os.stat(tmp_path / "2.json").st_mtime_ns
+    repo.delete_submission({"sid": 1, "lid": 1, "pid": 1, "grade": 10})
+    assert os.stat(tmp_path / "2.json").st_mtime_ns == lab_2_mtime
+
+    repo = ShardedSubmissionFileRepository(str(tmp_path))
+    assert len(repo.get_lab_submissions(2)) == 1
+    assert repo.get_submission(2, 2, 1).grade == 9
+    assert repo.get_submission(1, 1, 1) is None
+    assert repo.submission_count == 1
+
+
+def test_sharded_submission_file_repository_buckets(tmp_path):
+    repo = ShardedSubmissionFileRepository(str(tmp_path), buckets=2)
+    repo.load_json(
+        [
+            {"sid": 1, "lid": 1, "pid": 1, "grade": 10},
+            {"sid": 1, "lid": 2, "pid": 1, "grade": 9},
+            {"sid": 1, "lid": 3, "pid": 1, "grade": 8},
+        ],
+    )
+    assert sorted(os.listdir(tmp_path)) == ["0.json", "1.json"]
+    assert [x.grade for x in repo.get_lab_submissions(3)] == [8]
+    repo.load_json([{"sid": 1, "lid": 2, "pid": 1, "grade": 9}])
+    assert os.listdir(tmp_path) == ["0.json"]
+    assert repo.submission_count == 1
+
+
+def test_compressed_file_repository(tmp_path):
+    filename = str(tmp_path / "students.json.gz")
+    repo = StudentFileRepository(filename)
+    repo.load_json([])
+    repo.add_student({"sid": 1, "name": "test", "group": 1})
+    repo = StudentFileRepository(filename)
+    assert repo.get_student_by_id(1).name == "test"
+
+
+def test_lab_file_repository_epoch(tmp_path):
+    filename = str(tmp_path / "labs.json")
+    repo = LabFileRepository(filename, epoch=True)
+    repo.load_json(
+        [
+            {
+                "lid": 1,
+                "problems": [
+                    {"pid": 1, "description": "a", "deadline": "2021-01-01T00:00:00"},
+                ],
+            },
+        ],
+    )
+    repo.save()
+    with open(filename) as f:
+        assert json.load(f)[0]["problems"][0]["deadline"] == 1609459200
+    repo = LabFileRepository(filename)
+    assert repo.get_problem_by_ids(1, 1).deadline == datetime.datetime(2021, 1, 1)
+
+
+def test_file_repository_snapshot(tmp_path):
+    repo = SubmissionFileRepository(str(tmp_path / "submissions.json"))
+    repo.load_json([{"sid": 1, "lid": 1, "pid": 1, "grade": 10}])
+    snapshot = repo.snapshot()
+    repo.add_submission({"sid": 2, "lid": 1, "pid": 1, "grade": 9})
+    assert snapshot.submission_count == 1
+    snapshot.delete_student_submissions(1)
+    assert repo.submission_count == 2
+    repo = SubmissionFileRepository(str(tmp_path / "submissions.json"))
+    assert repo.submission_count == 2
+
+    sharded = ShardedSubmissionFileRepository(str(tmp_path / "shards"))
+    sharded.load_json(repo.get_submissions())
+    snapshot = sharded.snapshot()
+    sharded.delete_lab_submissions(1)
+    assert len(snapshot.get_lab_submissions(1)) == 2
+
+
+def test_file_repository_indent(tmp_path):
+    rows = (
+        (LabFileRepository, [{"lid": 1, "problems": []}]),
+        (StudentFileRepository, [{"sid": 1, "name": "a", "group": 1}]),
+        (SubmissionFileRepository, [{"sid": 1, "lid": 1, "pid": 1, "grade": 5}]),
+    )
+    for repo_cls, data in rows:
+        for compact in (False, True):
+            filename = str(tmp_path / f"{repo_cls.__name__}{compact}.json")
+            repo = repo_cls(filename, compact=compact)
+            repo.load_json(data)
+            repo.save()
+            with open(filename) as f:
+                text = f.read()
+            assert len(json.loads(text)) == 1
+            assert ("\n    " in text) != compact
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+from repository import LabFileRepository
+from repository import LabRepository
+from repository import StudentFileRepository
+from repository import StudentRepository
+from repository import SubmissionFileRepository
+from repository import SubmissionRepository
+from services import Journal
+from services import LabService
+from services import StudentService
+from services import SubmissionService
+
+
+def make_services(
+    lab_repo: LabRepository,
+    student_repo: StudentRepository,
+    submission_repo: SubmissionRepository,
+    journal: Journal,
+) -> tuple[LabService, StudentService, SubmissionService]:
+    """Returns services sharing a journal, loaded with the sample data"""
+    lab_service = LabService(lab_repo, journal)
+    student_service = StudentService(student_repo, journal)
+    submission_service = SubmissionService(
+        submission_repo,
+        lab_service,
+        student_service,
+    )
+    with open("data/sample.json") as f:
+        sample = json.load(f)
+    lab_service.load_json(sample["labs"])
+    student_service.load_json(sample["students"])
+    submission_service.load_json(sample["submissions"])
+    return lab_service, student_service, submission_service
+
+
+@pytest.fixture
+def services() -> tuple[LabService, StudentService, SubmissionService]:
+    """Returns in-memory services sharing a journal"""
+    return make_services(
+        LabRepository(),
+        StudentRepository(),
+        SubmissionRepository(),
+        Journal(),
+    )
+
+
+def test_undo_redo_add(services):
+    """
+    +---------------------------+------------+
+    |           Input           |   Output   |
+    +---------------------------+------------+
+    | undo() after add_student  | removed    |
+    | redo()                    | added      |
+    | undo() twice              | ValueError |
+    +---------------------------+------------+
+    """
+    _, student_service, _ = services
+    student_service.add_student({"sid": 6, "name": "Eve", "group": 311})
+    assert student_service.journal.undo() == "Add student 6"
+    assert student_service.get_student_by_id(6) is None
+    assert student_service.journal.redo() == "Add student 6"
+    assert student_service.get_student_by_id(6).name == "Eve"
+    student_service.journal.undo()
+    with pytest.raises(ValueError):
+        student_service.journal.undo()
+
+
+def test_undo_cascade(services):
+    """
+    +--------------------------------------+-----------------+
+    |                Input                 |     Output      |
+    +--------------------------------------+-----------------+
+    | undo() after delete_student_by_id(5) | student, grades |
+    | undo() after delete_lab_by_id(1)     | lab, grades     |
+    +--------------------------------------+-----------------+
+    """
+    lab_service, student_service, submission_service = services
+    journal = student_service.journal
+    count = submission_service.submission_count
+
+    student_service.delete_student_by_id(5)
+    assert submission_service.get_student_average(5) is None
+    journal.undo()
+    assert student_service.get_student_by_id(5) is not None
+    assert submission_service.get_student_average(5) == 3.5
+
+    lab_service.delete_lab_by_id(1)
+    assert submission_service.submission_count < count
+    journal.undo()
+    assert lab_service.get_problem_by_ids(1, 3) is not None
+    assert submission_service.submission_count == count
+    journal.redo()
+    assert lab_service.get_lab_by_id(1) is None
+    assert not submission_service.get_lab_submissions(1)
+
+
+def test_undo_delete_problem(services):
+    """
+    +-------------------------------------------+---------------------+
+    |                   Input                   |       Output        |
+    +-------------------------------------------+---------------------+
+    | undo() after delete_problem_by_ids(1, 1)  | same order, grades  |
+    +-------------------------------------------+---------------------+
+    """
+    lab_service, _, submission_service = services
+    count = submission_service.submission_count
+    lab_service.delete_problem_by_ids(1, 1)
+    assert submission_service.submission_count == count - 4
+    lab_service.journal.undo()
+    assert [x.pid for x in lab_service.get_lab_by_id(1).problems] == [1, 2, 3]
+    assert submission_service.submission_count == count
+    lab_service.journal.redo()
+    assert [x.pid for x in lab_service.get_lab_by_id(1).problems] == [3, 2]
+    lab_service.journal.undo()
+    assert [x.pid for x in lab_service.get_lab_by_id(1).problems] == [1, 2, 3]
+
+
+def test_journal_shared():
+    """
+    +-----------------------------------------+------------+
+    |                  Input                  |   Output   |
+    +-----------------------------------------+------------+
+    | services with different journals        | ValueError |
+    +-----------------------------------------+------------+
+    """
+    lab_service = LabService(LabRepository(), Journal())
+    student_service = StudentService(StudentRepository(), Journal())
+    with pytest.raises(ValueError):
+        SubmissionService(SubmissionRepository(), lab_service, student_service)
+
+
+def test_undo_assign_lab_problem(services):
+    """
+    +------------------------------------------+-----------+
+    |                  Input                   |  Output   |
+    +------------------------------------------+-----------+
+    | undo() after assign_lab_problem(1, 1, 1) | old grade |
+    +------------------------------------------+-----------+
+    """
+    _, _, submission_service = services
+    grade = submission_service.get_submission(1, 1, 1).grade
+    submission_service.assign_lab_problem(1, 1, 1, 1)
+    submission_service.journal.undo()
+    assert submission_service.get_submission(1, 1, 1).grade == grade
+    assert not submission_service.journal.can_undo
+
+
+def test_journal_budget():
+    """
+    +-------------------------+--------------------+
+    |          Input          |       Output       |
+    +-------------------------+--------------------+
+    | entries over the budget | oldest dropped     |
+    | a change after undo()   | redo history empty |
+    +-------------------------+--------------------+
+    """
+    journal = Journal(budget=2000)
+    log = []
+    for i in range(10):
+        journal.record(str(i), lambda i=i: log.append(-i), lambda i=i: log.append(i))
+    assert journal.size <= 2000
+    while journal.can_undo:
+        journal.undo()
+    assert 0 < len(log) < 10
+    assert log[0] == -9
+    journal.record("new", lambda: None, lambda: None)
+    assert not journal.can_redo
+
+
+def test_undo_file_repositories(tmp_path):
+    """
+    +---------------------------------------+-------------+
+    |                 Input                 |   Output    |
+    +---------------------------------------+-------------+
+    | undo() of a deletion, then a new load | saved state |
+    +---------------------------------------+-------------+
+    """
+    paths = [str(tmp_path / x) for x in ("labs.json", "st.json", "sub.json")]
+    lab_service, student_service, submission_service = make_services(
+        LabFileRepository(paths[0]),
+        StudentFileRepository(paths[1]),
+        SubmissionFileRepository(paths[2]),
+        Journal(),
+    )
+    count = submission_service.submission_count
+    student_service.delete_student_by_id(5)
+    student_service.journal.undo()
+    assert StudentFileRepository(paths[1]).get_student_by_id(5) is not None
+    assert SubmissionFileRepository(paths[2]).submission_count == count
@@ -2,15 +2,19 @@ from __future__ import annotations
 
 import datetime
 import json
+import threading
 
 import pytest
 from entities import Lab
 from entities import Problem
 from entities import Student
+from entities import Submission
 from repository import LabRepository
 from repository import StudentRepository
 from repository import SubmissionRepository
+from services import Journal
 from services import LabService
+from services import pages
 from services import StudentService
 from services import SubmissionService
 
@@ -29,8 +33,9 @@ def services() -> tuple[LabService, StudentService, SubmissionService]:
     student_repo = StudentRepository()
     submission_repo = SubmissionRepository()
 
-    lab_service = LabService(lab_repo)
-    student_service = StudentService(student_repo)
+    journal = Journal()
+    lab_service = LabService(lab_repo, journal)
+    student_service = StudentService(student_repo, journal)
     submission_service = SubmissionService(
         submission_repo,
         lab_service,
@@ -40,6 +45,22 @@ def services() -> tuple[LabService, StudentService, SubmissionService]:
     return (lab_service, student_service, submission_service)
 
 
+@pytest.fixture
+def restrict_services() -> tuple[LabService, StudentService, SubmissionService]:
+    """Returns services which reject deleting referenced entities"""
+    journal = Journal()
+    lab_service = LabService(LabRepository(), journal)
+    student_service = StudentService(StudentRepository(), journal)
+    submission_service = SubmissionService(
+        SubmissionRepository(),
+        lab_service,
+        student_service,
+        cascade=False,
+    )
+
+    return (lab_service, student_service, submission_service)
+
+
 def load_json(
     data,
     lab_service: LabService,
@@ -352,6 +373,8 @@ def test_delete_problem_by_ids(sample_data, services):
     |        Input             |  Output  |
     +--------------------------+----------+
     | manager.problem_count    |        4 |
+    | lab 1 problems           |   [3, 2] |
+    | then delete (1, 3)       |      [2] |
     +--------------------------+----------+
     """
     lab_service, student_service, submission_service = services
@@ -359,6 +382,9 @@ def test_delete_problem_by_ids(sample_data, services):
     lab_service.delete_problem_by_ids(1, 1)
     assert lab_service.get_problem_by_ids(1, 1) is None
     assert lab_service.problem_count == 4
+    assert [x.pid for x in lab_service.get_lab_by_id(1).problems] == [3, 2]
+    lab_service.delete_problem_by_ids(1, 3)
+    assert [x.pid for x in lab_service.get_lab_by_id(1).problems] == [2]
 
 
 def test_get_submissions(sample_data, services):
@@ -461,3 +487,224 @@ def test_get_lab_grades_str(sample_data, services):
     lab_service, student_service, submission_service = services
     load_json(sample_data, lab_service, student_service, submission_service)
     assert submission_service.get_lab_grades_str(1)
+
+
+def test_delete_missing_entities(sample_data, services):
+    """
+    +-----------------------------------+------------+
+    |             Input                 |   Output   |
+    +-----------------------------------+------------+
+    | delete_student_by_id(6)           | ValueError |
+    | delete_lab(Lab(3))                | ValueError |
+    | delete_problem_by_ids(1, 4)       | ValueError |
+    +-----------------------------------+------------+
+    """
+    lab_service, student_service, submission_service = services
+    load_json(sample_data, lab_service, student_service, submission_service)
+    with pytest.raises(ValueError):
+        student_service.delete_student_by_id(6)
+    with pytest.raises(ValueError):
+        lab_service.delete_lab(Lab(3))
+    with pytest.raises(ValueError):
+        lab_service.delete_problem_by_ids(1, 4)
+    assert lab_service.problem_count == 5
+
+
+def test_delete_duplicate_submission(sample_data, services):
+    """
+    +--------------------------------+--------+
+    |             Input              | Output |
+    +--------------------------------+--------+
+    | get_student_average(5), once   | 4      |
+    | get_student_average(5), twice  | None   |
+    +--------------------------------+--------+
+    """
+    lab_service, student_service, submission_service = services
+    load_json(sample_data, lab_service, student_service, submission_service)
+    submission_service.delete_submission(5, 1, 1)
+    assert submission_service.get_student_average(5) == 4
+    submission_service.delete_submission(5, 1, 1)
+    assert submission_service.get_student_average(5) is None
+    assert submission_service.submission_count == 4
+
+
+def test_cascade_delete(sample_data, services):
+    """
+    +-------------------------------+--------+
+    |             Input             | Output |
+    +-------------------------------+--------+
+    | delete_student_by_id(5)       | 4      |
+    | delete_problem_by_ids(1, 2)   | 3      |
+    | delete_lab_by_id(1)           | 1      |
+    +-------------------------------+--------+
+    """
+    lab_service, student_service, submission_service = services
+    load_json(sample_data, lab_service, student_service, submission_service)
+    student_service.delete_student_by_id(5)
+    assert submission_service.submission_count == 4
+    assert submission_service.get_student_submissions(5) == []
+    lab_service.delete_problem_by_ids(1, 2)
+    assert submission_service.submission_count == 3
+    lab_service.delete_lab_by_id(1)
+    assert submission_service.submission_count == 1
+    assert submission_service.get_lab_submissions(1) == []
+    assert submission_service.get_lab_grades_str(2)
+
+
+def test_restrict_delete(sample_data, restrict_services):
+    """
+    +-------------------------------+------------+
+    |             Input             |   Output   |
+    +-------------------------------+------------+
+    | delete_student_by_id(5)       | ValueError |
+    | delete_lab_by_id(1)           | ValueError |
+    | delete_problem_by_ids(1, 3)   | 4          |
+    +-------------------------------+------------+
+    """
+    lab_service, student_service, submission_service = restrict_services
+    load_json(sample_data, lab_service, student_service, submission_service)
+    with pytest.raises(ValueError):
+        student_service.delete_student_by_id(5)
+    with pytest.raises(ValueError):
+        lab_service.delete_lab_by_id(1)
+    with pytest.raises(ValueError):
+        lab_service.delete_problem_by_ids(1, 2)
+    assert student_service.student_count == 5
+    lab_service.delete_problem_by_ids(1, 3)
+    assert lab_service.problem_count == 4
+    student_service.delete_student_by_id(3)
+    assert submission_service.submission_count == 6
+
+
+def test_interned_strings(services):
+    """
+    +----------------------------------------+--------+
+    |                 Input                  | Output |
+    +----------------------------------------+--------+
+    | student names loaded from JSON         | same   |
+    | search_student_by_name("Nobody")       | []     |
+    +----------------------------------------+--------+
+    """
+    lab_service, student_service, submission_service = services
+    # A JSON round trip gives each record its own string objects
+    problem = {"pid": 1, "description": "Liste", "deadline": "2022-10-10"}
+    labs = [{"lid": 1, "problems": [problem]}, {"lid": 2, "problems": [problem]}]
+    students = [
+        {"sid": 1, "name": "Ana", "group": 1},
+        {"sid": 2, "name": "Ana", "group": 2},
+    ]
+    lab_service.load_json(json.loads(json.dumps(labs)))
+    student_service.load_json(json.loads(json.dumps(students)))
+    first, second = student_service.get_students()
+    assert first.name is second.name
+    assert len(student_service.search_student_by_name("Ana")) == 2
+    assert student_service.search_student_by_name("Nobody") == []
+    first, second = lab_service.get_problems()
+    assert first.description is second.description
+    assert len(lab_service.search_problem_by_description("Liste")) == 2
+    assert lab_service.search_problem_by_description("Nobody") == []
+
+
+def test_snapshot(sample_data, services):
+    """
+    +-------------------------------------------+-----------+
+    |                   Input                   |  Output   |
+    +-------------------------------------------+-----------+
+    | changes to the services after snapshot()  | unchanged |
+    | changes to the snapshot                   | not live  |
+    +-------------------------------------------+-----------+
+    """
+    lab_service, student_service, submission_service = services
+    load_json(sample_data, lab_service, student_service, submission_service)
+    snapshot = submission_service.snapshot()
+    submissions = submission_service.get_submissions()
+    problems = lab_service.get_problems()
+
+    student_service.delete_student_by_id(5)
+    lab_service.add_problem(1, {"pid": 9, "description": "New", "deadline": 0})
+    lab_service.delete_problem_by_ids(1, 3)
+    submission_service.assign_lab_problem(1, 2, 1)
+    assert snapshot.student_service.student_count == 5
+    assert snapshot.get_submissions() == submissions
+    assert snapshot.lab_service.get_problems() == problems
+    assert snapshot.get_student_average(5) == 3.5
+
+    snapshot.student_service.delete_student_by_id(1)
+    snapshot.lab_service.add_problem(2, {"pid": 9, "description": "", "deadline": 0})
+    assert student_service.get_student_by_id(1) is not None
+    assert lab_service.get_problem_by_ids(2, 9) is None
+    assert submission_service.get_student_submissions(1)
+    assert not snapshot.get_student_submissions(1)
+
+
+def test_snapshot_concurrent_writes():
+    """
+    +---------------------------------------------+------------+
+    |                    Input                    |   Output   |
+    +---------------------------------------------+------------+
+    | snapshot() while another thread adds        | consistent |
+    +---------------------------------------------+------------+
+    """
+    repo = SubmissionRepository()
+    done = threading.Event()
+
+    def write() -> None:
+        for i in range(2000):
+            repo.add_submission(Submission(i, i % 3, 1, 10))
+        done.set()
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    while not done.is_set():
+        snapshot = repo.snapshot()
+        count = snapshot.submission_count
+        assert len(snapshot.get_submissions()) == count
+        assert sum(len(snapshot.get_lab_submissions(x)) for x in range(3)) == count
+    writer.join()
+    assert repo.submission_count == 2000
+
+
+def test_list_students(sample_data, services):
+    """
+    +------------------------------------------+-----------------+
+    |                  Input                   |     Output      |
+    +------------------------------------------+-----------------+
+    | list_students(limit=2), following cursor | 1 2, 3 4, 5     |
+    | list_students(sort="name")               | Ann, Bob, ...   |
+    | list_students(group=312)                 | 3 4             |
+    | list_students() after add_student        | new student     |
+    | list_students(sort="grade")              | ValueError      |
+    +------------------------------------------+-----------------+
+    """
+    lab_service, student_service, submission_service = services
+    load_json(sample_data, lab_service, student_service, submission_service)
+    result = []
+    for page in pages(lambda x: student_service.list_students(x, 2)):
+        result.append([student.sid for student in page.items])
+    assert result == [[1, 2], [3, 4], [5]]
+    page = student_service.list_students(sort="name")
+    assert [x.name for x in page.items][:2] == ["Ann", "Bob"]
+    assert not page.has_next
+    page = student_service.list_students(group=312)
+    assert [x.sid for x in page.items] == [3, 4]
+    student_service.add_student({"sid": 0, "name": "Zed", "group": 312})
+    assert student_service.list_students(limit=1).items[0].name == "Zed"
+    with pytest.raises(ValueError):
+        student_service.list_students(sort="grade")
+
+
+def test_list_labs(sample_data, services):
+    """
+    +-------------------------------------+--------+
+    |                Input                | Output |
+    +-------------------------------------+--------+
+    | list_labs(limit=1), following pages | 1, 2   |
+    +-------------------------------------+--------+
+    """
+    lab_service, student_service, submission_service = services
+    load_json(sample_data, lab_service, student_service, submission_service)
+    page = lab_service.list_labs(limit=1)
+    assert [x.lid for x in page.items] == [1]
+    page = lab_service.list_labs(page.cursor, limit=1)
+    assert [x.lid for x in page.items] == [2]
+    assert [x.lid for x in lab_service.list_labs().items] == [1, 2]
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from helpers import profiling
+from repository import StudentFileRepository
+from repository import StudentRepository
+
+
+def test_percentile():
+    """Test percentile function."""
+    samples = [float(x) for x in range(1, 101)]
+    assert profiling.percentile(samples, 50) == 50
+    assert profiling.percentile(samples, 99) == 99
+    assert profiling.percentile([], 50) == 0
+
+
+def test_instrument():
+    """Test Profiler.instrument method."""
+    profiler = profiling.Profiler()
+    repo = profiler.instrument(StudentRepository())
+    repo.add_student({"sid": 1, "name": "test", "group": 1})
+    repo.get_student_by_id(1)
+    assert repo.student_count == 1
+    stats = profiler.stats()
+    assert stats["StudentRepository.add_student"]["calls"] == 1
+    # add_student looks the ID up through the instrumented method
+    assert stats["StudentRepository.get_student_by_id"]["calls"] == 2
+    assert "StudentRepository.get_student_by_id" in profiler.summary()
+    profiler.reset()
+    assert profiler.stats() == {}
+
+
+def test_samples(monkeypatch):
+    """Test Samples class."""
+    monkeypatch.setattr(profiling, "RESERVOIR_SIZE", 10)
+    samples = profiling.Samples()
+    for x in range(1, 101):
+        samples.add(float(x))
+    assert samples.count == 100
+    assert samples.total == 5050
+    assert samples.max == 100
+    assert len(samples.reservoir) == 10
+
+
+def test_instrument_lazy_load(tmp_path):
+    """Test Profiler.instrument timing a lazy load."""
+    path = tmp_path / "students.json"
+    path.write_text('[{"sid": 1, "name": "test", "group": 1}]')
+    profiler = profiling.Profiler()
+    repo = profiler.instrument(StudentFileRepository(str(path)))
+    assert repo.student_count == 1
+    assert profiler.stats()["StudentFileRepository.load"]["calls"] == 1
+
+
+def test_record_write(tmp_path):
+    """Test record_write function."""
+    repo = StudentFileRepository(str(tmp_path / "students.json"))
+    repo.load_json([])
+    repo.add_student({"sid": 1, "name": "test", "group": 1})
+    profiler = profiling.enable()
+    try:
+        repo.add_student({"sid": 2, "name": "test", "group": 1})
+        written = profiler.bytes_written()["StudentFileRepository.save"]
+        assert written == (tmp_path / "students.json").stat().st_size
+        assert "1 writes" in profiler.summary()
+    finally:
+        profiling.disable()
+    assert profiling.active() is None
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+from helpers.data import open_data
+from helpers.synthetic import generate
+from repository import LabRepository
+from repository import StudentRepository
+from repository import SubmissionRepository
+from services import Journal
+from services import LabService
+from services import ReportService
+from services import StudentService
+from services import SubmissionService
+
+
+@pytest.fixture
+def submission_service() -> SubmissionService:
+    """Returns services loaded with generated data"""
+    journal = Journal()
+    lab_service = LabService(LabRepository(), journal)
+    student_service = StudentService(StudentRepository(), journal)
+    submission_service = SubmissionService(
+        SubmissionRepository(),
+        lab_service,
+        student_service,
+    )
+    sample = generate(students=30, labs=6, problems=3, submissions=200, seed=2)
+    lab_service.load_json(sample["labs"])
+    student_service.load_json(sample["students"])
+    submission_service.load_json(sample["submissions"])
+    lab_service.add_lab({"lid": 7, "problems": []})
+    return submission_service
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("extension", [".txt", ".txt.gz"])
+def test_write_lab_reports(tmp_path, submission_service, workers, extension):
+    """
+    +-------------------------------------+--------------------------+
+    |                Input                |          Output          |
+    +-------------------------------------+--------------------------+
+    | write_lab_reports(tmp_path)         | one file per lab, equal  |
+    |                                     | to get_lab_grades_str    |
+    +-------------------------------------+--------------------------+
+    """
+    service = ReportService(submission_service, workers=workers)
+    files = service.write_lab_reports(str(tmp_path), extension)
+    assert sorted(files) == list(range(1, 8))
+    assert len(os.listdir(tmp_path)) == 7
+    for lid, filename in files.items():
+        with open_data(filename) as f:
+            assert f.read() == submission_service.get_lab_grades_str(lid) + "\n"
+
+
+def test_partition(submission_service):
+    """
+    +-------------------+-----------------------------------+
+    |       Input       |              Output               |
+    +-------------------+-----------------------------------+
+    | partition(...)    | graded submissions, split by lab  |
+    +-------------------+-----------------------------------+
+    """
+    parts = ReportService.partition(submission_service)
+    graded = [x for x in submission_service.get_submissions() if x.grade is not None]
+    assert sum(len(x) for x in parts.values()) == len(graded)
+    assert parts[7] == []
+    assert parts[1] == submission_service.get_lab_grade_rows(1)
+
+
+def test_partition_orphans(submission_service):
+    """
+    +------------------------------------------+---------------------------+
+    |                  Input                   |          Output           |
+    +------------------------------------------+---------------------------+
+    | partition(...) after reloading students  | orphaned submissions are  |
+    | without some of them                     | skipped, no error         |
+    +------------------------------------------+---------------------------+
+    """
+    student_service = submission_service.student_service
+    students = student_service.get_students()
+    removed = {x.sid for x in students[::2]}
+    student_service.load_json([x for x in students if x.sid not in removed])
+    parts = ReportService.partition(submission_service)
+    graded = [
+        x
+        for x in submission_service.get_submissions()
+        if x.grade is not None and x.sid not in removed
+    ]
+    assert sum(len(x) for x in parts.values()) == len(graded)
+    for lid in parts:
+        assert parts[lid] == submission_service.get_lab_grade_rows(lid)
@@ -2,16 +2,25 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from typing import Callable
+from typing import Iterator
 
 from helpers import data
 from helpers import terminal
+from helpers.profiling import Profiler
+from services import CsvService
 from services import LabService
+from services import Page
+from services import pages
+from services import ReportService
 from services import StudentService
 from services import SubmissionService
 
 
 __all__ = ["MainMenu"]
 
+# Number of entities printed at once by the listings
+PAGE_SIZE = 20
+
 
 @dataclass(frozen=True)
 class MenuOption:
@@ -76,11 +85,14 @@ class Menu:
 
         try:
             res = self.options[opt].call()
-        except ValueError as err:
+        except (ValueError, OSError) as err:
             terminal.print_wait(f"\nError: {err}. Press any key to continue.")
             return
 
         if self.options[opt].print_result:
+            if isinstance(res, Iterator):
+                self.__print_pages(res)
+                return
             if isinstance(res, list):
                 for x in res:
                     print(str(x))
@@ -88,6 +100,21 @@ class Menu:
                 print(str(res))
             terminal.print_wait("\nPress any key to continue.")
 
+    def __print_pages(self, pages: Iterator[Page]) -> None:
+        """Internal: prints a listing one page at a time
+
+        Args:
+            pages (Iterator[Page]): pages of the listing, fetched as they are printed
+        """
+        for page in pages:
+            print(page)
+            if not page.has_next:
+                break
+            if input("\nPress Enter for the next page, or q to stop. ") == "q":
+                return
+            terminal.clear()
+        terminal.print_wait("\nPress any key to continue.")
+
     def run(self) -> None:
         """Runs the menu"""
         self.__running = True
@@ -125,7 +152,20 @@ class StudentMenu(Menu):
             (
                 MenuOption(
                     "List students",
-                    lambda: self.student_service.get_students(),
+                    lambda: pages(
+                        lambda x: self.student_service.list_students(x, PAGE_SIZE),
+                    ),
+                    True,
+                ),
+                MenuOption(
+                    "List students by name",
+                    lambda: pages(
+                        lambda x: self.student_service.list_students(
+                            x,
+                            PAGE_SIZE,
+                            "name",
+                        ),
+                    ),
                     True,
                 ),
                 MenuOption(
@@ -148,9 +188,7 @@ class StudentMenu(Menu):
                 ),
                 MenuOption(
                     "Search student by group",
-                    lambda: self.student_service.search_student_by_group(
-                        terminal.read_int("Enter group: "),
-                    ),
+                    lambda: self.__list_group(terminal.read_int("Enter group: ")),
                     True,
                 ),
                 MenuOption(
@@ -162,6 +200,19 @@ class StudentMenu(Menu):
             ),
         )
 
+    def __list_group(self, group: int) -> Iterator[Page]:
+        """Internal: returns the pages of the students in a group
+
+        Args:
+            group (int): group number
+
+        Returns:
+            Iterator[Page]: pages of students
+        """
+        return pages(
+            lambda x: self.student_service.list_students(x, PAGE_SIZE, group=group),
+        )
+
 
 class ProblemMenu(Menu):
     """Problem menu class"""
@@ -239,6 +290,12 @@ class LabMenu(Menu):
             submission_service,
             "Manage labs",
         )
+        self.csv_service = CsvService(
+            lab_service,
+            student_service,
+            submission_service,
+        )
+        self.report_service = ReportService(submission_service)
         self.__problem_menu = ProblemMenu(
             lab_service,
             student_service,
@@ -251,7 +308,7 @@ class LabMenu(Menu):
             (
                 MenuOption(
                     "List labs",
-                    lambda: self.lab_service.get_labs(),
+                    lambda: pages(lambda x: self.lab_service.list_labs(x, PAGE_SIZE)),
                     True,
                 ),
                 MenuOption(
@@ -276,6 +333,22 @@ class LabMenu(Menu):
                     ),
                     True,
                 ),
+                MenuOption(
+                    "Write grade reports for all labs",
+                    lambda: list(
+                        self.report_service.write_lab_reports(
+                            input("Enter directory: "),
+                        ).values(),
+                    ),
+                    True,
+                ),
+                MenuOption(
+                    "Export lab grades to CSV",
+                    lambda: self.csv_service.export_lab_grades(
+                        terminal.read_int("Enter lab ID: "),
+                        input("Enter file name: "),
+                    ),
+                ),
                 MenuOption("Back", self.exit),
             ),
         )
@@ -289,14 +362,17 @@ class MainMenu(Menu):
         lab_service: LabService,
         student_service: StudentService,
         submission_service: SubmissionService,
+        profiler: Profiler | None = None,
     ) -> None:
         super().__init__(lab_service, student_service, submission_service, "Main menu")
+        self.profiler = profiler
         self.__student_menu = StudentMenu(
             lab_service,
             student_service,
             submission_service,
         )
         self.__lab_menu = LabMenu(lab_service, student_service, submission_service)
+        self.csv_service = CsvService(lab_service, student_service, submission_service)
         self.__populate_options()
 
     def load_json(self) -> None:
@@ -306,6 +382,38 @@ class MainMenu(Menu):
         self.student_service.load_json(raw_data["students"])
         self.submission_service.load_json(raw_data["submissions"])
 
+    def import_csv(self) -> str:
+        """Imports students, labs or submissions from a CSV file
+
+        Returns:
+            str: import report
+        """
+        imports = {
+            "students": self.csv_service.import_students,
+            "labs": self.csv_service.import_problems,
+            "submissions": self.csv_service.import_submissions,
+        }
+        kind = input("Enter data type (students/labs/submissions): ").strip()
+        if kind not in imports:
+            raise ValueError("Unknown data type")
+        return str(imports[kind](input("Enter file name: ")))
+
+    def undo(self) -> str:
+        """Reverts the last change
+
+        Returns:
+            str: description of the reverted change
+        """
+        return f"Undone: {self.student_service.journal.undo()}"
+
+    def redo(self) -> str:
+        """Repeats the last reverted change
+
+        Returns:
+            str: description of the repeated change
+        """
+        return f"Redone: {self.student_service.journal.redo()}"
+
     def __populate_options(self) -> None:
         self.options.extend(
             (
@@ -313,6 +421,11 @@ class MainMenu(Menu):
                     "Load sample data",
                     lambda: self.load_json(),
                 ),
+                MenuOption(
+                    "Import data from CSV",
+                    self.import_csv,
+                    True,
+                ),
                 MenuOption(
                     "Manage students",
                     self.__student_menu.run,
@@ -321,6 +434,13 @@ class MainMenu(Menu):
                     "Manage labs",
                     self.__lab_menu.run,
                 ),
+                MenuOption("Undo", self.undo, True),
+                MenuOption("Redo", self.redo, True),
                 MenuOption("Exit", self.exit),
             ),
         )
+        if self.profiler is not None:
+            self.options.insert(
+                -1,
+                MenuOption("Show profiling summary", self.profiler.summary, True),
+            )